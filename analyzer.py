@@ -1,14 +1,19 @@
-from sentence_transformers import SentenceTransformer, util
 import numpy as np
 
-# Initialize the model once
-print("Loading AI Gap Engine...")
-model = SentenceTransformer("all-MiniLM-L6-v2")
+import embedding_cache
+from skill_matcher import match_skills, semantic_skills
+
+# The embedding model is loaded lazily by model_registry on the first cache miss
+MATCH_THRESHOLD = 0.75  # Cosine similarity above which a job skill counts as matched
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
 
 def get_match_results(user_skills, job_skills):
     """
-    Identifies matched vs missing skills using semantic similarity.
-    Works across multiple career domains.
+    Identifies matched vs missing skills using exact, alias and then
+    semantic similarity. Works across multiple career domains.
     """
     if not job_skills:
         return [], [], 0
@@ -16,30 +21,23 @@ def get_match_results(user_skills, job_skills):
     if not user_skills:
         return [], job_skills, 0
 
-    matched = []
-    missing = []
-    
-    # Encode all skills
-    user_embeddings = model.encode(user_skills, convert_to_tensor=True)
-    job_embeddings = model.encode(job_skills, convert_to_tensor=True)
-    
-    # Compute cosine similarity matrix
-    cosine_scores = util.cos_sim(job_embeddings, user_embeddings)
-    
-    for i, job_skill in enumerate(job_skills):
-        # Best match for this job skill
-        best_match_idx = np.argmax(cosine_scores[i].cpu().numpy())
-        best_score = cosine_scores[i][best_match_idx].item()
-        
-        if best_score > 0.75: # Threshold for semantic match
-            matched.append(job_skill)
-        else:
-            missing.append(job_skill)
-            
+    # Exact and alias hits first; only the residual goes through the model
+    matched, missing = match_skills(user_skills, job_skills, MATCH_THRESHOLD)
+
     match_percentage = (len(matched) / len(job_skills)) * 100
     
     return matched, missing, match_percentage
 
+def prefetch_embeddings(user_skill_lists, job_skills):
+    """
+    Encodes, in one large batch, every skill that matching these user lists
+    against job_skills will embed, so later matches hit the cache. Pairs the
+    similarity table covers are skipped.
+    """
+    skills = sorted(semantic_skills(user_skill_lists, job_skills))
+    if skills:
+        embedding_cache.encode(skills)
+
 # Knowledge Database for Learning Paths
 SKILL_RESOURCES = {
     "Python": {
@@ -1,17 +1,34 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.formparsers import MultiPartParser
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from typing import List
 import uvicorn
-import shutil
-import os
-import aiofiles
+import functools
+import hmac
+import io
+import json
+import time
+import zipfile
+import zlib
 
 # Use the robust modules we built
 from resume_parser import extract_text, extract_skills
 from github_analyzer import analyze_github, calculate_github_score
-from analyzer import get_match_results, get_recommendations, generate_detailed_roadmap
+from analyzer import get_match_results, get_recommendations, generate_detailed_roadmap, prefetch_embeddings
+from role_catalog import get_search_index, search_roles
+from candidate_store import get_candidate_store, remember_candidates_later, shutdown_writer
+from config import (BATCH_MAX_FILES, BATCH_MAX_BYTES, BATCH_MAX_ARCHIVE_MEMBERS, BATCH_MAX_UNCOMPRESSED_BYTES,
+                    UPLOAD_MAX_BYTES, UPLOAD_SPOOL_BYTES, API_SERVER_TIMING, PIPELINE_GITHUB_TIMEOUT,
+                    CANDIDATE_API_TOKEN)
+from model_registry import warmup
+from executors import PARSE_POOL, INFERENCE_POOL, IO_POOL, PoolSaturated
+from pipeline import Pipeline, Stage
+from result_cache import results, resume_digest, skills_key, match_key, github_key, RESUME_TTL, GITHUB_TTL
 from job_roles_data import get_job_roles, get_skills_for_role
+import metrics
+from metrics import span
 
 app = FastAPI(
     title="AI Opportunity Gap Analyzer",
@@ -28,22 +45,157 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Ensure 'uploads' directory exists
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Multipart uploads are streamed into an in-memory spool that only rolls over
+# to a temp file above UPLOAD_SPOOL_BYTES; parsers read straight from it.
+MultiPartParser.spool_max_size = UPLOAD_SPOOL_BYTES
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Reject oversized bodies before the multipart parser reads them
+    limit = BATCH_MAX_BYTES if request.url.path == "/analyze/batch" else UPLOAD_MAX_BYTES
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > limit:
+        return JSONResponse(status_code=413, content={"detail": f"Upload exceeds {limit} bytes."})
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    # Outermost middleware, so rejected uploads and 429s are counted too
+    spans = metrics.start_request()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        # Label by route template, not raw path, to keep label cardinality bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+        metrics.HTTP_LATENCY.observe(elapsed, route=route)
+    if API_SERVER_TIMING:
+        response.headers["Server-Timing"] = metrics.server_timing(spans, elapsed)
+    return response
+
+def _check_upload(upload):
+    if upload.size is not None and upload.size > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"{upload.filename} exceeds {UPLOAD_MAX_BYTES} bytes.")
 
 # Mount static files for the frontend
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+@app.on_event("startup")
+def build_indexes():
+    # Load the shared model, embed the known vocabulary and load (or build) the role index used by /rank
+    warmup()
+    get_search_index()
+
+@app.on_event("shutdown")
+def stop_pools():
+    for pool in (PARSE_POOL, INFERENCE_POOL, IO_POOL):
+        pool.shutdown()
+    shutdown_writer()
+
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request, exc):
+    # Back-pressure: tell clients to retry instead of queueing without bound
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     return FileResponse("static/index.html")
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/roles")
 def get_roles():
     """Return available job roles for the dropdown."""
     return get_job_roles()
 
+async def _resume_skills(upload):
+    """Skills detected in an upload, memoized by the SHA-256 of its bytes."""
+    _check_upload(upload)
+    with span("resume_digest"):
+        digest = await PARSE_POOL.run(resume_digest, upload.file)
+    user_skills = results.get(skills_key(digest))
+    if user_skills is None:
+        with span("extract_text"):
+            resume_text = await PARSE_POOL.run(extract_text, upload.file, upload.filename)
+        if not resume_text:
+            raise HTTPException(status_code=400, detail="Could not extract text from resume.")
+        with span("extract_skills"):
+            user_skills = await PARSE_POOL.run(extract_skills, resume_text)
+        results.set(skills_key(digest), user_skills, RESUME_TTL)
+
+    # Keep every analyzed resume searchable from the hiring side (GET /candidates);
+    # its skills are embedded on the store's background writer, not on this request
+    # (the lookup reads the store's files, so it runs on the I/O pool too)
+    store = get_candidate_store()
+    if store is not None and not await IO_POOL.run(store.__contains__, digest):
+        remember_candidates_later([(digest, upload.filename, user_skills)])
+    return digest, user_skills
+
+async def _github_profile(github_username):
+    """GitHub metrics and score, memoized for a short time per username."""
+    if not github_username:
+        return None, 0
+    cached = results.get(github_key(github_username))
+    if cached is None:
+        with span("github"):
+            gh_data = await IO_POOL.run(analyze_github, github_username)
+        cached = {"data": gh_data, "score": calculate_github_score(gh_data)}
+        if gh_data is not None:
+            results.set(github_key(github_username), cached, GITHUB_TTL)
+    return cached["data"], cached["score"]
+
+async def _match_role(resume, job_role, job_skills):
+    """Matched/missing skills and score for a role, memoized per resume digest and role."""
+    digest, user_skills = resume
+    match = results.get(match_key(digest, job_role, job_skills))
+    if match is None:
+        with span("skill_match"):
+            matched, missing, match_score = await INFERENCE_POOL.run(get_match_results, user_skills, job_skills)
+        match = {"matched": matched, "missing": missing, "score": match_score}
+        results.set(match_key(digest, job_role, job_skills), match, RESUME_TTL)
+    return match["matched"], match["missing"], match["score"]
+
+async def _roadmap(match):
+    with span("roadmap"):
+        return generate_detailed_roadmap(match[1])
+
+async def _recommendations(match, github):
+    with span("recommendations"):
+        return get_recommendations(match[1], github[1])
+
+async def _rank_roles(resume, top_k):
+    with span("rank_roles"):
+        return await INFERENCE_POOL.run(search_roles, resume[1], max(1, top_k))
+
+# The GitHub branch only needs the username, so it runs while the resume is parsed
+# and matched; it is optional and falls back to "no profile" on failure or timeout.
+GITHUB_STAGE = Stage("github", _github_profile, deps=("github_username",),
+                     optional=True, default=(None, 0), timeout=PIPELINE_GITHUB_TIMEOUT)
+
+ANALYSIS = Pipeline([
+    Stage("resume", _resume_skills, deps=("upload",)),
+    Stage("match", _match_role, deps=("resume", "job_role", "job_skills")),
+    GITHUB_STAGE,
+    Stage("roadmap", _roadmap, deps=("match",)),
+    Stage("recommendations", _recommendations, deps=("match", "github")),
+], inputs=("upload", "job_role", "job_skills", "github_username"))
+
+RANKING = Pipeline([
+    Stage("resume", _resume_skills, deps=("upload",)),
+    GITHUB_STAGE,
+    Stage("rankings", _rank_roles, deps=("resume", "top_k")),
+], inputs=("upload", "github_username", "top_k"))
+
+def _stage_errors(errors):
+    return {name: str(e) for name, e in errors.items()}
+
 @app.post("/analyze")
 async def analyze_career(
     job_role: str = Form(...),
@@ -51,46 +203,22 @@ async def analyze_career(
     resume: UploadFile = File(...)
 ):
     try:
-        # 1. Save and Process Resume
-        file_path = os.path.join(UPLOAD_DIR, resume.filename)
-        async with aiofiles.open(file_path, 'wb') as out_file:
-            content = await resume.read()
-            await out_file.write(content)
-
-        resume_text = extract_text(file_path)
-        if not resume_text:
-            raise HTTPException(status_code=400, detail="Could not extract text from resume.")
-
-        # 2. Extract Skills
-        user_skills = extract_skills(resume_text)
-        job_skills = get_skills_for_role(job_role)
-        
+        # Role lookups may stat and re-parse the role files
+        job_skills = await IO_POOL.run(get_skills_for_role, job_role)
         if not job_skills:
             raise HTTPException(status_code=404, detail=f"Job role '{job_role}' not found.")
 
-        # 3. Analyze Skill Gap (The robust AI engine)
-        matched, missing, match_score = get_match_results(user_skills, job_skills)
-
-        # 4. GitHub Analysis
-        gh_data = None
-        gh_score = 0
-        if github_username:
-            gh_data = analyze_github(github_username)
-            gh_score = calculate_github_score(gh_data)
-
-        # 5. Generate Recommendations
-        recommendations = get_recommendations(missing, gh_score)
-        
-        # 6. Generate Detailed Roadmap
-        roadmap = generate_detailed_roadmap(missing)
-        
+        # Resume parsing (skipped when the same bytes were analyzed before) and skill
+        # matching run alongside the GitHub analysis; see ANALYSIS
+        result = await ANALYSIS.run_async({"upload": resume, "job_role": job_role, "job_skills": job_skills,
+                                           "github_username": github_username})
+        _, user_skills = result["resume"]
+        matched, missing, match_score = result["match"]
+        gh_data, gh_score = result["github"]
+
         # Calculate Readiness
         readiness_score = round((match_score * 0.7) + (gh_score * 0.3), 1)
 
-        # Cleanup
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         return {
             "role": job_role,
             "readiness_score": readiness_score,
@@ -99,14 +227,247 @@ async def analyze_career(
             "matched_skills": matched,
             "missing_skills": missing,
             "github_data": gh_data,
-            "recommendations": recommendations, 
-            "roadmap": roadmap,
-            "user_skills_detected": user_skills # Helpful for debugging/User display
+            "recommendations": result["recommendations"],
+            "roadmap": result["roadmap"],
+            "user_skills_detected": user_skills, # Helpful for debugging/User display
+            "stage_errors": _stage_errors(result.errors)
         }
 
+    except (HTTPException, PoolSaturated):
+        raise
     except Exception as e:
         print(f"Error during analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/stream")
+async def analyze_career_stream(
+    job_role: str = Form(...),
+    github_username: str = Form(None),
+    resume: UploadFile = File(...)
+):
+    """
+    Same analysis as /analyze, streamed as NDJSON events in the order the
+    stages finish: skills, match, roadmap and github (GitHub may come first),
+    then summary and done, or error. With GAP_API_SERVER_TIMING=1 a timings
+    event comes just before done/error; the Server-Timing header is sent
+    before any stage has run, so it cannot carry them for a stream.
+    """
+    job_skills = await IO_POOL.run(get_skills_for_role, job_role)
+    if not job_skills:
+        raise HTTPException(status_code=404, detail=f"Job role '{job_role}' not found.")
+    _check_upload(resume)
+    # The upload is closed once this handler returns; keep its bytes for the stream
+    data = await resume.read()
+    upload = UploadFile(io.BytesIO(data), size=len(data), filename=resume.filename)
+
+    def event(name, **payload):
+        return json.dumps({"event": name, **payload}) + "\n"
+
+    async def events():
+        inputs = {"upload": upload, "job_role": job_role, "job_skills": job_skills, "github_username": github_username}
+        values = {}
+        # The body runs after the middleware has returned, so collect this stream's own spans
+        spans = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            async for stage, value, error in ANALYSIS.stream(inputs):
+                values[stage] = value
+                if stage == "resume":
+                    yield event("skills", user_skills_detected=value[1])
+                elif stage == "match":
+                    matched, missing, match_score = value
+                    yield event("match", role=job_role, resume_score=round(match_score, 1),
+                                matched_skills=matched, missing_skills=missing)
+                elif stage == "roadmap":
+                    yield event("roadmap", roadmap=value)
+                elif stage == "github":
+                    yield event("github", github_data=value[0], github_score=round(value[1], 1),
+                                error=str(error) if error else None)
+                elif stage == "recommendations":
+                    match_score, gh_score = values["match"][2], values["github"][1]
+                    yield event("summary", readiness_score=round((match_score * 0.7) + (gh_score * 0.3), 1),
+                                recommendations=value)
+            last = event("done")
+        except HTTPException as e:
+            last = event("error", status=e.status_code, detail=e.detail)
+        except PoolSaturated as e:
+            last = event("error", status=429, detail=str(e))
+        except Exception as e:
+            print(f"Error during streamed analysis: {e}")
+            last = event("error", status=500, detail=str(e))
+        if API_SERVER_TIMING:
+            durations = metrics.span_durations(spans, time.perf_counter() - start)
+            yield event("timings", timings_ms={stage: round(s * 1000, 1) for stage, s in durations.items()})
+        yield last
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/rank")
+async def rank_career(
+    github_username: str = Form(None),
+    top_k: int = Form(10),
+    resume: UploadFile = File(...)
+):
+    """Score one resume against the closest job roles in the catalog, best fit first."""
+    try:
+        result = await RANKING.run_async({"upload": resume, "github_username": github_username, "top_k": top_k})
+        _, user_skills = result["resume"]
+        _, gh_score = result["github"]
+
+        rankings = []
+        for ranked in result["rankings"]:
+            rankings.append({
+                "role": ranked["role"],
+                "readiness_score": round((ranked["match_score"] * 0.7) + (gh_score * 0.3), 1),
+                "resume_score": round(ranked["match_score"], 1),
+                "matched_skills": ranked["matched_skills"],
+                "missing_skills": ranked["missing_skills"],
+            })
+
+        return {
+            "github_score": round(gh_score, 1),
+            "rankings": rankings,
+            "user_skills_detected": user_skills,
+            "stage_errors": _stage_errors(result.errors)
+        }
+
+    except (HTTPException, PoolSaturated):
+        raise
+    except Exception as e:
+        print(f"Error during ranking: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+def _parse_resume(filename, content):
+    """
+    (digest, skills) for one resume; skills is None when no text could be read.
+    content is bytes, an upload stream or a callable returning the bytes (a
+    zip member, only decompressed here, on the worker that parses it).
+    """
+    if callable(content):
+        try:
+            content = content()
+        except (zipfile.BadZipFile, zlib.error) as e:
+            print(f"Unreadable archive member {filename}: {e}")
+            return None, None
+    digest = resume_digest(content)
+    resume_text = extract_text(content, filename)
+    return digest, (extract_skills(resume_text) if resume_text else None)
+
+def _open_archive(file):
+    """Opens a zip upload and returns (zipfile, resume members) after checking its limits."""
+    try:
+        zf = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Archive is not a valid zip file.")
+    try:
+        members = [info for info in zf.infolist()
+                   if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_EXTENSIONS)]
+        # Checked from the central directory before anything is decompressed. zipfile
+        # never inflates a member past its declared size, so the totals hold.
+        if len(zf.infolist()) > BATCH_MAX_ARCHIVE_MEMBERS or len(members) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail="Archive has too many files.")
+        if sum(info.file_size for info in members) > BATCH_MAX_UNCOMPRESSED_BYTES:
+            raise HTTPException(status_code=413,
+                                detail=f"Archive expands to more than {BATCH_MAX_UNCOMPRESSED_BYTES} bytes.")
+        for info in members:
+            if info.file_size > UPLOAD_MAX_BYTES:
+                raise HTTPException(status_code=413, detail=f"{info.filename} exceeds {UPLOAD_MAX_BYTES} bytes.")
+    except BaseException:
+        zf.close()
+        raise
+    return zf, members
+
+@app.post("/analyze/batch")
+async def analyze_batch(
+    job_role: str = Form(...),
+    resumes: List[UploadFile] = File(None),
+    archive: UploadFile = File(None)
+):
+    """
+    Analyzes many resumes (multipart files and/or a zip archive) for one role.
+    Streams one JSON result per line (NDJSON) in upload order.
+    """
+    job_skills = await IO_POOL.run(get_skills_for_role, job_role)
+    if not job_skills:
+        raise HTTPException(status_code=404, detail=f"Job role '{job_role}' not found.")
+
+    files = []
+    for upload in resumes or []:
+        _check_upload(upload)
+        files.append((upload.filename, upload.file))
+
+    zf = None
+    try:
+        if archive is not None:
+            zf, members = await PARSE_POOL.run(_open_archive, archive.file)
+            # Members are decompressed lazily by the lane that parses them
+            files.extend((info.filename, functools.partial(zf.read, info)) for info in members)
+
+        if not files:
+            raise HTTPException(status_code=400, detail="No resumes provided.")
+        if len(files) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_FILES} resumes.")
+
+        # 1. Parse every resume concurrently
+        with span("batch_parse"):
+            parsed = await PARSE_POOL.run_many(_parse_resume, files)
+    finally:
+        if zf is not None:
+            zf.close()
+
+    # 2. Encode the de-duplicated union of skills the model will see once, in large batches
+    with span("batch_prefetch"):
+        await INFERENCE_POOL.run(prefetch_embeddings, [skills for _, skills in parsed if skills], job_skills)
+    remember_candidates_later([
+        (digest, filename, skills) for (filename, _), (digest, skills) in zip(files, parsed) if skills is not None
+    ])
+
+    # 3. Stream per-resume results (matching now runs entirely from the embedding cache)
+    def result_lines():
+        for (filename, _), (_, user_skills) in zip(files, parsed):
+            if user_skills is None:
+                yield json.dumps({"filename": filename, "error": "Could not extract text from resume."}) + "\n"
+                continue
+            matched, missing, match_score = get_match_results(user_skills, job_skills)
+            yield json.dumps({
+                "filename": filename,
+                "role": job_role,
+                "resume_score": round(match_score, 1),
+                "matched_skills": matched,
+                "missing_skills": missing,
+                "user_skills_detected": user_skills
+            }) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+def _check_candidate_token(authorization):
+    # Candidate data is personal: the endpoint needs its own token, whatever CORS allows
+    if not CANDIDATE_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Candidate search is disabled (set GAP_CANDIDATE_API_TOKEN).")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), CANDIDATE_API_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing candidate API token.",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+@app.get("/candidates")
+async def find_candidates(role: str, top_k: int = 10, authorization: str = Header(None)):
+    """Best previously analyzed resumes for a role, scored from the candidate store without re-parsing."""
+    _check_candidate_token(authorization)
+    job_skills = await IO_POOL.run(get_skills_for_role, role)
+    if not job_skills:
+        raise HTTPException(status_code=404, detail=f"Job role '{role}' not found.")
+    store = get_candidate_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="The candidate store is disabled.")
+    if await IO_POOL.run(lambda: store.needs_reencode):
+        raise HTTPException(status_code=503, detail="The candidate store is being migrated to a new model; "
+                                                    "run `python candidate_store.py --compact`.")
+
+    with span("candidate_search"):
+        matches = await INFERENCE_POOL.run(store.query, job_skills, max(1, top_k))
+    return {"role": role, "candidates_indexed": await IO_POOL.run(len, store), "results": matches}
+
 if __name__ == "__main__":
     uvicorn.run("api:app", host="127.0.0.1", port=8000, reload=True)
@@ -1,40 +1,122 @@
+import threading
 import matplotlib.pyplot as plt
 import streamlit as st
-from github_analyzer import analyze_github_profile
-from resume_parser import extract_text_from_pdf, extract_text_from_docx, extract_skills_from_resume
-from utils import get_skills_for_role, calculate_github_score
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from github_analyzer import analyze_github, calculate_github_score
+from resume_parser import extract_text, extract_skills
 from gap_engine import analyze_skill_gap, calculate_career_readiness, generate_recommendations
-from job_roles_data import job_roles
+from job_roles_data import get_job_roles, get_skills_for_role
+from model_registry import warmup
+from result_cache import resume_digest, GITHUB_TTL
+from pipeline import Pipeline, Stage, run_in_thread
+from config import PIPELINE_GITHUB_TIMEOUT
+
+# Streamlit re-runs this script on every widget change. Anything expensive is
+# cached: the model and skill embeddings once per server, parsing per upload
+# (keyed on its SHA-256), GitHub per username, and matching per (skills, role),
+# so switching roles only re-runs the match step.
+
+@st.cache_resource(show_spinner="Loading AI model...")
+def load_engine():
+    # Model plus the embeddings of every known skill, shared by all sessions
+    warmup()
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def parse_resume(digest, filename, _data):
+    # _data is not hashed; the digest identifies the upload
+    resume_text = extract_text(_data, filename)
+    return extract_skills(resume_text) if resume_text else None
+
+class GitHubUnavailable(Exception):
+    pass
+
+@st.cache_data(show_spinner=False, ttl=GITHUB_TTL, max_entries=256)
+def _cached_github_profile(username):
+    github_data = analyze_github(username)
+    if github_data is None:
+        # Raising keeps the failure out of st.cache_data, so the next run asks GitHub again
+        raise GitHubUnavailable(username)
+    return github_data, calculate_github_score(github_data)
+
+def github_profile(username):
+    try:
+        return _cached_github_profile(username)
+    except GitHubUnavailable:
+        return None, 0
+
+@st.cache_data(max_entries=1024)
+def match_role(user_skills, role):
+    return analyze_skill_gap(list(user_skills), get_skills_for_role(role))
+
+def _parse_stage(upload):
+    return parse_resume(*upload)
+
+def _match_stage(user_skills, role):
+    return None if user_skills is None else match_role(tuple(user_skills), role)
+
+def _github_stage(github_username):
+    return github_profile(github_username) if github_username else (None, 0)
+
+def session_runner():
+    # st.cache_* needs this session's script context on the pipeline's threads too
+    ctx = get_script_run_ctx()
+
+    def call(fn):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+
+    async def run(fn):
+        return await run_in_thread(call, fn)
+    return run
+
+# The cached steps above run as a pipeline so a GitHub fetch overlaps resume
+# parsing and matching; cache hits finish immediately either way.
+ANALYSIS = Pipeline([
+    Stage("user_skills", _parse_stage, deps=("upload",), pool="session"),
+    Stage("match", _match_stage, deps=("user_skills", "role"), pool="session"),
+    Stage("github", _github_stage, deps=("github_username",), pool="session",
+          optional=True, default=(None, 0), timeout=PIPELINE_GITHUB_TIMEOUT),
+], inputs=("upload", "role", "github_username"))
+
+@st.cache_resource(max_entries=64)
+def gap_chart(n_matched, n_missing):
+    fig = plt.figure()
+    plt.bar(["Matched Skills", "Missing Skills"], [n_matched, n_missing])
+    plt.title("Skill Gap Analysis")
+    plt.ylabel("Number of Skills")
+    return fig
 
 st.title("AI Opportunity Gap Analyzer")
 
+load_engine()
+
 # Job role dropdown
-role = st.selectbox("Select Target Job Role", list(job_roles.keys()))
+role = st.selectbox("Select Target Job Role", get_job_roles())
 
 # Resume input
-uploaded_file = st.file_uploader("Upload Resume", type=["pdf", "docx"])
+uploaded_file = st.file_uploader("Upload Resume", type=["pdf", "docx", "txt"])
 
 # GitHub input
-github_username = st.text_input("Enter GitHub Username")
+github_username = st.text_input("Enter GitHub Username").strip()
 
+# Keep showing results after the first click so changing the role re-analyzes instantly
 if st.button("Analyze", key="analyze_button"):
+    st.session_state["analyzed"] = True
 
-    if uploaded_file is not None:
-
-        if uploaded_file.type == "application/pdf":
-            resume_text = extract_text_from_pdf(uploaded_file)
+if st.session_state.get("analyzed"):
 
-        elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            resume_text = extract_text_from_docx(uploaded_file)
+    if uploaded_file is not None:
 
-        else:
-            st.error("Unsupported file format")
+        data = uploaded_file.getvalue()
+        with st.spinner("Analyzing..."):
+            result = ANALYSIS.run({"upload": (resume_digest(data), uploaded_file.name, data),
+                                   "role": role, "github_username": github_username},
+                                  runners={"session": session_runner()})
+        if result["user_skills"] is None:
+            st.error("Could not extract text from resume.")
             st.stop()
 
-        user_skills = extract_skills_from_resume(resume_text)
-        job_skills = get_skills_for_role(role)
-
-        matched, missing, score = analyze_skill_gap(user_skills, job_skills)
+        matched, missing, score = result["match"]
 
         st.success("Analysis Completed")
 
@@ -51,33 +133,22 @@ if st.button("Analyze", key="analyze_button"):
         st.write(missing)
 
         st.subheader("Skill Gap Overview")
+        st.pyplot(gap_chart(len(matched), len(missing)))
 
-        labels = ["Matched Skills", "Missing Skills"]
-        values = [len(matched), len(missing)]
-
-        fig = plt.figure()
-        plt.bar(labels, values)
-        plt.title("Skill Gap Analysis")
-        plt.ylabel("Number of Skills")
-
-        st.pyplot(fig)
-
+        github_data, github_score = result["github"]
         if github_username:
-            github_data = analyze_github_profile(github_username)
-
             if github_data:
                 st.subheader("GitHub Profile Insights")
 
-                st.write("Public Repositories:", github_data["total_repos"])
+                st.write("Public Repositories:", github_data["public_repos"])
                 st.write("Followers:", github_data["followers"])
                 st.write("Total Stars:", github_data["total_stars"])
 
                 st.subheader("Languages Used")
-                st.write(github_data["languages"])
+                st.write(github_data["top_languages"])
             else:
                 st.warning("Invalid GitHub username")
 
-        github_score = calculate_github_score(github_data) if github_username else 0
         career_score = calculate_career_readiness(score, github_score)
 
         st.divider()
@@ -92,4 +163,3 @@ if st.button("Analyze", key="analyze_button"):
 
     else:
         st.warning("Please upload resume")
-
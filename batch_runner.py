@@ -0,0 +1,211 @@
+"""
+Scores a pool of resumes against one role for cli.py --batch.
+
+Files are split into chunks and fanned out over a process pool. Each worker
+loads the model once in its initializer, parses a whole chunk, encodes the
+union of its skills in one batch and then matches every resume from the
+embedding cache. Results are appended to the output as chunks finish, so the
+output file doubles as the checkpoint: a rerun skips files already written.
+"""
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from config import MODEL_NAME, PDF_WORKERS
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+CSV_FIELDS = ["file", "role", "resume_score", "matched_skills", "missing_skills", "user_skills", "error"]
+
+
+def discover_resumes(inputs):
+    """Expands directories (recursively), globs and plain paths into a sorted list of resume files."""
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for dirpath, _, filenames in os.walk(item):
+                found.update(os.path.join(dirpath, f) for f in filenames)
+        else:
+            found.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(os.path.abspath(p) for p in found if p.lower().endswith(SUPPORTED_EXTENSIONS))
+
+
+def _init_worker(model_name):
+    from model_registry import get_model
+    get_model(model_name)
+
+
+def analyze_chunk(paths, role, job_skills, pdf_workers=PDF_WORKERS):
+    """
+    One result record per path; failures are recorded, never raised.
+    pdf_workers is 1 inside pool workers: they are daemonic and cannot start
+    the page-range processes extract_pdf_text uses for long PDFs.
+    """
+    from resume_parser import extract_text, extract_skills
+    from analyzer import prefetch_embeddings
+    from gap_engine import analyze_skill_gap
+    from candidate_store import remember_candidates
+    from result_cache import resume_digest
+
+    parsed = []
+    digests = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                digests[path] = resume_digest(f)
+            text = extract_text(path, pdf_workers=pdf_workers)
+            parsed.append((path, extract_skills(text) if text else None, None if text else "Could not extract text."))
+        except Exception as e:
+            parsed.append((path, None, str(e)))
+
+    # One large encode for the whole chunk; matching below is served from the cache
+    prefetch_embeddings([s for _, s, _ in parsed if s], job_skills)
+    # Also make the pool searchable by role later (candidate_store.py / GET /candidates)
+    remember_candidates([(digests[p], os.path.basename(p), s) for p, s, error in parsed if error is None])
+
+    records = []
+    for path, user_skills, error in parsed:
+        record = {"file": path, "role": role, "resume_score": None, "matched_skills": [],
+                  "missing_skills": [], "user_skills": user_skills or [], "error": error}
+        if error is None:
+            matched, missing, score = analyze_skill_gap(user_skills, job_skills)
+            record.update(resume_score=round(score, 2), matched_skills=matched, missing_skills=missing)
+        records.append(record)
+    return records
+
+
+def output_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def completed_files(path, fmt):
+    """Files already present in an existing output, i.e. the checkpoint."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            # Only rows ended by a newline count; a row cut short has missing (None) fields
+            text = f.read()
+            rows = csv.DictReader(io.StringIO(text[:text.rfind("\n") + 1]))
+            done.update(row["file"] for row in rows if row.get("file") and None not in row.values())
+        else:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["file"])
+                except (ValueError, KeyError):
+                    # A line cut short by an interruption; that file is simply redone
+                    continue
+    return done
+
+
+class ResultWriter:
+    """Appends records as JSONL or CSV, flushing after every chunk so progress survives a crash."""
+
+    def __init__(self, path, fmt, append):
+        self.fmt = fmt
+        if append and fmt == "csv" and os.path.exists(path):
+            self._truncate_partial_row(path)
+        new_file = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if new_file:
+                self._csv.writeheader()
+        elif not new_file:
+            self._terminate_partial_line(path)
+
+    @staticmethod
+    def _truncate_partial_row(path):
+        # New rows must not be glued onto a row an interrupted run left unfinished
+        with open(path, "rb+") as f:
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+
+    def _terminate_partial_line(self, path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self._file.write("\n")
+
+    def write(self, records):
+        for record in records:
+            if self.fmt == "csv":
+                row = dict(record)
+                for key in ("matched_skills", "missing_skills", "user_skills"):
+                    row[key] = "; ".join(row[key])
+                self._csv.writerow(row)
+            else:
+                self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def _progress(done, total, failed, started):
+    elapsed = time.time() - started
+    rate = done / elapsed if elapsed else 0
+    eta = (total - done) / rate if rate else 0
+    sys.stderr.write(f"\r[{done}/{total}] {rate:.1f} files/s, {failed} failed, ETA {eta:.0f}s ")
+    sys.stderr.flush()
+
+
+def run_batch(inputs, role, job_skills, output, fmt=None, workers=None, chunk_size=32, restart=False):
+    """Analyzes every resume under inputs and writes results to output. Returns (written, failed)."""
+    fmt = output_format(output, fmt)
+    paths = discover_resumes(inputs)
+    done = set() if restart else completed_files(output, fmt)
+    todo = [p for p in paths if p not in done]
+
+    if done:
+        print(f"Resuming: {len(paths) - len(todo)} of {len(paths)} files already in {output}", file=sys.stderr)
+    if not todo:
+        return 0, 0
+
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    writer = ResultWriter(output, fmt, append=not restart)
+    written = failed = 0
+    started = time.time()
+    pool = None
+
+    try:
+        if workers <= 1:
+            _init_worker(MODEL_NAME)
+            results = (analyze_chunk(chunk, role, job_skills) for chunk in chunks)
+        else:
+            pool = Pool(workers, initializer=_init_worker, initargs=(MODEL_NAME,))
+            # The pool already spreads files over processes; long PDFs are read serially inside each
+            results = pool.imap_unordered(_analyze_chunk_args, [(chunk, role, job_skills, 1) for chunk in chunks])
+
+        for records in results:
+            writer.write(records)
+            written += len(records)
+            failed += sum(1 for r in records if r["error"])
+            _progress(written, len(todo), failed, started)
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+    except KeyboardInterrupt:
+        if pool is not None:
+            pool.terminate()
+        print(f"\nInterrupted after {written} files; rerun the same command to continue.", file=sys.stderr)
+        raise
+    finally:
+        writer.close()
+
+    sys.stderr.write("\n")
+    return written, failed
+
+
+def _analyze_chunk_args(args):
+    return analyze_chunk(*args)
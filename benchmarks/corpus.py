@@ -0,0 +1,119 @@
+"""
+Synthetic resume corpus for benchmarks.
+
+Resumes are generated deterministically from a seed with a controlled
+length (words) and skill density (share of words that are taxonomy skills),
+in TXT, DOCX and PDF form.
+"""
+import io
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from resume_parser import SKILL_DATA
+
+FILLER = (
+    "designed built maintained delivered improved led team project customers data platform "
+    "service pipeline reporting production stakeholders quality performance scalable features "
+    "analysis release documentation testing reliable internal users workflow automation"
+).split()
+
+SECTIONS = ["Summary", "Experience", "Projects", "Education", "Skills"]
+
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 45
+
+
+def resume_text(words=400, skill_density=0.05, seed=0):
+    """Plain-text resume of about `words` words, `skill_density` of them skills."""
+    rng = random.Random(seed)
+    skills = [s for group in SKILL_DATA.values() for s in group]
+    section_words = max(words // len(SECTIONS), 1)
+    lines = []
+    line = []
+    for i in range(words):
+        if i % section_words == 0 and i // section_words < len(SECTIONS):
+            if line:
+                lines.append(" ".join(line) + ".")
+                line = []
+            lines.append(SECTIONS[i // section_words])
+        line.append(rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER))
+        if len(line) == WORDS_PER_LINE:
+            lines.append(" ".join(line) + ".")
+            line = []
+    if line:
+        lines.append(" ".join(line) + ".")
+    return "\n".join(lines)
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(text):
+    """Minimal multi-page PDF (Helvetica text) containing the given lines."""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    n = len(pages)
+    font_id = 3 + 2 * n
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{3 + 2 * i} 0 R" for i in range(n)), n),
+    ]
+    for i, page_lines in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        body = "BT /F1 10 Tf 14 TL 50 750 Td " + " ".join(f"({_pdf_escape(l)}) '" for l in page_lines) + " ET"
+        objects.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(out.tell())
+        out.write(f"{i + 1} 0 obj\n{obj}\nendobj\n".encode("latin-1", "replace"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def docx_bytes(text):
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def generate_corpus(directory, count=10, words=400, skill_density=0.05, formats=("txt", "docx", "pdf")):
+    """Writes count resumes per format into directory and returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        text = resume_text(words, skill_density, seed=i)
+        for fmt in formats:
+            path = os.path.join(directory, f"resume_{i:04d}.{fmt}")
+            if fmt == "txt":
+                data = text.encode("utf-8")
+            elif fmt == "docx":
+                data = docx_bytes(text)
+            else:
+                data = pdf_bytes(text)
+            with open(path, "wb") as f:
+                f.write(data)
+            paths.append(path)
+    return paths
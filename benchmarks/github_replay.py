@@ -0,0 +1,67 @@
+"""
+Offline GitHub API for benchmarks and tests.
+
+Recorded REST responses (benchmarks/fixtures/github_api.json, keyed by path
+and query) are served by a requests transport adapter mounted on a real
+GitHubClient, so the analyzer runs its usual request fan-out, response
+cache and JSON parsing without touching the network.
+"""
+import json
+import os
+import sys
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from github_client import GitHubClient, ResponseCache
+
+FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "github_api.json")
+BASE_URL = "https://api.github.com"
+
+
+def load_recording(path=FIXTURE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["responses"]
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from a recording; anything not recorded is a 404."""
+
+    def __init__(self, recording):
+        super().__init__()
+        self.recording = recording
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request.path_url)
+        recorded = self.recording.get(request.path_url, {"status": 404, "headers": {},
+                                                         "body": {"message": "Not Found"}})
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response._content = json.dumps(recorded["body"]).encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def replay_client(recording=None, ttl=0, stale_ttl=0):
+    """
+    GitHubClient backed by the recording and an in-memory cache. With the
+    default ttl=0 every lookup goes through the transport, like a cold cache.
+    """
+    client = GitHubClient(base_url=BASE_URL, token="", cache=ResponseCache(":memory:"),
+                          ttl=ttl, stale_ttl=stale_ttl)
+    adapter = ReplayAdapter(load_recording() if recording is None else recording)
+    client.session.mount("https://", adapter)
+    client.session.mount("http://", adapter)
+    return client, adapter
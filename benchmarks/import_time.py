@@ -0,0 +1,68 @@
+"""
+Startup budget guard.
+
+Imports each entry point in a fresh interpreter, checks that no heavy ML
+module (torch, sentence-transformers) was pulled in, and fails if the median
+wall time exceeds the budget.
+
+    python benchmarks/import_time.py [--budget-ms 1000] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must never be imported just to start up
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers")
+
+TARGETS = {
+    "import analyzer": "import analyzer",
+    "import semantic_matcher": "import semantic_matcher",
+    "import gap_engine": "import gap_engine",
+    "cli.py --help": "import sys; sys.argv = ['cli.py', '--help']\ntry:\n    import cli; cli.main()\nexcept SystemExit:\n    pass",
+    "cli.py --list-roles": "import sys; sys.argv = ['cli.py', '--list-roles']\nimport cli; cli.main()",
+}
+
+CHECK = "\nimport sys\nleaked = [m for m in {heavy!r} if m in sys.modules]\nif leaked:\n    sys.exit('heavy modules imported: ' + ', '.join(leaked))\n"
+
+
+def time_target(code, runs):
+    script = code + CHECK.format(heavy=HEAVY_MODULES)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT,
+                              capture_output=True, text=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+    return statistics.median(timings), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard the import-time startup budget")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="Max median startup time per target")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target")
+    args = parser.parse_args()
+
+    failures = 0
+    for name, code in TARGETS.items():
+        median_ms, error = time_target(code, args.runs)
+        if error:
+            print(f"FAIL  {name:<26} {error}")
+            failures += 1
+        elif median_ms > args.budget_ms:
+            print(f"FAIL  {name:<26} {median_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+            failures += 1
+        else:
+            print(f"ok    {name:<26} {median_ms:8.1f} ms")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+End-to-end stage benchmarks over a synthetic resume corpus.
+
+Generates TXT/DOCX/PDF resumes of a controlled size and skill density, times
+every analysis stage per resume, and reports throughput, p50/p95/p99 and
+peak RSS. GitHub analysis replays recorded API responses through the real
+client (benchmarks/github_replay.py), so no network is used.
+
+    python benchmarks/run_benchmarks.py --count 20 --words 600 --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --tolerance 0.2
+
+In compare mode the run fails if any stage's p95 is more than `tolerance`
+slower than the baseline.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+
+from corpus import generate_corpus
+from github_replay import replay_client
+
+from config import MODEL_NAME, EMBEDDING_BACKEND
+from resume_parser import extract_text, extract_skills
+from analyzer import get_match_results, generate_detailed_roadmap
+from semantic_matcher import semantic_skill_match
+from github_analyzer import analyze_github_async, calculate_github_score
+from job_roles_data import JOB_ROLES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = [
+    "extract_text",
+    "extract_skills",
+    "get_match_results",
+    "semantic_skill_match",
+    "analyze_github",
+    "calculate_github_score",
+    "generate_detailed_roadmap",
+]
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile (q in 0-100) of a non-empty list."""
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed(timings, stage, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    timings[stage].append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def run(paths, roles, github_client, iterations=1):
+    """Runs every stage for every resume against every role; returns per-stage timings in ms."""
+    timings = {stage: [] for stage in STAGES}
+    for _ in range(iterations):
+        for path in paths:
+            text = timed(timings, "extract_text", extract_text, path)
+            user_skills = timed(timings, "extract_skills", extract_skills, text)
+            github_data = timed(timings, "analyze_github", asyncio.run,
+                                analyze_github_async("octocat", client=github_client))
+            timed(timings, "calculate_github_score", calculate_github_score, github_data)
+            for role in roles:
+                job_skills = JOB_ROLES[role]
+                _, missing, _ = timed(timings, "get_match_results", get_match_results, user_skills, job_skills)
+                timed(timings, "semantic_skill_match", semantic_skill_match, user_skills, job_skills)
+                timed(timings, "generate_detailed_roadmap", generate_detailed_roadmap, missing)
+    return timings
+
+
+def summarize(timings):
+    report = {}
+    for stage, values in timings.items():
+        if not values:
+            continue
+        total_s = sum(values) / 1000
+        report[stage] = {
+            "calls": len(values),
+            "p50_ms": round(percentile(values, 50), 4),
+            "p95_ms": round(percentile(values, 95), 4),
+            "p99_ms": round(percentile(values, 99), 4),
+            "throughput_per_s": round(len(values) / total_s, 2) if total_s else None,
+        }
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Stages whose p95 got slower than baseline * (1 + tolerance)."""
+    regressions = []
+    for stage, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or not previous["p95_ms"]:
+            continue
+        ratio = current["p95_ms"] / previous["p95_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append((stage, previous["p95_ms"], current["p95_ms"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every analysis stage on a synthetic corpus")
+    parser.add_argument("--count", type=int, default=10, help="Resumes per format")
+    parser.add_argument("--words", type=int, default=400, help="Words per resume")
+    parser.add_argument("--skill-density", type=float, default=0.05, help="Share of words that are skills")
+    parser.add_argument("--formats", default="txt,docx,pdf", help="Comma separated: txt, docx, pdf")
+    parser.add_argument("--iterations", type=int, default=3, help="Passes over the corpus")
+    parser.add_argument("--save", help="Write the report as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    github_client, _ = replay_client()
+    roles = list(JOB_ROLES)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate_corpus(directory, args.count, args.words, args.skill_density,
+                                tuple(f.strip() for f in args.formats.split(",")))
+
+        # Untimed warm pass: model load and embedding cache fill are not per-request costs
+        run(paths[:1], roles, github_client)
+
+        start = time.perf_counter()
+        timings = run(paths, roles, github_client, args.iterations)
+        wall_s = time.perf_counter() - start
+
+    report = {
+        "corpus": {"resumes": len(paths), "words": args.words, "skill_density": args.skill_density,
+                   "formats": args.formats, "iterations": args.iterations},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "model": MODEL_NAME, "backend": EMBEDDING_BACKEND},
+        "resumes_per_s": round(len(paths) * args.iterations / wall_s, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": summarize(timings),
+    }
+
+    print(f"{'stage':<28}{'calls':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>12}")
+    for stage, s in report["stages"].items():
+        print(f"{stage:<28}{s['calls']:>8}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}"
+              f"{s['p99_ms']:>10.3f}{s['throughput_per_s'] or 0:>12.1f}")
+    print(f"\nEnd-to-end: {report['resumes_per_s']} resumes/s")
+    if report["peak_rss_mb"] is not None:
+        print(f"Peak RSS:   {report['peak_rss_mb']:.1f} MB")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for stage, before, after, ratio in regressions:
+            print(f"REGRESSION  {stage:<28} p95 {before:.3f} -> {after:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No p95 regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
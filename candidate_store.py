@@ -0,0 +1,532 @@
+"""
+Persistent store of analyzed candidates for reverse search (role -> resumes).
+
+Every analyzed resume is recorded once, keyed by the SHA-256 of its bytes,
+with its extracted skills and their normalized embeddings. Data lives in
+append-only segments under GAP_CANDIDATE_STORE_DIR:
+
+    <segment>.f16     float16 skill embedding rows, memory-mapped for queries
+    <segment>.keys    int64 hash of each row's canonical skill (exact/alias hits)
+    <segment>.jsonl   one record per candidate; a record is committed once its line is complete
+    manifest.json     model, dimension and the live segments, replaced atomically
+
+Re-adding a candidate supersedes its older record. compact() rewrites the live
+records into fresh segments. The API records candidates on a background
+writer thread, which also compacts once superseded records pass
+GAP_CANDIDATE_COMPACT_RATIO. After a model change the store neither records
+nor answers queries until it is re-encoded, which is left to the CLI:
+
+    python candidate_store.py --role "Data Scientist" --top-k 10
+    python candidate_store.py --compact
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import (
+    CANDIDATE_STORE_DIR,
+    CANDIDATE_SEGMENT_ROWS,
+    CANDIDATE_QUERY_CHUNK_ROWS,
+    CANDIDATE_COMPACT_RATIO,
+)
+import embedding_cache
+from analyzer import MATCH_THRESHOLD, _normalize_rows
+from model_registry import model_id
+from skill_matcher import canonical_skill
+
+try:
+    import fcntl  # POSIX only; serialises writers across worker processes
+except ImportError:
+    fcntl = None
+
+STORE_VERSION = 1
+
+
+def skill_key(skill):
+    """Stable 64-bit id of a skill's canonical form, so aliases compare equal."""
+    digest = hashlib.sha1(canonical_skill(skill).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little", signed=True)
+
+
+class Segment:
+    """One append-only segment; only complete .jsonl lines (and their rows) are visible."""
+
+    def __init__(self, directory, name, dim):
+        self.name = name
+        self.base = os.path.join(directory, name)
+        self.dim = dim
+        self.records = []
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.live = np.zeros(0, dtype=bool)
+        self.n_rows = 0
+        self.rows = None
+        self.keys = None
+        self._offset = 0
+        self.refresh()
+
+    def refresh(self):
+        """Picks up records appended since the last look; True when there were any."""
+        path = self.base + ".jsonl"
+        if not os.path.exists(path) or os.path.getsize(path) <= self._offset:
+            return False
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return False
+
+        starts, counts = [], []
+        for line in data[:end].splitlines():
+            record = json.loads(line)
+            self.records.append(record)
+            starts.append(self.n_rows)
+            counts.append(len(record["skills"]))
+            self.n_rows += len(record["skills"])
+        self.starts = np.concatenate([self.starts, np.array(starts, dtype=np.int64)])
+        self.counts = np.concatenate([self.counts, np.array(counts, dtype=np.int64)])
+        self._offset += end
+
+        if self.n_rows:
+            self.rows = np.memmap(self.base + ".f16", dtype=np.float16, mode="r", shape=(self.n_rows, self.dim))
+            self.keys = np.memmap(self.base + ".keys", dtype=np.int64, mode="r", shape=(self.n_rows,))
+        return True
+
+    def append(self, records, rows, keys):
+        """Rows and keys first, then the records that point at them. Caller holds the write lock."""
+        if len(rows):
+            with open(self.base + ".f16", "ab") as f:
+                f.truncate(self.n_rows * self.dim * 2)
+                f.write(np.asarray(rows, dtype=np.float16).tobytes())
+            with open(self.base + ".keys", "ab") as f:
+                f.truncate(self.n_rows * 8)
+                f.write(np.asarray(keys, dtype=np.int64).tobytes())
+        with open(self.base + ".jsonl", "ab") as f:
+            # Drop any half-written line left by a crashed writer
+            f.truncate(self._offset)
+            f.write("".join(json.dumps(r) + "\n" for r in records).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self.refresh()
+
+    def remove(self):
+        for ext in (".f16", ".keys", ".jsonl"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.base + ext)
+
+
+class CandidateStore:
+    """Append-only candidate segments with vectorized role queries."""
+
+    def __init__(self, directory=CANDIDATE_STORE_DIR, segment_rows=CANDIDATE_SEGMENT_ROWS):
+        self.directory = directory
+        self.segment_rows = segment_rows
+        self.manifest = None
+        self.segments = []
+        self._latest = {}
+        self._manifest_stat = False  # never equal to a real stat, so the first refresh loads
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._refresh()
+
+    # ---- state -----------------------------------------------------------
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.directory, "manifest.json")
+
+    def _refresh(self):
+        """Follows other processes: a new manifest reloads everything, otherwise the active segment is tailed."""
+        try:
+            stat = os.stat(self._manifest_path)
+            stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            stat = None
+
+        if stat != self._manifest_stat:
+            self._manifest_stat = stat
+            if stat is None:
+                self.manifest = {"version": STORE_VERSION, "model": None, "dim": None, "segments": []}
+            else:
+                with open(self._manifest_path, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            # Sealed segments never change, so ones we already hold are kept (and tailed)
+            held = {seg.name: seg for seg in self.segments if seg.dim == self.manifest["dim"]}
+            self.segments = [held.get(name) or Segment(self.directory, name, self.manifest["dim"])
+                             for name in self.manifest["segments"]]
+            for segment in self.segments:
+                if segment.name in held:
+                    segment.refresh()
+            self._reindex()
+        elif self.segments and self.segments[-1].refresh():
+            self._reindex()
+
+    def _reindex(self):
+        """Latest record per candidate id wins; everything older is dead until compaction."""
+        self._latest = {}
+        for si, segment in enumerate(self.segments):
+            for ri, record in enumerate(segment.records):
+                self._latest[record["id"]] = (si, ri)
+        for segment in self.segments:
+            segment.live = np.zeros(len(segment.records), dtype=bool)
+        for si, ri in self._latest.values():
+            self.segments[si].live[ri] = True
+
+    def _write_manifest(self, **changes):
+        manifest = dict(self.manifest, **changes)
+        tmp = f"{self._manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._manifest_path)
+        self._manifest_stat = False
+        self._refresh()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """
+        Serialises writers across threads and processes. It does not take
+        _lock, so readers keep going while a writer embeds or compacts;
+        writers take _lock (after this) only to append or swap the manifest.
+        """
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _new_segment_name(self):
+        existing = [int(name) for name in self.manifest["segments"]]
+        return f"{max(existing, default=0) + 1:06d}"
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._latest)
+
+    def __contains__(self, candidate_id):
+        with self._lock:
+            self._refresh()
+            return candidate_id in self._latest
+
+    def get(self, candidate_id):
+        with self._lock:
+            self._refresh()
+            ref = self._latest.get(candidate_id)
+            return dict(self.segments[ref[0]].records[ref[1]]) if ref else None
+
+    @property
+    def needs_reencode(self):
+        """True when the stored embeddings come from another model (fixed by compact())."""
+        with self._lock:
+            self._refresh()
+            return self.manifest["model"] not in (None, model_id())
+
+    @property
+    def dead_ratio(self):
+        with self._lock:
+            total = sum(len(s.records) for s in self.segments)
+            return 1 - len(self._latest) / total if total else 0.0
+
+    # ---- writes ----------------------------------------------------------
+
+    @staticmethod
+    def _embed(skill_lists):
+        """Normalized float32 rows and skill keys for every skill of every candidate, one encode call."""
+        unique = sorted({s for skills in skill_lists for s in skills})
+        if not unique:
+            return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int64)
+        matrix = _normalize_rows(embedding_cache.encode(unique))
+        position = {s: i for i, s in enumerate(unique)}
+        rows = [position[s] for skills in skill_lists for s in skills]
+        keys = np.array([skill_key(s) for skills in skill_lists for s in skills], dtype=np.int64)
+        return matrix[rows], keys
+
+    def _is_stale(self):
+        """Caller holds _lock."""
+        if self.manifest["model"] in (None, model_id()):
+            return False
+        # Re-encoding the whole store is too slow for a write; it is a CLI step
+        print(f"Candidate store holds {self.manifest['model']} embeddings; not recording "
+              f"until `python candidate_store.py --compact` re-encodes it.")
+        return True
+
+    def _is_new(self, candidate_id, skills):
+        """Caller holds _lock."""
+        ref = self._latest.get(candidate_id)
+        return ref is None or self.segments[ref[0]].records[ref[1]]["skills"] != skills
+
+    def add_many(self, candidates):
+        """
+        Records (candidate_id, name, skills) tuples. Candidates already stored
+        with the same skills are skipped; changed ones supersede the old record.
+        Skills are embedded without holding _lock, so lookups are not held up.
+        """
+        with self._lock:
+            self._refresh()
+            if self._is_stale():
+                return 0
+            fresh = []
+            for candidate_id, name, skills in candidates:
+                skills = list(dict.fromkeys(skills or []))
+                if self._is_new(candidate_id, skills):
+                    fresh.append({"id": candidate_id, "name": name, "skills": skills, "added_at": time.time()})
+        if not fresh:
+            return 0
+
+        rows, keys = self._embed([r["skills"] for r in fresh])
+        with self._file_lock(), self._lock:
+            self._refresh()
+            if self._is_stale():
+                return 0
+            # Another writer may have recorded some of these while we were embedding
+            ends = np.cumsum([len(r["skills"]) for r in fresh])
+            kept = [i for i, r in enumerate(fresh) if self._is_new(r["id"], r["skills"])]
+            picked = np.concatenate([np.arange(ends[i] - len(fresh[i]["skills"]), ends[i]) for i in kept] or
+                                    [np.zeros(0, dtype=np.int64)]).astype(np.int64)
+            fresh, rows, keys = [fresh[i] for i in kept], rows[picked], keys[picked]
+            if not fresh:
+                return 0
+
+            if self.manifest["dim"] is None:
+                if not rows.size:
+                    # No segment exists before the dimension is known, and skill-less
+                    # candidates never match a role, so there is nothing to record yet
+                    return 0
+                self._write_manifest(model=model_id(), dim=int(rows.shape[1]))
+            self._append_locked(fresh, rows, keys)
+            return len(fresh)
+
+    def _append_locked(self, records, rows, keys):
+        """Appends to the active segment, starting a new one whenever it is full."""
+        start = row = 0
+        while start < len(records):
+            if not self.segments or self.segments[-1].n_rows >= self.segment_rows:
+                self._write_manifest(model=model_id(), segments=self.manifest["segments"] + [self._new_segment_name()])
+            room = self.segment_rows - self.segments[-1].n_rows
+            end, end_row = start, row
+            # Always take at least one record so an oversized candidate still lands somewhere
+            while end < len(records) and (end == start or end_row - row + len(records[end]["skills"]) <= room):
+                end_row += len(records[end]["skills"])
+                end += 1
+            self.segments[-1].append(records[start:end], rows[row:end_row], keys[row:end_row])
+            start, row = end, end_row
+        self._reindex()
+
+    def compact(self):
+        """
+        Rewrites live records into fresh segments and drops superseded ones.
+        Other writers wait on the file lock; readers keep using the old
+        segments until the new manifest is swapped in.
+        """
+        with self._file_lock():
+            with self._lock:
+                self._refresh()
+                old = list(self.segments)
+                live = [(s, ri) for s in old for ri in np.flatnonzero(s.live)]
+                manifest = dict(self.manifest)
+            names, dim = self._rewrite(live, manifest)
+            with self._lock:
+                self._write_manifest(model=model_id(), dim=dim, segments=names)
+        for segment in old:
+            # Readers that still map the old files keep working until they refresh
+            segment.remove()
+
+    def _rewrite(self, live, manifest):
+        """Writes live (segment, record) pairs to new segments, not yet in the manifest."""
+        reencode = manifest["model"] != model_id()
+        dim = manifest["dim"]
+        base = max((int(n) for n in manifest["segments"]), default=0) + 1
+        names, current = [], None
+        for start in range(0, len(live), 1024):
+            batch = live[start:start + 1024]
+            records = [s.records[ri] for s, ri in batch]
+            if reencode:
+                rows, keys = self._embed([r["skills"] for r in records])
+                dim = int(rows.shape[1]) if rows.size else dim
+            else:
+                spans = [(s, s.starts[ri], s.starts[ri] + s.counts[ri]) for s, ri in batch]
+                rows = np.concatenate([np.asarray(s.rows[a:b]) for s, a, b in spans if b > a] or [np.zeros((0, dim or 0))])
+                keys = np.concatenate([np.asarray(s.keys[a:b]) for s, a, b in spans if b > a] or [np.zeros(0, dtype=np.int64)])
+            if current is None or current.n_rows >= self.segment_rows:
+                current = Segment(self.directory, f"{base + len(names):06d}", dim)
+                names.append(current.name)
+            current.append(records, rows, keys)
+        return names, dim
+
+    # ---- queries ---------------------------------------------------------
+
+    def query(self, role_skills, k=10, threshold=MATCH_THRESHOLD, chunk_rows=CANDIDATE_QUERY_CHUNK_ROWS):
+        """
+        Best k candidates for a role. Every stored skill row is scored against
+        the role's skill matrix in chunks; a role skill counts as matched when
+        any of the candidate's skills has the same canonical form or a cosine
+        above threshold, as in analyzer.get_match_results.
+        """
+        role_skills = list(dict.fromkeys(role_skills))
+        with self._lock:
+            self._refresh()
+            segments = list(self.segments)
+        if not role_skills or not segments or self.manifest["dim"] is None:
+            return []
+        if self.needs_reencode:
+            print("Candidate store needs re-encoding: run `python candidate_store.py --compact`.")
+            return []
+
+        role_matrix = _normalize_rows(embedding_cache.encode(role_skills)).astype(np.float32)
+        role_keys = np.array([skill_key(s) for s in role_skills], dtype=np.int64)
+
+        scores, refs, hit_rows = [], [], []
+        for segment in segments:
+            # Records with no skills own no rows; the rest are contiguous in row space
+            scored = np.flatnonzero(segment.counts > 0)
+            if not len(scored):
+                continue
+            ends = segment.starts[scored] + segment.counts[scored]
+            i = 0
+            while i < len(scored):
+                row_lo = segment.starts[scored[i]]
+                j = max(int(np.searchsorted(ends, row_lo + chunk_rows, side="right")), i + 1)
+                row_hi = ends[j - 1]
+                block = scored[i:j]
+
+                sims = np.asarray(segment.rows[row_lo:row_hi], dtype=np.float32) @ role_matrix.T
+                hits = (sims > threshold) | (np.asarray(segment.keys[row_lo:row_hi])[:, None] == role_keys[None, :])
+                per_candidate = np.logical_or.reduceat(hits, segment.starts[block] - row_lo, axis=0)
+
+                keep = segment.live[block]
+                scores.append(per_candidate[keep].sum(axis=1) / len(role_skills) * 100)
+                refs.extend((segment, ri) for ri in block[keep])
+                hit_rows.append(per_candidate[keep])
+                i = j
+
+        if not refs:
+            return []
+        scores = np.concatenate(scores)
+        hit_rows = np.concatenate(hit_rows)
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for t in top:
+            segment, ri = refs[t]
+            record = segment.records[ri]
+            results.append({
+                "id": record["id"],
+                "name": record["name"],
+                "match_score": float(scores[t]),
+                "matched_skills": [s for s, hit in zip(role_skills, hit_rows[t]) if hit],
+                "missing_skills": [s for s, hit in zip(role_skills, hit_rows[t]) if not hit],
+                "skills": record["skills"],
+                "added_at": record["added_at"],
+            })
+        return results
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_candidate_store():
+    """Process-wide store, or None when GAP_CANDIDATE_STORE_DIR is empty."""
+    global _store
+    if not CANDIDATE_STORE_DIR:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = CandidateStore(CANDIDATE_STORE_DIR)
+        return _store
+
+
+def remember_candidates(candidates):
+    """Best-effort recording of analyzed resumes; never fails the analysis itself."""
+    store = get_candidate_store()
+    if store is None:
+        return 0
+    try:
+        return store.add_many(candidates)
+    except Exception as e:
+        print(f"Candidate store error: {e}")
+        return 0
+
+
+def compact_if_needed(ratio=CANDIDATE_COMPACT_RATIO):
+    """Drops superseded records once they pass ratio; a store that needs re-encoding is left to the CLI."""
+    store = get_candidate_store()
+    if store is None or store.needs_reencode or store.dead_ratio <= ratio:
+        return
+    try:
+        store.compact()
+    except Exception as e:
+        print(f"Candidate store compaction error: {e}")
+
+
+_writer = None
+
+
+def remember_candidates_later(candidates):
+    """
+    Queues remember_candidates (and a compaction check) on the store's single
+    background writer, so encoding skills never holds up a request.
+    Returns the future, or None when the store is disabled.
+    """
+    global _writer
+    if get_candidate_store() is None:
+        return None
+    with _store_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="candidate-store")
+
+    def write():
+        written = remember_candidates(candidates)
+        compact_if_needed()
+        return written
+    return _writer.submit(write)
+
+
+def shutdown_writer():
+    """Waits for queued candidate writes."""
+    global _writer
+    with _store_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.shutdown(wait=True)
+
+
+def main():
+    from job_roles_data import get_skills_for_role
+
+    parser = argparse.ArgumentParser(description="Candidate store maintenance and reverse search")
+    parser.add_argument("--role", help="Find the best stored candidates for this role")
+    parser.add_argument("--top-k", type=int, default=10, help="Number of candidates to show")
+    parser.add_argument("--compact", action="store_true", help="Drop superseded records")
+    args = parser.parse_args()
+
+    if not CANDIDATE_STORE_DIR:
+        print("Candidate store disabled (GAP_CANDIDATE_STORE_DIR is empty)")
+        return
+    store = CandidateStore(CANDIDATE_STORE_DIR)
+    if args.compact:
+        store.compact()
+    print(f"Candidates: {len(store)} in {len(store.segments)} segment(s), {store.dead_ratio:.0%} superseded")
+
+    if args.role:
+        role_skills = get_skills_for_role(args.role)
+        if not role_skills:
+            parser.error(f"unknown role '{args.role}'")
+        for r in store.query(role_skills, args.top_k):
+            print(f"{r['match_score']:6.1f}%  {r['name']}  missing: {', '.join(r['missing_skills']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
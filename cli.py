@@ -1,93 +1,142 @@
 import argparse
 import os
 import sys
-from resume_parser import extract_text_from_pdf, extract_text_from_docx, extract_skills_from_resume
-from github_analyzer import analyze_github_profile
+from resume_parser import extract_text, extract_skills
+from github_analyzer import analyze_github, calculate_github_score
 from gap_engine import analyze_skill_gap, calculate_career_readiness, generate_recommendations
-from utils import get_skills_for_role, calculate_github_score
-from job_roles_data import job_roles
+from job_roles_data import get_job_roles, get_skills_for_role
+from batch_runner import run_batch
+from pipeline import Pipeline, Stage
+from config import PIPELINE_GITHUB_TIMEOUT
+
+def _resume_skills(resume_path):
+    # 1-2. Extract resume text, then skills
+    if not resume_path:
+        return []
+    return extract_skills(extract_text(resume_path))
+
+def _skill_gap(user_skills, job_skills):
+    # 3. Loads the model only now, and only on embedding cache misses
+    return analyze_skill_gap(user_skills, job_skills)
+
+def _github_profile(github_username):
+    if not github_username:
+        return None, 0
+    github_data = analyze_github(github_username)
+    return github_data, calculate_github_score(github_data)
+
+def _recommendations(gap, github):
+    return generate_recommendations(gap[1], github[1])
+
+# The GitHub fetch runs while the resume is parsed and matched
+ANALYSIS = Pipeline([
+    Stage("user_skills", _resume_skills, deps=("resume_path",)),
+    Stage("gap", _skill_gap, deps=("user_skills", "job_skills")),
+    Stage("github", _github_profile, deps=("github_username",),
+          optional=True, default=(None, 0), timeout=PIPELINE_GITHUB_TIMEOUT),
+    Stage("recommendations", _recommendations, deps=("gap", "github")),
+], inputs=("resume_path", "job_skills", "github_username"))
 
 def main():
     parser = argparse.ArgumentParser(description="AI Opportunity Gap Analyzer - CLI")
-    parser.add_argument("--resume", type=str, required=True, help="Path to resume file (PDF or DOCX)")
-    parser.add_argument("--role", type=str, required=True, help=f"Target job role. Options: {', '.join(job_roles.keys())}")
+    parser.add_argument("--resume", type=str, help="Path to resume file (PDF, DOCX or TXT)")
+    parser.add_argument("--role", type=str, help=f"Target job role. Options: {', '.join(get_job_roles())}")
     parser.add_argument("--github", type=str, help="GitHub username")
+    parser.add_argument("--list-roles", action="store_true", help="List available job roles and exit")
+    parser.add_argument("--batch", nargs="+", metavar="PATH", help="Directories, globs or files to score against --role")
+    parser.add_argument("--output", type=str, help="Batch results file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Batch output format (default: from --output extension)")
+    parser.add_argument("--workers", type=int, default=None, help="Batch worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Resumes per worker task in batch mode")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing batch output instead of resuming from it")
 
     args = parser.parse_args()
 
-    if not os.path.exists(args.resume):
-        print(f"Error: File not found: {args.resume}")
-        sys.exit(1)
+    if args.list_roles:
+        for role in get_job_roles():
+            print(role)
+        return
+
+    if args.batch:
+        if not args.role or not args.output:
+            parser.error("--batch requires --role and --output")
+        job_skills = get_skills_for_role(args.role)
+        if not job_skills:
+            print(f"Error: Job role '{args.role}' not found. Available roles: {', '.join(get_job_roles())}")
+            sys.exit(1)
+        try:
+            written, failed = run_batch(args.batch, args.role, job_skills, args.output, args.format,
+                                        args.workers, args.chunk_size, args.restart)
+        except KeyboardInterrupt:
+            sys.exit(130)
+        print(f"Wrote {written} results to {args.output} ({failed} could not be read)")
+        return
+
+    if not args.resume and not args.github:
+        parser.error("provide --resume and --role, or --github for a GitHub-only score")
+
+    job_skills = None
+    if args.resume:
+        if not args.role:
+            parser.error("--role is required with --resume")
+
+        if not os.path.exists(args.resume):
+            print(f"Error: File not found: {args.resume}")
+            sys.exit(1)
+
+        if not args.resume.endswith(('.pdf', '.docx', '.txt')):
+            print("Error: Unsupported file format. Use PDF, DOCX, or TXT.")
+            sys.exit(1)
+
+        job_skills = get_skills_for_role(args.role)
+        if not job_skills:
+            print(f"Error: Job role '{args.role}' not found. Available roles: {', '.join(get_job_roles())}")
+            sys.exit(1)
+
+        print(f"\n--- Analyzing Resume: {os.path.basename(args.resume)} ---")
 
-    print(f"\n--- Analyzing Resume: {os.path.basename(args.resume)} ---")
-    
-    # 1. Extract Resume Text
-    if args.resume.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(args.resume)
-    elif args.resume.endswith('.docx'):
-        resume_text = extract_text_from_docx(args.resume)
-    elif args.resume.endswith('.txt'):
-        from resume_parser import extract_text_from_txt
-        resume_text = extract_text_from_txt(args.resume)
-    else:
-        print("Error: Unsupported file format. Use PDF, DOCX, or TXT.")
-        sys.exit(1)
-
-    # 2. Extract Skills
-    user_skills = extract_skills_from_resume(resume_text)
-    job_skills = get_skills_for_role(args.role)
-
-    if not job_skills:
-        print(f"Error: Job role '{args.role}' not found. Available roles: {', '.join(job_roles.keys())}")
-        sys.exit(1)
-
-    # 3. Analyze Skill Gap
-    matched, missing, score = analyze_skill_gap(user_skills, job_skills)
-
-    # 4. GitHub Analysis
-    github_data = None
-    github_score = 0
     if args.github:
         print(f"--- Analyzing GitHub Profile: {args.github} ---")
-        github_data = analyze_github_profile(args.github)
-        if github_data:
-            github_score = calculate_github_score(github_data)
-        else:
-            print("Warning: Could not fetch GitHub data.")
+
+    result = ANALYSIS.run({"resume_path": args.resume, "job_skills": job_skills, "github_username": args.github})
+    matched, missing, score = result["gap"]
+    github_data, github_score = result["github"]
+    recommendations = result["recommendations"]
+
+    if args.github and not github_data:
+        print("Warning: Could not fetch GitHub data.")
 
     # 5. Career Readiness Score
     career_score = calculate_career_readiness(score, github_score)
 
-    # 6. Generate Recommendations
-    recommendations = generate_recommendations(missing, github_score)
-
     # --- Output Results ---
     print("\n" + "="*50)
     print("AI OPPORTUNITY GAP ANALYSIS RESULTS")
     print("="*50)
-    print(f"Target Role:        {args.role}")
+    print(f"Target Role:        {args.role or 'N/A (GitHub only)'}")
     print(f"Resume Score:       {round(score, 2)}%")
     print(f"GitHub Score:       {github_score}%")
     print(f"Overall Readiness:  {career_score}%")
     print("-" * 50)
     
-    print("\n[MATCHED SKILLS]:")
-    if matched:
-        for s in matched: print(f"  * {s}")
-    else:
-        print("  None")
-
-    print("\n[MISSING SKILLS]:")
-    if missing:
-        for s in missing: print(f"  * {s}")
-    else:
-        print("  None (Perfect match!)")
+    if args.resume:
+        print("\n[MATCHED SKILLS]:")
+        if matched:
+            for s in matched: print(f"  * {s}")
+        else:
+            print("  None")
+
+        print("\n[MISSING SKILLS]:")
+        if missing:
+            for s in missing: print(f"  * {s}")
+        else:
+            print("  None (Perfect match!)")
 
     if github_data:
         print("\n[GITHUB INSIGHTS]:")
-        print(f"  Public Repos:  {github_data['total_repos']}")
+        print(f"  Public Repos:  {github_data['public_repos']}")
         print(f"  Total Stars:   {github_data['total_stars']}")
-        print(f"  Top Languages: {', '.join(github_data['languages'].keys())}")
+        print(f"  Top Languages: {', '.join(github_data['top_languages'])}")
 
     print("\n[RECOMMENDATIONS]:")
     for rec in recommendations:
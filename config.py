@@ -0,0 +1,104 @@
+import os
+
+# Central settings for the analyzer. Every value can be overridden with a
+# GAP_* environment variable so API workers, the CLI and the dashboard can be
+# tuned without code changes.
+
+# Sentence embedding model shared by every matcher
+MODEL_NAME = os.environ.get("GAP_MODEL_NAME", "all-MiniLM-L6-v2")
+
+# Inference backend: torch (fp32), torch-int8 (dynamic quantization) or onnx
+EMBEDDING_BACKEND = os.environ.get("GAP_EMBEDDING_BACKEND", "torch")
+
+# Persistent embedding cache (in-memory LRU in front of a memory-mapped file)
+EMBEDDING_CACHE_DIR = os.environ.get("GAP_EMBEDDING_CACHE_DIR", ".embedding_cache")
+EMBEDDING_CACHE_DTYPE = os.environ.get("GAP_EMBEDDING_CACHE_DTYPE", "float32")  # float32 or float16
+EMBEDDING_CACHE_MEMORY_SIZE = int(os.environ.get("GAP_EMBEDDING_CACHE_MEMORY_SIZE", "4096"))
+
+# Whole-analysis result memoization (resume part keyed by upload SHA-256)
+RESULT_CACHE_SIZE = int(os.environ.get("GAP_RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_PATH = os.environ.get("GAP_RESULT_CACHE_PATH", "")  # e.g. .result_cache/results.sqlite to share across workers
+RESULT_CACHE_RESUME_TTL = float(os.environ.get("GAP_RESULT_CACHE_RESUME_TTL", str(7 * 24 * 3600)))
+RESULT_CACHE_GITHUB_TTL = float(os.environ.get("GAP_RESULT_CACHE_GITHUB_TTL", "600"))
+
+# Micro-batching of cache misses from concurrent requests into one model call
+INFERENCE_BATCHING = os.environ.get("GAP_INFERENCE_BATCHING", "1") == "1"
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("GAP_INFERENCE_MAX_BATCH_SIZE", "64"))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get("GAP_INFERENCE_MAX_WAIT_MS", "5"))
+
+# Batch analysis
+BATCH_MAX_FILES = int(os.environ.get("GAP_BATCH_MAX_FILES", "1000"))
+
+# Uploads are parsed from memory; only files above the spool size touch disk
+UPLOAD_MAX_BYTES = int(os.environ.get("GAP_UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.environ.get("GAP_UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+BATCH_MAX_BYTES = int(os.environ.get("GAP_BATCH_MAX_BYTES", str(500 * 1024 * 1024)))
+# Zip archives: entries listed, and bytes decompressed across all of them (zip bomb guard)
+BATCH_MAX_ARCHIVE_MEMBERS = int(os.environ.get("GAP_BATCH_MAX_ARCHIVE_MEMBERS", "5000"))
+BATCH_MAX_UNCOMPRESSED_BYTES = int(os.environ.get("GAP_BATCH_MAX_UNCOMPRESSED_BYTES", str(256 * 1024 * 1024)))
+
+# Optional extra skill taxonomy (.txt, .json or .csv) merged into resume_parser.SKILL_DATA
+SKILL_TAXONOMY_PATH = os.environ.get("GAP_SKILL_TAXONOMY_PATH", "")
+
+# Skill extraction: "exact" finds literal taxonomy names only; "semantic" also embeds the resume's
+# candidate phrases and keeps taxonomy skills they are close to (semantic_extractor.py)
+SKILL_EXTRACTION_MODE = os.environ.get("GAP_SKILL_EXTRACTION_MODE", "exact")
+SEMANTIC_EXTRACTION_THRESHOLD = float(os.environ.get("GAP_SEMANTIC_EXTRACTION_THRESHOLD", "0.75"))  # as MATCH_THRESHOLD
+SEMANTIC_EXTRACTION_MAX_PHRASES = int(os.environ.get("GAP_SEMANTIC_EXTRACTION_MAX_PHRASES", "512"))  # per resume
+SEMANTIC_EXTRACTION_MAX_NGRAM = int(os.environ.get("GAP_SEMANTIC_EXTRACTION_MAX_NGRAM", "3"))        # words per phrase
+SEMANTIC_EXTRACTION_BATCH_SIZE = int(os.environ.get("GAP_SEMANTIC_EXTRACTION_BATCH_SIZE", "256"))      # phrases per encode call
+SEMANTIC_EXTRACTION_PHRASE_CACHE = int(os.environ.get("GAP_SEMANTIC_EXTRACTION_PHRASE_CACHE", "8192"))  # in memory only
+
+# External role catalog (a .json/.csv file or a directory of them) merged over job_roles_data.JOB_ROLES,
+# and the persisted IVF index used to shortlist roles for a candidate
+ROLE_CATALOG_PATH = os.environ.get("GAP_ROLE_CATALOG_PATH", "")
+ROLE_INDEX_DIR = os.environ.get("GAP_ROLE_INDEX_DIR", ".role_index")
+ROLE_INDEX_NLIST = int(os.environ.get("GAP_ROLE_INDEX_NLIST", "0"))     # IVF lists, 0 = sqrt(number of roles)
+ROLE_INDEX_NPROBE = int(os.environ.get("GAP_ROLE_INDEX_NPROBE", "8"))   # lists searched per query
+ROLE_INDEX_SHORTLIST = int(os.environ.get("GAP_ROLE_INDEX_SHORTLIST", "200"))  # roles re-scored skill by skill
+
+# Precomputed pairwise similarities of the known skill vocabulary (similarity_table.py); "" disables it
+SIMILARITY_TABLE_DIR = os.environ.get("GAP_SIMILARITY_TABLE_DIR", ".similarity_table")
+SIMILARITY_TABLE_DTYPE = os.environ.get("GAP_SIMILARITY_TABLE_DTYPE", "float32")  # float32 or float16
+SIMILARITY_TABLE_RECHECK_SECONDS = float(os.environ.get("GAP_SIMILARITY_TABLE_RECHECK_SECONDS", "5"))  # manifest stat interval
+
+# Store of analyzed candidates (skills + float16 skill embeddings) for reverse search.
+# Opt-in: it keeps every uploaded resume's skills, so it stays off unless a directory is set
+CANDIDATE_STORE_DIR = os.environ.get("GAP_CANDIDATE_STORE_DIR", "")
+# Bearer token required by GET /candidates; while empty the endpoint is refused
+CANDIDATE_API_TOKEN = os.environ.get("GAP_CANDIDATE_API_TOKEN", "")
+CANDIDATE_SEGMENT_ROWS = int(os.environ.get("GAP_CANDIDATE_SEGMENT_ROWS", "262144"))       # skill rows per segment file
+CANDIDATE_QUERY_CHUNK_ROWS = int(os.environ.get("GAP_CANDIDATE_QUERY_CHUNK_ROWS", "65536"))  # rows scored per matrix multiply
+CANDIDATE_COMPACT_RATIO = float(os.environ.get("GAP_CANDIDATE_COMPACT_RATIO", "0.3"))      # superseded share that triggers compaction
+
+# PDF extraction limits
+PDF_MAX_PAGES = int(os.environ.get("GAP_PDF_MAX_PAGES", "50"))            # 0 = no page ceiling
+PDF_MAX_CHARS = int(os.environ.get("GAP_PDF_MAX_CHARS", "200000"))        # 0 = no text ceiling
+PDF_PAGE_TIMEOUT = float(os.environ.get("GAP_PDF_PAGE_TIMEOUT", "5"))     # seconds, 0 = no timeout
+PDF_WORKERS = int(os.environ.get("GAP_PDF_WORKERS", "4"))                 # processes for long PDFs, 0/1 = serial
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("GAP_PDF_PARALLEL_MIN_PAGES", "16"))
+
+# API worker pools: blocking work runs here instead of on the event loop
+API_PARSE_WORKERS = int(os.environ.get("GAP_API_PARSE_WORKERS", "4"))
+API_INFERENCE_WORKERS = int(os.environ.get("GAP_API_INFERENCE_WORKERS", "2"))
+API_IO_WORKERS = int(os.environ.get("GAP_API_IO_WORKERS", "16"))
+API_QUEUE_LIMIT = int(os.environ.get("GAP_API_QUEUE_LIMIT", "64"))  # waiting jobs per pool before answering 429
+API_SERVER_TIMING = os.environ.get("GAP_API_SERVER_TIMING", "0") == "1"  # per-stage Server-Timing response header
+
+# GitHub API client and its conditional-request cache
+GITHUB_API_URL = os.environ.get("GAP_GITHUB_API_URL", "https://api.github.com")
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+GITHUB_CACHE_PATH = os.environ.get("GAP_GITHUB_CACHE_PATH", ".github_cache/responses.sqlite")
+GITHUB_CACHE_TTL = float(os.environ.get("GAP_GITHUB_CACHE_TTL", "300"))              # seconds served without asking GitHub
+GITHUB_CACHE_STALE_TTL = float(os.environ.get("GAP_GITHUB_CACHE_STALE_TTL", "86400"))  # then served stale while revalidating
+GITHUB_CACHE_NEGATIVE_TTL = float(os.environ.get("GAP_GITHUB_CACHE_NEGATIVE_TTL", "300"))  # 404s (unknown users/repos)
+GITHUB_TIMEOUT = float(os.environ.get("GAP_GITHUB_TIMEOUT", "10"))
+GITHUB_POOL_SIZE = int(os.environ.get("GAP_GITHUB_POOL_SIZE", "16"))
+GITHUB_CONCURRENCY = int(os.environ.get("GAP_GITHUB_CONCURRENCY", "8"))           # parallel requests per profile
+GITHUB_PER_PAGE = int(os.environ.get("GAP_GITHUB_PER_PAGE", "100"))
+# Repos whose /languages is read: one request each, so keep it low on the 60/hour anonymous rate limit
+GITHUB_MAX_LANGUAGE_REPOS = int(os.environ.get("GAP_GITHUB_MAX_LANGUAGE_REPOS", "100" if GITHUB_TOKEN else "10"))
+
+# Analysis pipeline (pipeline.py): GitHub runs alongside resume parsing and is optional,
+# so a slow or failing profile fetch degrades to a resume-only result after this long
+PIPELINE_GITHUB_TIMEOUT = float(os.environ.get("GAP_PIPELINE_GITHUB_TIMEOUT", "20"))  # seconds, 0 = no timeout
@@ -0,0 +1,132 @@
+"""
+Selectable CPU inference backends for the sentence embedding model.
+
+    torch       the original fp32 PyTorch SentenceTransformer
+    torch-int8  the same model with its Linear layers dynamically quantized to int8
+    onnx        ONNX Runtime export (needs sentence-transformers>=3.2 and optimum[onnxruntime])
+
+The backend is chosen with GAP_EMBEDDING_BACKEND. Before switching a
+deployment, verify it makes the same match/missing decisions as fp32:
+
+    python embedding_backends.py --check torch-int8
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from config import MODEL_NAME
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+# Candidate skill lists phrased the way resumes phrase them, including near
+# misses, so decisions around the 0.75 / 0.7 thresholds are exercised
+ACCURACY_FIXTURES = [
+    ["Python", "SQL", "Pandas", "NumPy", "Matplotlib", "Machine Learning"],
+    ["Deep Learning", "PyTorch", "TensorFlow", "NLP", "Computer Vision", "Transformers"],
+    ["JavaScript", "React", "Redux", "HTML5", "CSS3", "Responsive web design"],
+    ["Node.js", "Express.js", "Postgres", "MongoDB", "RESTful APIs", "JWT auth"],
+    ["AWS", "Terraform", "k8s", "Docker", "VPC networking", "AWS Lambda"],
+    ["scikit learn", "feature selection", "statistical modeling", "data viz", "large language models"],
+    ["Java", "Spring Boot", "Microservices", "Kafka", "CI/CD", "Agile"],
+    ["Excel", "Communication", "Leadership", "Project Management", "Tableau", "PowerBI"],
+]
+
+THRESHOLDS = (0.75, 0.7)  # analyzer.get_match_results and semantic_skill_match
+
+
+def load_backend(model_name=MODEL_NAME, backend="torch"):
+    """Builds the embedding model for a backend; every result exposes .encode()."""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    if backend == "torch-int8":
+        import torch
+
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    if backend == "onnx":
+        try:
+            return SentenceTransformer(model_name, device="cpu", backend="onnx")
+        except (TypeError, ImportError) as e:
+            raise RuntimeError(
+                "The onnx backend needs sentence-transformers>=3.2 and optimum[onnxruntime]"
+            ) from e
+
+    raise ValueError(f"Unknown embedding backend '{backend}'. Options: {', '.join(BACKENDS)}")
+
+
+def _best_scores(model, job_skills, fixtures):
+    """Best cosine similarity of every job skill against each fixture's skills."""
+    texts = list(dict.fromkeys(job_skills + [s for skills in fixtures for s in skills]))
+    vectors = np.asarray(model.encode(texts, convert_to_numpy=True), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    position = {text: i for i, text in enumerate(texts)}
+
+    job_matrix = vectors[[position[s] for s in job_skills]]
+    return [
+        (job_matrix @ vectors[[position[s] for s in skills]].T).max(axis=1)
+        for skills in fixtures
+    ]
+
+
+def check_backend_accuracy(backend, model_name=MODEL_NAME, baseline="torch", fixtures=None):
+    """
+    Compares a backend's match/missing decisions with the fp32 baseline at
+    every production threshold. An empty "mismatches" list means the backend
+    is safe to deploy.
+    """
+    from job_roles_data import JOB_ROLES
+
+    fixtures = ACCURACY_FIXTURES if fixtures is None else fixtures
+    job_skills = sorted({s for skills in JOB_ROLES.values() for s in skills})
+
+    base_scores = _best_scores(load_backend(model_name, baseline), job_skills, fixtures)
+    cand_scores = _best_scores(load_backend(model_name, backend), job_skills, fixtures)
+
+    mismatches = []
+    max_delta = 0.0
+    for i, (base, cand) in enumerate(zip(base_scores, cand_scores)):
+        max_delta = max(max_delta, float(np.abs(base - cand).max()))
+        for threshold in THRESHOLDS:
+            for skill, b, c in zip(job_skills, base, cand):
+                if (b > threshold) != (c > threshold):
+                    mismatches.append({
+                        "fixture": i,
+                        "job_skill": skill,
+                        "threshold": threshold,
+                        "baseline_score": round(float(b), 4),
+                        "backend_score": round(float(c), 4),
+                    })
+
+    return {
+        "backend": backend,
+        "baseline": baseline,
+        "decisions": len(fixtures) * len(job_skills) * len(THRESHOLDS),
+        "mismatches": mismatches,
+        "max_score_delta": max_delta,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend accuracy check")
+    parser.add_argument("--check", choices=BACKENDS, required=True, help="Backend to compare against fp32 torch")
+    parser.add_argument("--model", default=MODEL_NAME, help="Model name")
+    args = parser.parse_args()
+
+    report = check_backend_accuracy(args.check, args.model)
+    print(f"Backend:          {report['backend']} (baseline {report['baseline']})")
+    print(f"Decisions:        {report['decisions']}")
+    print(f"Max score delta:  {report['max_score_delta']:.4f}")
+    print(f"Mismatches:       {len(report['mismatches'])}")
+    for m in report["mismatches"]:
+        print(f"  fixture {m['fixture']} '{m['job_skill']}' @ {m['threshold']}: "
+              f"{m['baseline_score']} -> {m['backend_score']}")
+    sys.exit(1 if report["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
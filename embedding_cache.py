@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config import (
+    MODEL_NAME,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_CACHE_MEMORY_SIZE,
+    INFERENCE_BATCHING,
+)
+from inference_scheduler import get_batcher
+from model_registry import get_model, model_id
+
+try:
+    import fcntl  # POSIX only; used to serialise appends across worker processes
+except ImportError:
+    fcntl = None
+
+
+def normalize_text(text):
+    """Canonical form used for cache keys (trimmed, single-spaced)."""
+    return " ".join(str(text).split())
+
+
+def cache_key(model_name, text):
+    """Content address of an embedding: model name + normalized text."""
+    raw = f"{model_name}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Two-tier embedding cache for a single model.
+
+    Tier 1 is an in-memory LRU of float32 vectors. Tier 2 is an append-only
+    file of fixed-width rows opened with np.memmap, so embeddings survive
+    restarts and are shared by every process pointing at the same directory.
+    """
+
+    def __init__(self, model_name, cache_dir=EMBEDDING_CACHE_DIR,
+                 dtype=EMBEDDING_CACHE_DTYPE, memory_size=EMBEDDING_CACHE_MEMORY_SIZE):
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.memory_size = memory_size
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._lru = OrderedDict()
+        self._index = {}
+        self._dim = None
+        self._rows = None
+        self._lock = threading.Lock()
+
+        self._path = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+            self._path = os.path.join(cache_dir, f"{slug}.{self.dtype.name}")
+            self._load()
+
+    # ---- file tier -------------------------------------------------------
+
+    def _load(self):
+        """(Re)read the key index and map the row file."""
+        meta_path = self._path + ".json"
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self._dim = json.load(f)["dim"]
+
+        keys = []
+        if os.path.exists(self._path + ".idx"):
+            with open(self._path + ".idx", "r", encoding="utf-8") as f:
+                keys = f.read().split()
+
+        row_bytes = self._dim * self.dtype.itemsize
+        size = os.path.getsize(self._path + ".bin") if os.path.exists(self._path + ".bin") else 0
+        # A crash between the two appends can leave either file longer; trust the shorter one
+        n_rows = min(len(keys), size // row_bytes)
+
+        self._index = {key: i for i, key in enumerate(keys[:n_rows])}
+        self._rows = None
+        if n_rows:
+            self._rows = np.memmap(self._path + ".bin", dtype=self.dtype, mode="r",
+                                   shape=(n_rows, self._dim))
+
+    def _append(self, keys, vectors):
+        """Persist freshly encoded rows; data first, then the index that points at them."""
+        if self._dim is None:
+            self._dim = int(vectors.shape[1])
+            with open(self._path + ".json", "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dim": self._dim, "dtype": self.dtype.name}, f)
+
+        with open(self._path + ".idx", "a+", encoding="utf-8") as idx:
+            if fcntl:
+                fcntl.flock(idx, fcntl.LOCK_EX)
+            try:
+                # Another process may have appended since we last looked
+                self._load()
+                fresh = [(k, v) for k, v in zip(keys, vectors) if k not in self._index]
+                if not fresh:
+                    return
+                n_rows = len(self._index)
+                with open(self._path + ".bin", "ab") as data:
+                    data.truncate(n_rows * self._dim * self.dtype.itemsize)
+                    data.write(np.asarray([v for _, v in fresh], dtype=self.dtype).tobytes())
+                idx.seek(0)
+                idx.truncate(sum(len(k) + 1 for k in self._index))
+                idx.seek(0, os.SEEK_END)
+                idx.write("".join(k + "\n" for k, _ in fresh))
+                idx.flush()
+                self._load()
+            finally:
+                if fcntl:
+                    fcntl.flock(idx, fcntl.LOCK_UN)
+
+    # ---- memory tier -----------------------------------------------------
+
+    def _remember(self, key, vector):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_size:
+            self._lru.popitem(last=False)
+
+    def _lookup(self, key):
+        vector = self._lru.get(key)
+        if vector is not None:
+            self._lru.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return vector
+        row = self._index.get(key)
+        if row is not None:
+            vector = np.array(self._rows[row], dtype=np.float32)
+            self._remember(key, vector)
+            self.stats["disk_hits"] += 1
+            return vector
+        return None
+
+    # ---- public API ------------------------------------------------------
+
+    def get_many(self, texts, encode_fn):
+        """
+        Return a float32 matrix with one embedding per text.
+        Only texts never seen before are passed (as one batch) to encode_fn.
+        """
+        texts = [normalize_text(t) for t in texts]
+        keys = [cache_key(self.model_name, t) for t in texts]
+
+        with self._lock:
+            found = {}
+            pending = OrderedDict()
+            for key, text in zip(keys, texts):
+                if key in found or key in pending:
+                    continue
+                vector = self._lookup(key)
+                if vector is None:
+                    pending[key] = text
+                else:
+                    found[key] = vector
+
+        if pending:
+            encoded = np.asarray(encode_fn(list(pending.values())), dtype=np.float32)
+            with self._lock:
+                self.stats["misses"] += len(pending)
+                for key, vector in zip(pending, encoded):
+                    found[key] = vector
+                    self._remember(key, vector)
+                if self._path:
+                    try:
+                        self._append(list(pending), encoded)
+                    except OSError as e:
+                        print(f"Embedding cache write failed: {e}")
+
+        if not keys:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(model_name=MODEL_NAME):
+    """Process-wide store for a model, created on first use."""
+    with _stores_lock:
+        store = _stores.get(model_name)
+        if store is None:
+            store = EmbeddingStore(model_name)
+            _stores[model_name] = store
+        return store
+
+
+def _model_encode_fn(model_name):
+    if INFERENCE_BATCHING:
+        # Misses from concurrent requests are coalesced into one padded batch
+        return get_batcher(model_name).encode
+    return lambda batch: get_model(model_name).encode(batch, convert_to_numpy=True)
+
+
+def encode(texts, model_name=MODEL_NAME):
+    """
+    Cached drop-in for model.encode(texts) returning a float32 numpy matrix.
+    The shared model is only loaded if some text is not cached yet.
+    """
+    return get_store(model_id(model_name)).get_many(texts, _model_encode_fn(model_name))
+
+
+def encode_uncached(texts, model_name=MODEL_NAME):
+    """Same model path as encode (batcher included) but nothing is cached, for text that must not reach disk."""
+    texts = [normalize_text(t) for t in texts]
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.asarray(_model_encode_fn(model_name)(texts), dtype=np.float32)
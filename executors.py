@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    API_PARSE_WORKERS,
+    API_INFERENCE_WORKERS,
+    API_IO_WORKERS,
+    API_QUEUE_LIMIT,
+)
+
+
+class PoolSaturated(Exception):
+    """Raised when a pool already has its maximum number of jobs in flight."""
+
+    def __init__(self, pool_name):
+        super().__init__(f"The {pool_name} pool is busy, please retry shortly.")
+        self.pool_name = pool_name
+
+
+class BoundedPool:
+    """
+    Thread pool with admission control for blocking work called from async code.
+
+    At most `workers` jobs run at once and at most `queue_limit` more may wait;
+    anything beyond that is rejected immediately with PoolSaturated so callers
+    can shed load instead of piling up behind a slow worker.
+    """
+
+    def __init__(self, name, workers, queue_limit):
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _admit(self, jobs=1):
+        """Takes up to jobs slots and returns how many were taken; none free raises PoolSaturated."""
+        with self._lock:
+            free = self.capacity - self._in_flight
+            if free <= 0:
+                raise PoolSaturated(self.name)
+            taken = min(jobs, free)
+            self._in_flight += taken
+            return taken
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _submit(self, fn):
+        """
+        Submits an admitted job. Its slot is released when the thread finishes,
+        not when the awaiting coroutine does, so a cancelled request keeps
+        counting against the pool until its work actually stops.
+        """
+        try:
+            future = self._executor.submit(fn)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) on the pool without blocking the event loop."""
+        self._admit()
+        return await self._submit(functools.partial(fn, *args, **kwargs))
+
+    async def run_many(self, fn, arg_tuples):
+        """
+        Runs fn over many argument tuples, fanning out at most as wide as the
+        pool has workers and free slots: each admitted slot works through the
+        remaining tuples one at a time, so a large batch is neither rejected by
+        its own size nor allowed to take the queue slots other requests need.
+        Results keep input order.
+        """
+        arg_tuples = list(arg_tuples)
+        if not arg_tuples:
+            return []
+        # Lanes beyond the worker count would only wait in the queue
+        lanes = self._admit(min(len(arg_tuples), self.workers))
+        results = [None] * len(arg_tuples)
+        pending = iter(enumerate(arg_tuples))
+        pending_lock = threading.Lock()
+        stopped = threading.Event()
+
+        def lane():
+            while not stopped.is_set():
+                with pending_lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                i, args = item
+                try:
+                    results[i] = fn(*args)
+                except BaseException:
+                    stopped.set()
+                    raise
+
+        jobs = []
+        for submitted in range(lanes):
+            try:
+                jobs.append(self._submit(lane))
+            except BaseException:
+                stopped.set()
+                for _ in range(lanes - submitted - 1):
+                    self._release()
+                raise
+        try:
+            await asyncio.gather(*jobs)
+        except BaseException:
+            # Lanes stop picking up tuples; slots free up as their current ones finish
+            stopped.set()
+            raise
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# CPU-bound resume parsing and model inference are kept apart from network I/O,
+# so a burst of slow GitHub calls can never starve the matcher (or vice versa).
+PARSE_POOL = BoundedPool("parse", API_PARSE_WORKERS, API_QUEUE_LIMIT)
+INFERENCE_POOL = BoundedPool("inference", API_INFERENCE_WORKERS, API_QUEUE_LIMIT)
+IO_POOL = BoundedPool("io", API_IO_WORKERS, API_QUEUE_LIMIT)
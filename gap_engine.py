@@ -8,7 +8,8 @@ def analyze_skill_gap(user_skills, job_skills):
         return matched, missing, 0
 
     matched = semantic_skill_match(user_skills, job_skills)
-    missing = [skill for skill in job_skills if skill not in matched]
+    matched_set = set(matched)
+    missing = [skill for skill in job_skills if skill not in matched_set]
 
     match_score = (len(matched) / len(job_skills)) * 100
 
@@ -1,47 +1,130 @@
-import requests
+import asyncio
+import re
 
-def analyze_github(username):
+from config import GITHUB_CONCURRENCY, GITHUB_PER_PAGE, GITHUB_MAX_LANGUAGE_REPOS
+from github_client import get_client
+
+def _last_page(link_header):
+    """Page count advertised by GitHub's Link header (1 when there is no rel="last")."""
+    match = re.search(r'[?&]page=(\d+)[^>]*>;\s*rel="last"', link_header or "")
+    return int(match.group(1)) if match else 1
+
+async def analyze_github_async(username, concurrency=GITHUB_CONCURRENCY,
+                               max_language_repos=GITHUB_MAX_LANGUAGE_REPOS, client=None):
     """
-    Evaluates GitHub contributions and activity.
+    Full-fidelity GitHub profile: every page of repositories plus per-repo
+    language byte breakdowns (for at most max_language_repos repositories),
+    fetched concurrently under a bounded semaphore.
     Returns a dictionary of metrics or None if user not found.
+    client defaults to the process-wide github_client.get_client().
+
+    The HTTP client is blocking (requests, behind the shared cache), so each
+    request runs on the loop's default executor via asyncio.to_thread; the
+    coroutine never blocks the loop, but every in-flight request holds a thread.
     """
     if not username:
         return None
-        
-    base_url = f"https://api.github.com/users/{username}"
-    
-    try:
-        user_res = requests.get(base_url)
-        if user_res.status_code != 200:
-            return None
-            
-        user_data = user_res.json()
-        repos_res = requests.get(f"{base_url}/repos")
-        repos_data = repos_res.json() if repos_res.status_code == 200 else []
-        
-        languages = {}
-        stars = 0
-        
-        for repo in repos_data:
+
+    client = client or get_client()
+    base_url = f"/users/{username}"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(path, params=None):
+        # The cached client is synchronous; run it on a thread, bounded by the semaphore
+        async with semaphore:
+            res = await asyncio.to_thread(client.get, path, params)
+        return res.json() if res.status_code == 200 else None, res
+
+    def page_params(page):
+        return {"per_page": GITHUB_PER_PAGE, "page": page}
+
+    # The profile and the first page of repos are independent
+    (user_data, _), (first_page, first_res) = await asyncio.gather(
+        fetch(base_url), fetch(f"{base_url}/repos", page_params(1))
+    )
+    if user_data is None:
+        return None
+
+    stars = 0
+    repo_count = 0
+    language_counts = {}
+    language_bytes = {}
+    language_tasks = []
+    unscanned = 0  # repos whose byte breakdown was not fetched (over the cap) or failed
+
+    def add_page(repos):
+        nonlocal stars, repo_count, unscanned
+        for repo in repos or []:
+            repo_count += 1
             stars += repo.get("stargazers_count", 0)
             lang = repo.get("language")
             if lang:
-                languages[lang] = languages.get(lang, 0) + 1
-        
-        # Sort languages by frequency
-        sorted_langs = sorted(languages.items(), key=lambda x: x[1], reverse=True)
-        top_langs = [l[0] for l in sorted_langs[:5]]
-        
-        return {
-            "username": username,
-            "name": user_data.get("name", username),
-            "public_repos": user_data.get("public_repos", 0),
-            "followers": user_data.get("followers", 0),
-            "total_stars": stars,
-            "top_languages": top_langs,
-            "bio": user_data.get("bio", ""),
-            "profile_url": user_data.get("html_url", "")
-        }
+                language_counts[lang] = language_counts.get(lang, 0) + 1
+            if repo.get("full_name") and len(language_tasks) < max_language_repos:
+                language_tasks.append(asyncio.ensure_future(fetch(f"/repos/{repo['full_name']}/languages")))
+            elif lang:
+                unscanned += 1
+
+    # Remaining pages are requested all at once; language lookups start as each page lands
+    add_page(first_page)
+    n_pages = _last_page(first_res.headers.get("Link"))
+    page_tasks = [fetch(f"{base_url}/repos", page_params(page)) for page in range(2, n_pages + 1)]
+    for done in asyncio.as_completed(page_tasks):
+        repos, _ = await done
+        add_page(repos)
+
+    for done in asyncio.as_completed(language_tasks):
+        breakdown, _ = await done
+        if breakdown is None:
+            unscanned += 1
+        for lang, n_bytes in (breakdown or {}).items():
+            language_bytes[lang] = language_bytes.get(lang, 0) + n_bytes
+
+    # Rank languages by bytes of code when every repo was broken down; otherwise
+    # bytes would only describe the first few repos, so rank by repository count
+    # (bytes break ties) over every language seen
+    if language_bytes and not unscanned:
+        ranking = language_bytes
+    else:
+        ranking = {lang: (language_counts.get(lang, 0), language_bytes.get(lang, 0))
+                   for lang in {**language_counts, **language_bytes}}
+    sorted_langs = sorted(ranking.items(), key=lambda x: x[1], reverse=True)
+    top_langs = [l[0] for l in sorted_langs[:5]]
+
+    return {
+        "username": username,
+        "name": user_data.get("name", username),
+        "public_repos": user_data.get("public_repos", 0),
+        "followers": user_data.get("followers", 0),
+        "total_stars": stars,
+        "top_languages": top_langs,
+        "language_bytes": language_bytes,
+        "repos_scanned": repo_count,
+        "bio": user_data.get("bio", ""),
+        "profile_url": user_data.get("html_url", "")
+    }
+
+def analyze_github(username):
+    """
+    Evaluates GitHub contributions and activity.
+    Returns a dictionary of metrics or None if user not found.
+
+    Blocking wrapper: it drives analyze_github_async with asyncio.run, so it
+    raises RuntimeError when called from a thread that is already running an
+    event loop. Async callers should await analyze_github_async instead, or
+    run this function on a worker thread.
+    """
+    if not username:
+        return None
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("analyze_github() cannot run inside an event loop; await analyze_github_async()")
+
+    try:
+        return asyncio.run(analyze_github_async(username))
     except Exception as e:
         print(f"GitHub Analysis Error: {e}")
         return None
@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    GITHUB_API_URL,
+    GITHUB_TOKEN,
+    GITHUB_CACHE_PATH,
+    GITHUB_CACHE_TTL,
+    GITHUB_CACHE_STALE_TTL,
+    GITHUB_CACHE_NEGATIVE_TTL,
+    GITHUB_TIMEOUT,
+    GITHUB_POOL_SIZE,
+)
+
+# Headers worth replaying from a cached response
+KEPT_HEADERS = ("ETag", "Last-Modified", "Link")
+
+# Error statuses that are cached too, so a mistyped username is not looked up on every request
+NEGATIVE_STATUSES = (404,)
+
+# Latest X-RateLimit-* values seen from GitHub
+rate_limit = {"limit": None, "remaining": None, "reset": None}
+
+
+class GitHubResponse:
+    """Minimal response object shared by live and cached lookups."""
+
+    def __init__(self, status_code, body, headers, from_cache=False):
+        self.status_code = status_code
+        self.text = body
+        self.headers = headers
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ResponseCache:
+    """SQLite-backed store of GitHub responses (200s and negative answers) with their validators."""
+
+    def __init__(self, path=GITHUB_CACHE_PATH):
+        self._lock = threading.Lock()
+        if path and path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " url TEXT PRIMARY KEY, body TEXT, headers TEXT, fetched_at REAL)"
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+            if "status" not in columns:
+                # Caches written before negative caching only ever held 200s
+                self._conn.execute("ALTER TABLE responses ADD COLUMN status INTEGER NOT NULL DEFAULT 200")
+            self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, fetched_at, status FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"body": row[0], "headers": json.loads(row[1]), "fetched_at": row[2], "status": row[3]}
+
+    def put(self, url, body, headers, status=200):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, headers, fetched_at, status) VALUES (?, ?, ?, ?, ?)",
+                (url, body, json.dumps(headers), time.time(), status),
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+
+class GitHubClient:
+    """
+    Pooled keep-alive GitHub client with a conditional-request cache.
+
+    Fresh entries (younger than ttl) are served without any request. Entries
+    within the stale window are served immediately while a background
+    revalidation runs. Older entries are revalidated with If-None-Match /
+    If-Modified-Since; a 304 reply does not count against the rate limit.
+    A 404 is cached for negative_ttl and then simply fetched again.
+    """
+
+    def __init__(self, base_url=GITHUB_API_URL, token=GITHUB_TOKEN, cache=None,
+                 ttl=GITHUB_CACHE_TTL, stale_ttl=GITHUB_CACHE_STALE_TTL,
+                 negative_ttl=GITHUB_CACHE_NEGATIVE_TTL, timeout=GITHUB_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache()
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "negative_hits": 0, "not_modified": 0, "fetches": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=GITHUB_POOL_SIZE, pool_maxsize=GITHUB_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept"] = "application/vnd.github+json"
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+        self._revalidating = set()
+        self._revalidate_lock = threading.Lock()
+        self._background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="github-revalidate")
+
+    def url_for(self, path, params=None):
+        url = path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url += ("&" if "?" in url else "?") + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        return url
+
+    def get(self, path, params=None):
+        """GET a GitHub API path (or absolute URL) through the cache."""
+        url = self.url_for(path, params)
+        entry = self.cache.get(url)
+        if entry is not None and entry["status"] != 200:
+            if time.time() - entry["fetched_at"] < self.negative_ttl:
+                self.stats["negative_hits"] += 1
+                return GitHubResponse(entry["status"], entry["body"], entry["headers"], from_cache=True)
+        elif entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < self.ttl:
+                self.stats["fresh_hits"] += 1
+                return GitHubResponse(200, entry["body"], entry["headers"], from_cache=True)
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._revalidate_later(url)
+                return GitHubResponse(200, entry["body"], entry["headers"], from_cache=True)
+        return self._fetch(url, entry)
+
+    def _revalidate_later(self, url):
+        with self._revalidate_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def revalidate():
+            try:
+                self._fetch(url, self.cache.get(url))
+            except requests.RequestException as e:
+                print(f"GitHub revalidation failed for {url}: {e}")
+            finally:
+                with self._revalidate_lock:
+                    self._revalidating.discard(url)
+
+        self._background.submit(revalidate)
+
+    def _fetch(self, url, entry):
+        if entry is not None and entry["status"] != 200:
+            # A cached 404 has nothing to revalidate or fall back on
+            entry = None
+        headers = {}
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        try:
+            res = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            if entry is not None:
+                # Serve the last good copy while GitHub is unreachable
+                return GitHubResponse(200, entry["body"], entry["headers"], from_cache=True)
+            raise
+        self._record_rate_limit(res)
+
+        if res.status_code == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            self.cache.touch(url)
+            return GitHubResponse(200, entry["body"], entry["headers"], from_cache=True)
+
+        self.stats["fetches"] += 1
+        kept = {k: res.headers[k] for k in KEPT_HEADERS if k in res.headers}
+        if res.status_code == 200 or res.status_code in NEGATIVE_STATUSES:
+            self.cache.put(url, res.text, kept, res.status_code)
+        elif entry is not None and (res.status_code in (403, 429) or res.status_code >= 500):
+            # Rate limited or GitHub trouble: a stale answer beats none
+            return GitHubResponse(200, entry["body"], entry["headers"], from_cache=True)
+        return GitHubResponse(res.status_code, res.text, kept)
+
+    @staticmethod
+    def _record_rate_limit(res):
+        for key in ("limit", "remaining", "reset"):
+            value = res.headers.get(f"X-RateLimit-{key.capitalize()}")
+            if value is not None and value.isdigit():
+                rate_limit[key] = int(value)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide client so every analysis reuses the same connection pool and cache."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
@@ -0,0 +1,128 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from config import MODEL_NAME, INFERENCE_MAX_BATCH_SIZE, INFERENCE_MAX_WAIT_MS
+from model_registry import get_model
+from metrics import BATCH_SIZE
+
+
+class EmbeddingBatcher:
+    """
+    Dynamic micro-batching in front of an encode function.
+
+    Callers submit small lists of texts; a dedicated worker thread collects
+    everything that arrives within max_wait_ms (up to max_batch_size texts),
+    encodes it as one padded batch and resolves each caller's future with
+    its own slice of the result.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+                 max_wait_ms=INFERENCE_MAX_WAIT_MS, name="embedding"):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self.stats = {"requests": 0, "batches": 0, "texts": 0, "queue_delay_total": 0.0, "queue_delay_max": 0.0}
+        self.recent_batch_sizes = deque(maxlen=1000)
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, texts):
+        """Queues texts for encoding; the returned Future yields their embeddings in order."""
+        future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._ensure_worker()
+        self._queue.put((list(texts), future, time.monotonic()))
+        return future
+
+    def encode(self, texts):
+        return self.submit(texts).result()
+
+    def _ensure_worker(self):
+        # A forked child inherits the batcher but not its thread; start a fresh one there
+        if self._worker_pid != os.getpid():
+            with self._start_lock:
+                if self._worker_pid != os.getpid():
+                    self._queue = queue.Queue()
+                    self._worker = threading.Thread(target=self._run, name=f"{self.name}-batcher", daemon=True)
+                    self._worker.start()
+                    self._worker_pid = os.getpid()
+
+    def _collect(self):
+        """Blocks for the first request, then gathers more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.monotonic()
+
+            # Identical strings from different callers are encoded once
+            unique = list(dict.fromkeys(text for texts, _, _ in batch for text in texts))
+            try:
+                vectors = self.encode_fn(unique)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            position = {text: i for i, text in enumerate(unique)}
+            for texts, future, enqueued in batch:
+                future.set_result([vectors[position[text]] for text in texts])
+                delay = started - enqueued
+                self.stats["queue_delay_total"] += delay
+                self.stats["queue_delay_max"] = max(self.stats["queue_delay_max"], delay)
+
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(unique)
+            self.recent_batch_sizes.append(len(unique))
+            BATCH_SIZE.observe(len(unique), model=self.name)
+
+    def get_metrics(self):
+        """Summary of batching efficiency since start-up."""
+        stats = dict(self.stats)
+        batches = stats["batches"] or 1
+        requests = stats["requests"] or 1
+        stats["mean_batch_size"] = stats["texts"] / batches
+        stats["mean_queue_delay_ms"] = stats["queue_delay_total"] / requests * 1000
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(model_name=MODEL_NAME):
+    """Shared batcher for a model; the model itself is still loaded lazily."""
+    with _batchers_lock:
+        batcher = _batchers.get(model_name)
+        if batcher is None:
+            def encode_fn(texts):
+                return get_model(model_name).encode(texts, batch_size=len(texts), convert_to_numpy=True)
+            batcher = EmbeddingBatcher(encode_fn, name=model_name)
+            _batchers[model_name] = batcher
+        return batcher
@@ -21,8 +21,12 @@ JOB_ROLES = {
     ]
 }
 
+# Built-in roles; role_catalog overlays any role files from GAP_ROLE_CATALOG_PATH
+
 def get_job_roles():
-    return list(JOB_ROLES.keys())
+    from role_catalog import get_catalog
+    return list(get_catalog().roles.keys())
 
 def get_skills_for_role(role):
-    return JOB_ROLES.get(role, [])
+    from role_catalog import get_catalog
+    return get_catalog().roles.get(role, [])
@@ -14,9 +14,43 @@ from resume_parser import extract_text, extract_skills
 from github_analyzer import analyze_github, calculate_github_score
 from analyzer import get_match_results, get_recommendations
 from job_roles_data import get_job_roles, get_skills_for_role
+from pipeline import Pipeline, Stage
+from config import PIPELINE_GITHUB_TIMEOUT
 
 console = Console()
 
+def _resume_skills(resume_path):
+    resume_text = extract_text(resume_path)
+    return extract_skills(resume_text)
+
+def _github_profile(gh_username):
+    if not gh_username:
+        return None, 0
+    gh_data = analyze_github(gh_username)
+    return gh_data, calculate_github_score(gh_data)
+
+def _match(user_skills, job_skills):
+    return get_match_results(user_skills, job_skills)
+
+def _recommendations(match, github):
+    return get_recommendations(match[1], github[1])
+
+# GitHub is evaluated while the resume is parsed and matched
+ANALYSIS = Pipeline([
+    Stage("user_skills", _resume_skills, deps=("resume_path",)),
+    Stage("github", _github_profile, deps=("gh_username",),
+          optional=True, default=(None, 0), timeout=PIPELINE_GITHUB_TIMEOUT),
+    Stage("match", _match, deps=("user_skills", "job_skills")),
+    Stage("recommendations", _recommendations, deps=("match", "github")),
+], inputs=("resume_path", "job_skills", "gh_username"))
+
+STAGE_DESCRIPTIONS = {
+    "user_skills": "Parsing Resume Content...",
+    "github": "Evaluating GitHub Contributions...",
+    "match": "Identifying Knowledge Gaps...",
+    "recommendations": "Generating Recommendations...",
+}
+
 def show_welcome():
     console.clear()
     welcome_text = """
@@ -52,26 +86,21 @@ def run_analysis():
         TextColumn("[progress.description]{task.description}"),
         transient=True,
     ) as progress:
-        # Task 1: Resume Analysis
-        progress.add_task(description="Parsing Resume Content...", total=None)
-        resume_text = extract_text(resume_path)
-        user_skills = extract_skills(resume_text)
-        
-        # Task 2: GitHub Analysis
-        gh_data = None
-        gh_score = 0
-        if gh_username:
-            progress.add_task(description="Evaluating GitHub Contributions...", total=None)
-            gh_data = analyze_github(gh_username)
-            gh_score = calculate_github_score(gh_data)
-            
-        # Task 3: Matching
-        progress.add_task(description="Identifying Knowledge Gaps...", total=None)
-        matched, missing, match_score = get_match_results(user_skills, job_skills)
-        
-        # Task 4: Recommendations
-        progress.add_task(description="Generating Recommendations...", total=None)
-        recommendations = get_recommendations(missing, gh_score)
+        # One spinner per stage, cleared as each one finishes
+        tasks = {}
+        for stage, description in STAGE_DESCRIPTIONS.items():
+            if stage != "github" or gh_username:
+                tasks[stage] = progress.add_task(description=description, total=None)
+
+        def stage_done(stage, value):
+            if stage in tasks:
+                progress.remove_task(tasks.pop(stage))
+
+        result = ANALYSIS.run({"resume_path": resume_path, "job_skills": job_skills, "gh_username": gh_username},
+                              on_stage=stage_done)
+        matched, missing, match_score = result["match"]
+        gh_data, gh_score = result["github"]
+        recommendations = result["recommendations"]
 
     # --- Display Results ---
     console.print("\n" + "="*50)
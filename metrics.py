@@ -0,0 +1,224 @@
+"""
+Prometheus text-format metrics without an extra dependency.
+
+Request handlers wrap each pipeline step in span(stage): the duration goes to
+a process-wide histogram and, while a request is being tracked, into that
+request's list of spans so it can be returned as a Server-Timing header.
+Counters that other modules already keep (cache hits, rate limit, matcher
+tiers, batcher stats) are read at scrape time rather than duplicated.
+"""
+import contextvars
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+_registry = []
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        for key, (counts, total) in sorted(values.items()):
+            for bound, count in zip(self.buckets, counts):
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, [('le', le)])} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {counts[-1]}"
+
+
+HTTP_REQUESTS = Counter("gap_http_requests_total", "HTTP requests by route and status.",
+                        ("method", "route", "status"))
+HTTP_LATENCY = Histogram("gap_http_request_duration_seconds", "End-to-end HTTP request latency.", ("route",))
+STAGE_LATENCY = Histogram("gap_stage_duration_seconds", "Latency of each analysis pipeline stage.", ("stage",))
+BATCH_SIZE = Histogram("gap_inference_batch_size", "Texts encoded per model call by the micro-batcher.",
+                       ("model",), buckets=BATCH_SIZE_BUCKETS)
+
+# Spans of the request currently being handled, when one is being tracked
+_request_spans = contextvars.ContextVar("request_spans", default=None)
+
+
+def start_request():
+    """Starts collecting spans for the current request and returns the list they go into."""
+    spans = []
+    _request_spans.set(spans)
+    return spans
+
+
+@contextmanager
+def span(stage):
+    """Times a block as one pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, stage=stage)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((stage, elapsed))
+
+
+def span_durations(spans, total=None):
+    """Seconds per stage, repeated stages summed, plus "total" when given."""
+    durations = {}
+    for stage, elapsed in spans:
+        durations[stage] = durations.get(stage, 0.0) + elapsed
+    if total is not None:
+        durations["total"] = total
+    return durations
+
+
+def server_timing(spans, total=None):
+    """Server-Timing header value; repeated stages are summed."""
+    return ", ".join(f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in span_durations(spans, total).items())
+
+
+def _runtime_families():
+    """
+    (name, type, help, [(labels, value)]) read from other modules' own stats.
+    Only modules that are already loaded are inspected, so a scrape never
+    creates a client, a store or a model.
+    """
+    families = []
+
+    result_cache = sys.modules.get("result_cache")
+    if result_cache is not None:
+        stats = dict(result_cache.results.stats)
+        families.append(("gap_result_cache_requests_total", "counter", "Analysis result cache lookups.",
+                         [({"result": k}, v) for k, v in sorted(stats.items())]))
+
+    embedding_cache = sys.modules.get("embedding_cache")
+    if embedding_cache is not None:
+        with embedding_cache._stores_lock:
+            stores = dict(embedding_cache._stores)
+        families.append(("gap_embedding_cache_lookups_total", "counter", "Embedding cache lookups by tier.",
+                         [({"model": model, "result": k}, v)
+                          for model, store in sorted(stores.items()) for k, v in sorted(store.stats.items())]))
+
+    skill_matcher = sys.modules.get("skill_matcher")
+    if skill_matcher is not None:
+        families.append(("gap_skill_match_total", "counter", "Job skills resolved by each matcher tier.",
+                         [({"tier": k}, v) for k, v in sorted(skill_matcher.get_match_stats().items())]))
+
+    inference_scheduler = sys.modules.get("inference_scheduler")
+    if inference_scheduler is not None:
+        with inference_scheduler._batchers_lock:
+            batchers = dict(inference_scheduler._batchers)
+        samples = {"requests": [], "batches": [], "texts": [], "queue_depth": []}
+        for model, batcher in sorted(batchers.items()):
+            stats = batcher.get_metrics()
+            for k in samples:
+                samples[k].append(({"model": model}, stats[k]))
+        families += [
+            ("gap_inference_requests_total", "counter", "Encode requests submitted to the batcher.", samples["requests"]),
+            ("gap_inference_batches_total", "counter", "Batched model calls.", samples["batches"]),
+            ("gap_inference_texts_total", "counter", "Unique texts encoded by batched calls.", samples["texts"]),
+            ("gap_inference_queue_depth", "gauge", "Encode requests waiting for a batch.", samples["queue_depth"]),
+        ]
+
+    executors = sys.modules.get("executors")
+    if executors is not None:
+        pools = (executors.PARSE_POOL, executors.INFERENCE_POOL, executors.IO_POOL)
+        families += [
+            ("gap_pool_in_flight", "gauge", "Jobs running or queued per worker pool.",
+             [({"pool": p.name}, p.in_flight) for p in pools]),
+            ("gap_pool_capacity", "gauge", "Admission limit per worker pool.",
+             [({"pool": p.name}, p.capacity) for p in pools]),
+        ]
+
+    github_client = sys.modules.get("github_client")
+    if github_client is not None:
+        for key in ("limit", "remaining", "reset"):
+            value = github_client.rate_limit[key]
+            if value is not None:
+                families.append((f"gap_github_rate_limit_{key}", "gauge",
+                                 f"Latest X-RateLimit-{key.capitalize()} reported by GitHub.", [({}, value)]))
+        if github_client._client is not None:
+            stats = dict(github_client._client.stats)
+            families.append(("gap_github_cache_requests_total", "counter", "GitHub lookups by cache outcome.",
+                             [({"result": k}, v) for k, v in sorted(stats.items())]))
+
+    return families
+
+
+def render():
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for name, kind, help, samples in _runtime_families():
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
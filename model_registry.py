@@ -0,0 +1,59 @@
+import threading
+
+from config import MODEL_NAME, EMBEDDING_BACKEND
+
+# One shared instance per model and backend for the whole process. Nothing heavy
+# (torch, sentence-transformers) is imported until a model is actually needed,
+# so role listing, --help and GitHub-only scoring start instantly.
+_models = {}
+_lock = threading.Lock()
+
+
+def model_id(name=MODEL_NAME, backend=EMBEDDING_BACKEND):
+    """Identity of the vectors a model produces, so quantized embeddings never mix with fp32 ones."""
+    return name if backend == "torch" else f"{name}+{backend}"
+
+
+def get_model(name=MODEL_NAME, backend=EMBEDDING_BACKEND):
+    """Returns the shared embedding model for the configured backend, loading it on first use."""
+    key = (name, backend)
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                print("Loading AI Gap Engine...")
+                from embedding_backends import load_backend
+                model = load_backend(name, backend)
+                _models[key] = model
+    return model
+
+
+def is_loaded(name=MODEL_NAME, backend=EMBEDDING_BACKEND):
+    return (name, backend) in _models
+
+
+def known_skills():
+    """Closed skill vocabulary: the resume taxonomies plus every job role skill."""
+    from resume_parser import SKILL_DATA
+    from job_roles_data import JOB_ROLES
+    from utils import SKILL_DATABASE
+
+    skills = set(SKILL_DATABASE)
+    for group in list(SKILL_DATA.values()) + list(JOB_ROLES.values()):
+        skills.update(group)
+    return sorted(skills)
+
+
+def warmup(name=MODEL_NAME):
+    """
+    Loads the model and embeds the known vocabulary ahead of the first request.
+    Skills already in the persistent embedding cache are not re-encoded, and
+    the skill similarity table is only rebuilt if it is missing or stale.
+    """
+    import embedding_cache
+    from similarity_table import ensure_table
+
+    get_model(name)
+    embedding_cache.encode(known_skills(), model_name=name)
+    ensure_table(name)
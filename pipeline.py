@@ -0,0 +1,138 @@
+"""
+Small dependency-graph executor for the analysis pipeline.
+
+A Pipeline is a list of Stages, each naming the inputs or earlier stages it
+needs. Every stage starts as soon as its dependencies have finished, so
+independent branches overlap: the GitHub fetch runs while the resume is being
+parsed and matched, and a request costs the slowest branch instead of the sum
+of all stages.
+
+Stages marked optional may fail or time out without failing the run; their
+default value is used instead and the error is reported alongside the results.
+A required stage that fails cancels whatever is still running and re-raises.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+# Blocking stages run here unless the caller supplies a runner for their pool.
+# Not the loop's default executor: asyncio.run() would wait for a timed-out
+# stage's thread before returning.
+_executor = ThreadPoolExecutor(thread_name_prefix="pipeline")
+
+
+class Stage:
+    """
+    One step of a pipeline. fn is called with its dependencies as keyword
+    arguments and may be a plain function (run on a worker thread) or a
+    coroutine function (awaited on the event loop).
+    """
+
+    def __init__(self, name, fn, deps=(), optional=False, default=None, timeout=None, pool=None):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.optional = optional
+        self.default = default
+        self.timeout = timeout or None
+        self.pool = pool
+
+
+class PipelineResult:
+    def __init__(self, values, errors):
+        self.values = values
+        self.errors = errors
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+
+async def run_in_thread(fn, *args, **kwargs):
+    """Awaits a blocking call on the pipeline's worker threads."""
+    loop = asyncio.get_running_loop()
+    # Keep contextvars (e.g. the request's metrics spans) visible to the stage
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+class Pipeline:
+    def __init__(self, stages, inputs=()):
+        self.inputs = tuple(inputs)
+        self.stages = list(stages)
+
+        known = set(self.inputs)
+        for stage in self.stages:
+            if stage.name in known:
+                raise ValueError(f"Duplicate pipeline stage '{stage.name}'")
+            # Stages are declared in dependency order, which also rules out cycles
+            unknown = [d for d in stage.deps if d not in known]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(unknown)}")
+            known.add(stage.name)
+
+    async def _call(self, stage, values, runners):
+        kwargs = {d: values[d] for d in stage.deps}
+        if inspect.iscoroutinefunction(stage.fn):
+            call = stage.fn(**kwargs)
+        elif runners and stage.pool in runners:
+            call = runners[stage.pool](functools.partial(stage.fn, **kwargs))
+        else:
+            call = run_in_thread(stage.fn, **kwargs)
+        return await asyncio.wait_for(call, stage.timeout)
+
+    async def stream(self, inputs, runners=None):
+        """
+        Runs the pipeline, yielding (stage, value, error) as each stage
+        finishes. error is None unless an optional stage fell back to its
+        default. runners maps a stage's pool name to an async callable that
+        runs a blocking function, e.g. executors.IO_POOL.run.
+        """
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing pipeline input(s): {', '.join(missing)}")
+
+        values = dict(inputs)
+        waiting = list(self.stages)
+        running = {}
+        try:
+            while waiting or running:
+                for stage in [s for s in waiting if all(d in values for d in s.deps)]:
+                    waiting.remove(stage)
+                    running[asyncio.ensure_future(self._call(stage, values, runners))] = stage
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    error = None
+                    try:
+                        value = task.result()
+                    except Exception as e:
+                        if not stage.optional:
+                            raise
+                        if isinstance(e, asyncio.TimeoutError):
+                            e = asyncio.TimeoutError(f"timed out after {stage.timeout:g}s")
+                        print(f"Stage '{stage.name}' failed, continuing without it: {e}")
+                        value, error = stage.default, e
+                    values[stage.name] = value
+                    yield stage.name, value, error
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def run_async(self, inputs, runners=None, on_stage=None):
+        """Runs every stage and returns a PipelineResult; on_stage(name, value) is called as each finishes."""
+        values = dict(inputs)
+        errors = {}
+        async for name, value, error in self.stream(inputs, runners):
+            values[name] = value
+            if error is not None:
+                errors[name] = error
+            if on_stage is not None:
+                on_stage(name, value)
+        return PipelineResult(values, errors)
+
+    def run(self, inputs, runners=None, on_stage=None):
+        """Blocking run_async for scripts; must not be called from a running event loop."""
+        return asyncio.run(self.run_async(inputs, runners, on_stage))
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_RESUME_TTL,
+    RESULT_CACHE_GITHUB_TTL,
+    SKILL_EXTRACTION_MODE,
+    SEMANTIC_EXTRACTION_THRESHOLD,
+    SEMANTIC_EXTRACTION_MAX_PHRASES,
+    SIMILARITY_TABLE_DIR,
+    SIMILARITY_TABLE_DTYPE,
+)
+from analyzer import MATCH_THRESHOLD
+from model_registry import model_id
+
+# Bump when parsing, extraction or scoring changes in a way that invalidates old results
+RESULT_SCHEMA_VERSION = 1
+
+
+class SQLiteBackend:
+    """Shared on-disk tier so several API workers reuse each other's results."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None, None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            # Opportunistically drop expired rows so the file stays bounded
+            self._conn.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+
+class ResultCache:
+    """Bounded LRU with per-entry TTL, optionally backed by a shared SQLite file."""
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, path=RESULT_CACHE_PATH):
+        self.max_entries = max_entries
+        self.backend = SQLiteBackend(path) if path else None
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            value, expires_at = self.backend.get(key)
+            if value is not None:
+                self._remember(key, value, expires_at)
+                with self._lock:
+                    self.stats["hits"] += 1
+                return value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key, value, ttl):
+        expires_at = time.time() + ttl
+        self._remember(key, value, expires_at)
+        if self.backend is not None:
+            self.backend.set(key, value, expires_at)
+
+    def _remember(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def resume_digest(source):
+    """SHA-256 of an upload given as bytes or a binary file-like object (rewound afterwards)."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+def analysis_version():
+    """Everything besides the inputs that can change a resume-derived result."""
+    # Known-skill pairs are scored from the similarity table at its stored precision
+    similarity = SIMILARITY_TABLE_DTYPE if SIMILARITY_TABLE_DIR else "live"
+    return f"{model_id()}|{MATCH_THRESHOLD}|{similarity}|v{RESULT_SCHEMA_VERSION}"
+
+
+def skills_key(digest):
+    """Keyed on the compiled taxonomy's contents, so editing the taxonomy file invalidates extracted skills."""
+    from resume_parser import get_skill_automaton
+
+    extraction = SKILL_EXTRACTION_MODE
+    if extraction == "semantic":
+        extraction += f"|{model_id()}|{SEMANTIC_EXTRACTION_THRESHOLD}|{SEMANTIC_EXTRACTION_MAX_PHRASES}"
+    taxonomy = get_skill_automaton().digest
+    return f"skills:{digest}:{taxonomy}:{extraction}:v{RESULT_SCHEMA_VERSION}"
+
+
+def match_key(digest, role, job_skills):
+    """Keyed on the role's skills too, so editing a role file invalidates its cached matches."""
+    skills = hashlib.sha1("\0".join(job_skills).encode("utf-8")).hexdigest()[:16]
+    return f"match:{digest}:{role.lower()}:{skills}:{analysis_version()}"
+
+
+def github_key(username):
+    return f"github:{username.lower()}:v{RESULT_SCHEMA_VERSION}"
+
+
+# Resume-derived results are stable for the same bytes, GitHub activity is not
+RESUME_TTL = RESULT_CACHE_RESUME_TTL
+GITHUB_TTL = RESULT_CACHE_GITHUB_TTL
+
+results = ResultCache()
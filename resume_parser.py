@@ -1,7 +1,22 @@
-import PyPDF2
-import docx
+import atexit
+import io
+import multiprocessing
 import os
-import re
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from config import (
+    SKILL_TAXONOMY_PATH,
+    SKILL_EXTRACTION_MODE,
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS,
+    PDF_PAGE_TIMEOUT,
+    PDF_WORKERS,
+    PDF_PARALLEL_MIN_PAGES,
+)
+from skill_extractor import SkillAutomaton, load_taxonomy
 
 # Extensive Skill Database for Multi-domain Support
 SKILL_DATA = {
@@ -15,41 +30,211 @@ SKILL_DATA = {
     "Soft Skills": ["Project Management", "Agile", "Scrum", "Communication", "Leadership", "Critical Thinking"]
 }
 
-def extract_text(file_path):
-    """Extract text from PDF, DOCX, or TXT."""
-    if not os.path.exists(file_path):
-        return ""
+@contextmanager
+def _open_binary(source):
+    """Binary stream over a path, a bytes payload or an open file-like object."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        # Caller owns the stream (e.g. an upload's spooled file); just rewind it
+        source.seek(0)
+        yield source
+
+@contextmanager
+def _page_reader(timeout):
+    """
+    Per-document page extractor returning a page's text, or None if it takes
+    longer than timeout seconds. Each document gets its own thread, so a page
+    stuck in PyPDF2 only ties up that document and never the next one.
+    """
+    if not timeout:
+        yield lambda page: page.extract_text() or ""
+        return
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-page")
+
+    def read(page):
+        try:
+            return executor.submit(page.extract_text).result(timeout=timeout) or ""
+        except TimeoutError:
+            return None
+
+    try:
+        yield read
+    finally:
+        # The stuck thread cannot be interrupted; drop the executor and let it finish on its own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_pdf_pages(source, start=0, stop=None, max_chars=PDF_MAX_CHARS, page_timeout=PDF_PAGE_TIMEOUT):
+    """
+    Lazily yields the text of pages [start, stop).
+    Stops early once max_chars of text have been produced or a page times out.
+    """
+    import PyPDF2
+
+    with _open_binary(source) as f, _page_reader(page_timeout) as read_page:
+        reader = PyPDF2.PdfReader(f)
+        stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+        produced = 0
+        for i in range(start, stop):
+            text = read_page(reader.pages[i])
+            if text is None:
+                print(f"PDF page {i + 1} timed out; truncating.")
+                return
+            if max_chars and produced + len(text) >= max_chars:
+                yield text[:max_chars - produced]
+                return
+            produced += len(text)
+            yield text
+
+def _extract_page_range(source, start, stop, max_chars, page_timeout):
+    # Runs in a worker process; source is a path or the raw PDF bytes
+    return list(iter_pdf_pages(source, start, stop, max_chars, page_timeout))
+
+# Long PDFs share one process pool for the life of the process. Workers are
+# spawned rather than forked, since the API and the UI fork from threaded
+# processes. A pool whose worker got stuck on a page is retired: new documents
+# get a fresh pool and the old one is terminated once its last document is done.
+_range_pool = None
+_range_pool_users = {}  # pool -> [documents using it, processes]
+_range_pool_lock = threading.Lock()
+
+def _acquire_range_pool(workers):
+    global _range_pool
+    with _range_pool_lock:
+        if _range_pool is None:
+            size = max(workers, PDF_WORKERS)
+            _range_pool = multiprocessing.get_context("spawn").Pool(size)
+            _range_pool_users[_range_pool] = [0, size]
+        _range_pool_users[_range_pool][0] += 1
+        return _range_pool, _range_pool_users[_range_pool][1]
+
+def _release_range_pool(pool, stuck):
+    global _range_pool
+    with _range_pool_lock:
+        if stuck and pool is _range_pool:
+            _range_pool = None
+        _range_pool_users[pool][0] -= 1
+        retire = pool is not _range_pool and not _range_pool_users[pool][0]
+        if retire:
+            del _range_pool_users[pool]
+    if retire:
+        pool.terminate()
+
+@atexit.register
+def _shutdown_range_pools():
+    with _range_pool_lock:
+        pools = list(_range_pool_users)
+    for pool in pools:
+        pool.terminate()
+
+def extract_pdf_text(source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS,
+                     page_timeout=PDF_PAGE_TIMEOUT, workers=PDF_WORKERS):
+    """
+    Extracts PDF text up to max_pages pages / max_chars characters.
+    Long documents are split into page ranges extracted in parallel processes;
+    a range that exceeds its time budget is dropped and its process killed.
+    """
+    import PyPDF2
+
+    with _open_binary(source) as f:
+        n_pages = len(PyPDF2.PdfReader(f).pages)
+    if max_pages:
+        n_pages = min(n_pages, max_pages)
+
+    if multiprocessing.current_process().daemon:
+        # Pool workers (e.g. batch_runner's) are daemonic and may not start processes of their own
+        workers = 1
+    if workers <= 1 or n_pages < PDF_PARALLEL_MIN_PAGES:
+        return " ".join(iter_pdf_pages(source, 0, n_pages, max_chars, page_timeout))
+
+    if not isinstance(source, (str, os.PathLike, bytes)):
+        # Open streams can't be shared with worker processes; ship the bytes instead
+        with _open_binary(source) as f:
+            source = f.read()
+
+    pool, size = _acquire_range_pool(workers)
+    step = -(-n_pages // min(workers, size))
+    ranges = [(i, min(i + step, n_pages)) for i in range(0, n_pages, step)]
+    pages = []
+    stuck = False
+    # Ranges run side by side, so the whole document shares one deadline
+    deadline = time.monotonic() + page_timeout * step if page_timeout else None
+    try:
+        jobs = [pool.apply_async(_extract_page_range, (source, a, b, max_chars, page_timeout))
+                for a, b in ranges]
+        for (a, b), job in zip(ranges, jobs):
+            try:
+                pages.extend(job.get(timeout=max(0, deadline - time.monotonic()) if deadline else None))
+            except multiprocessing.TimeoutError:
+                print(f"PDF pages {a + 1}-{b} timed out; skipping.")
+                stuck = True
+    finally:
+        # A timed-out range still occupies a worker; retiring the pool kills it
+        _release_range_pool(pool, stuck)
+
+    text = " ".join(pages)
+    return text[:max_chars] if max_chars else text
+
+def extract_text(source, filename=None, pdf_workers=PDF_WORKERS):
+    """
+    Extract text from PDF, DOCX, or TXT.
+    source is a file path, a bytes payload or a binary file-like object;
+    for the latter two, filename supplies the extension. pdf_workers is
+    passed on to extract_pdf_text (1 keeps long PDFs in this process).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            return ""
+        filename = filename or os.fspath(source)
     
-    ext = os.path.splitext(file_path)[1].lower()
+    ext = os.path.splitext(filename or "")[1].lower()
     text = ""
     
     try:
         if ext == ".pdf":
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() + " "
+            text = extract_pdf_text(source, workers=pdf_workers)
         elif ext == ".docx":
-            doc = docx.Document(file_path)
+            import docx
+            with _open_binary(source) as f:
+                doc = docx.Document(f)
             text = " ".join([p.text for p in doc.paragraphs])
         elif ext == ".txt":
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
+            with _open_binary(source) as f:
+                text = f.read().decode("utf-8")
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
+        print(f"Error reading {filename}: {e}")
         
     return text
 
-def extract_skills(text):
-    """Extract skills from text using pattern matching."""
-    found_skills = set()
-    text_lower = text.lower()
-    
-    for category, skills in SKILL_DATA.items():
-        for skill in skills:
-            # Use regex for better matching (word boundaries)
-            pattern = rf"\b{re.escape(skill.lower())}\b"
-            if re.search(pattern, text_lower):
-                found_skills.add(skill)
-                
-    return list(found_skills)
+_automaton = None
+
+def get_skill_automaton():
+    """Compiles SKILL_DATA (plus the optional external taxonomy) once per process."""
+    global _automaton
+    if _automaton is None:
+        skills = [skill for group in SKILL_DATA.values() for skill in group]
+        if SKILL_TAXONOMY_PATH:
+            skills += load_taxonomy(SKILL_TAXONOMY_PATH)
+        _automaton = SkillAutomaton(skills)
+    return _automaton
+
+def find_skills(text):
+    """Maps each skill found in text to its (start, end) match positions."""
+    return get_skill_automaton().find(text or "")
+
+def extract_skills(text, mode=SKILL_EXTRACTION_MODE):
+    """
+    Extract skills from text in a single pass over the compiled taxonomy.
+    In "semantic" mode, taxonomy skills the resume only paraphrases are added
+    after the literal hits (see semantic_extractor.py).
+    """
+    skills = list(find_skills(text))
+    if mode == "semantic" and text:
+        from semantic_extractor import get_taxonomy_index
+
+        index = get_taxonomy_index(get_skill_automaton().skills)
+        skills += [skill for skill in index.match(text) if skill not in skills]
+    return skills
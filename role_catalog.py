@@ -0,0 +1,486 @@
+"""
+Role catalog and approximate nearest-neighbour role search.
+
+The catalog is job_roles_data.JOB_ROLES overlaid with O*NET-style role files
+from GAP_ROLE_CATALOG_PATH (one .json/.csv file or a directory of them):
+
+    .json   {"Role": ["Skill", ...]} or [{"title": "Role", "skills": [...]}, ...]
+    .csv    a role/title column and a skill column, one row per role-skill pair
+            (a skill cell may hold several skills separated by ';')
+
+For ranking a candidate against thousands of roles, an IVF index is built
+over role vectors (the normalized mean of each role's skill embeddings):
+k-means splits the roles into lists, a query only visits the nprobe lists
+with the closest centroids, and the best shortlist is then re-scored skill
+by skill with rank_roles. The index is persisted under
+GAP_ROLE_INDEX_DIR and rebuilt incrementally when role files change:
+embeddings of unchanged skills and the trained centroids are reused.
+
+    python role_catalog.py --rebuild
+"""
+import argparse
+import contextlib
+import csv
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from config import (
+    ROLE_CATALOG_PATH,
+    ROLE_INDEX_DIR,
+    ROLE_INDEX_NLIST,
+    ROLE_INDEX_NPROBE,
+    ROLE_INDEX_SHORTLIST,
+)
+from analyzer import MATCH_THRESHOLD, _normalize_rows
+from job_roles_data import JOB_ROLES
+from model_registry import model_id
+from skill_matcher import canonical_skill
+
+try:
+    import fcntl  # POSIX only; serialises index publishing across worker processes
+except ImportError:
+    fcntl = None
+
+ROLE_COLUMNS = ("role", "title", "o*net-soc title", "occupation")
+SKILL_COLUMNS = ("skill", "skills", "example", "element name", "commodity title")
+
+INDEX_VERSION = 1
+ENCODE_CHUNK = 1024         # texts per embedding call while building
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 256
+RETRAIN_FACTOR = 2.0        # retrain centroids once the catalog has grown or shrunk this much
+RELOAD_CHECK_INTERVAL = 5   # seconds between checks of the role files for changes
+
+
+def role_files(path=ROLE_CATALOG_PATH):
+    if not path:
+        return []
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith((".json", ".csv")))
+    return [path]
+
+
+def _add_role(roles, role, skills):
+    role = str(role or "").strip()
+    if not role:
+        return
+    bucket = roles.setdefault(role, [])
+    seen = set(bucket)
+    for skill in skills:
+        skill = str(skill).strip()
+        if skill and skill not in seen:
+            bucket.append(skill)
+            seen.add(skill)
+
+
+def load_role_file(path):
+    """{role: [skills]} read from one .json or .csv role file."""
+    roles = {}
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            if isinstance(data, dict):
+                items = data.items()
+            else:
+                items = ((r.get("title") or r.get("role") or r.get("name"), r.get("skills", [])) for r in data)
+            for role, skills in items:
+                _add_role(roles, role, skills)
+            return roles
+
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        role_col = next((columns[c] for c in ROLE_COLUMNS if c in columns), None)
+        skill_col = next((columns[c] for c in SKILL_COLUMNS if c in columns), None)
+        if role_col is None or skill_col is None:
+            raise ValueError(f"{path}: expected a role/title column and a skill column")
+        for row in reader:
+            _add_role(roles, row.get(role_col), (row.get(skill_col) or "").split(";"))
+    return roles
+
+
+def _fingerprint(files):
+    """Changes whenever a role file (or the built-in role table) changes."""
+    digest = hashlib.sha1(json.dumps(JOB_ROLES, sort_keys=True).encode("utf-8"))
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RoleCatalog:
+    """Every known role and its skills; later files override earlier ones and the built-ins."""
+
+    def __init__(self, path=ROLE_CATALOG_PATH):
+        self.path = path
+        self.files = role_files(path)
+        self.fingerprint = _fingerprint(self.files)
+        self.roles = {role: list(skills) for role, skills in JOB_ROLES.items()}
+        for file in self.files:
+            try:
+                self.roles.update(load_role_file(file))
+            except Exception as e:
+                # One bad file must not take the whole catalog (and every ranking) down
+                print(f"Skipping role file {file}: {e}")
+
+    def is_stale(self):
+        try:
+            return _fingerprint(role_files(self.path)) != self.fingerprint
+        except OSError:
+            return True
+
+
+_catalog = None
+_catalog_checked = 0.0
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Process-wide catalog, reloaded when the role files change."""
+    global _catalog, _catalog_checked
+    with _catalog_lock:
+        now = time.monotonic()
+        if _catalog is None or (now - _catalog_checked > RELOAD_CHECK_INTERVAL and _catalog.is_stale()):
+            _catalog = RoleCatalog()
+        if now - _catalog_checked > RELOAD_CHECK_INTERVAL:
+            _catalog_checked = now
+        return _catalog
+
+
+# ---- vector index --------------------------------------------------------
+
+def _encode(texts):
+    import embedding_cache
+
+    if not texts:
+        return None
+    return np.vstack([embedding_cache.encode(texts[i:i + ENCODE_CHUNK]) for i in range(0, len(texts), ENCODE_CHUNK)])
+
+
+def _assign(vectors, centroids, chunk=4096):
+    """Nearest centroid (by cosine) of every row."""
+    return np.concatenate([
+        np.argmax(vectors[i:i + chunk] @ centroids.T, axis=1) for i in range(0, len(vectors), chunk)
+    ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+
+def train_centroids(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=0):
+    """Spherical k-means on (a sample of) the role vectors."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        counts = np.bincount(assignment, minlength=nlist)
+        # Re-seed lists that lost every member
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids.astype(np.float32)
+
+
+class RoleIndex:
+    """IVF index over role vectors plus the skill matrix needed to re-score a shortlist."""
+
+    ARRAYS = ("skill_matrix", "skill_ids", "skill_offsets", "role_vectors", "centroids", "list_roles", "list_offsets")
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.roles = manifest["roles"]
+        self.skills = manifest["skills"]
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    def shortlist(self, query, n, nprobe=ROLE_INDEX_NPROBE):
+        """Ids of the n roles closest to a normalized query vector among the nprobe nearest lists."""
+        if not self.roles:
+            return np.zeros(0, dtype=np.int64)
+        nprobe = max(1, min(nprobe, self.nlist))
+        lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.concatenate([self.list_roles[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists])
+        if len(candidates) > n:
+            scores = self.role_vectors[candidates] @ query
+            candidates = candidates[np.argpartition(-scores, n - 1)[:n]]
+        return candidates
+
+    def role_index(self, role_ids):
+        """rank_roles input (stacked skill rows per role) restricted to some roles."""
+        role_ids = [int(i) for i in role_ids]
+        starts, ends = self.skill_offsets[role_ids], self.skill_offsets[[i + 1 for i in role_ids]]
+        rows = np.concatenate([self.skill_ids[s:e] for s, e in zip(starts, ends)]) if role_ids else np.zeros(0, dtype=np.int64)
+        sizes = ends - starts
+        return {
+            "roles": [self.roles[i] for i in role_ids],
+            "skills": [self.skills[r] for r in rows],
+            "offsets": np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64),
+            "matrix": np.asarray(self.skill_matrix[rows], dtype=np.float32),
+        }
+
+    def save(self, directory=ROLE_INDEX_DIR):
+        """
+        Writes a new build directory, then atomically points current.json at
+        it unless another worker has meanwhile published a newer build.
+        Returns True when this build is the one current.json references.
+        """
+        build = f"{int(time.time() * 1000)}-{os.getpid()}"
+        target = os.path.join(directory, build)
+        try:
+            os.makedirs(target, exist_ok=True)
+            for name in self.ARRAYS:
+                np.save(os.path.join(target, f"{name}.npy"), np.asarray(getattr(self, name)))
+            with open(os.path.join(target, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f)
+        except OSError as e:
+            # A newer build was published while ours was written, and ours was cleaned up
+            print(f"Role index build {build} abandoned: {e}")
+            return False
+
+        pointer = os.path.join(directory, "current.json")
+        with _publish_lock(directory):
+            current = _current_build(directory)
+            if current is None or _build_order(current) < _build_order(build):
+                with open(pointer + f".{build}.tmp", "w", encoding="utf-8") as f:
+                    json.dump({"build": build}, f)
+                os.replace(pointer + f".{build}.tmp", pointer)
+                current = build
+
+            # Only builds older than the published one go: a newer one may still be being
+            # written by another worker. Older builds may still be mapped by other workers;
+            # unlinked files stay readable for them.
+            for entry in os.listdir(directory):
+                path = os.path.join(directory, entry)
+                if os.path.isdir(path) and _build_order(entry) < _build_order(current):
+                    shutil.rmtree(path, ignore_errors=True)
+        return current == build
+
+
+def _build_order(build):
+    """(milliseconds, pid) of a build directory name; names that are not builds sort last."""
+    stamp, _, pid = build.partition("-")
+    try:
+        return int(stamp), int(pid)
+    except ValueError:
+        return float("inf"), 0
+
+
+def _current_build(directory):
+    try:
+        with open(os.path.join(directory, "current.json"), "r", encoding="utf-8") as f:
+            return json.load(f)["build"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+@contextlib.contextmanager
+def _publish_lock(directory):
+    """Serialises publishing and cleanup across worker processes (POSIX only)."""
+    with open(os.path.join(directory, ".lock"), "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load_index(directory=ROLE_INDEX_DIR):
+    """The persisted index (arrays memory-mapped read-only), or None."""
+    try:
+        with open(os.path.join(directory, "current.json"), "r", encoding="utf-8") as f:
+            build = os.path.join(directory, json.load(f)["build"])
+        with open(os.path.join(build, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        arrays = {name: np.load(os.path.join(build, f"{name}.npy"), mmap_mode="r") for name in RoleIndex.ARRAYS}
+    except (OSError, ValueError, KeyError):
+        return None
+    if manifest.get("version") != INDEX_VERSION:
+        return None
+    return RoleIndex(manifest, arrays)
+
+
+def build_index(catalog, previous=None, nlist=ROLE_INDEX_NLIST):
+    """
+    Builds the index for a catalog. With a previous index for the same model,
+    known skill embeddings are copied instead of looked up and the centroids
+    are kept unless the catalog size moved by more than RETRAIN_FACTOR.
+    """
+    model = model_id()
+    if previous is not None and previous.manifest.get("model") != model:
+        previous = None
+
+    names = [role for role, skills in catalog.roles.items() if skills]
+    skills = sorted({s for role in names for s in catalog.roles[role]})
+
+    # Skill embeddings: reuse rows from the previous build, encode only new skills
+    known = {s: i for i, s in enumerate(previous.skills)} if previous is not None else {}
+    new_skills = [s for s in skills if s not in known]
+    new_matrix = _encode(new_skills)
+    dim = new_matrix.shape[1] if new_matrix is not None else (previous.skill_matrix.shape[1] if previous is not None else 0)
+    skill_matrix = np.zeros((len(skills), dim), dtype=np.float32)
+    new_position = {s: i for i, s in enumerate(new_skills)}
+    for i, skill in enumerate(skills):
+        if skill in new_position:
+            skill_matrix[i] = new_matrix[new_position[skill]]
+        else:
+            skill_matrix[i] = previous.skill_matrix[known[skill]]
+    skill_matrix = _normalize_rows(skill_matrix).astype(np.float32)
+
+    position = {s: i for i, s in enumerate(skills)}
+    skill_ids = np.array([position[s] for role in names for s in catalog.roles[role]], dtype=np.int64)
+    sizes = np.array([len(catalog.roles[role]) for role in names], dtype=np.int64)
+    skill_offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    if names:
+        role_vectors = _normalize_rows(np.add.reduceat(skill_matrix[skill_ids], skill_offsets[:-1])).astype(np.float32)
+    else:
+        role_vectors = np.zeros((0, dim), dtype=np.float32)
+
+    n_lists = max(1, min(nlist or int(np.sqrt(len(names))), len(names))) if names else 1
+    trained_roles = previous.manifest["trained_roles"] if previous is not None else 0
+    reuse = (
+        previous is not None and not nlist and previous.centroids.shape[1] == dim and len(previous.centroids) <= len(names)
+        and trained_roles / RETRAIN_FACTOR <= len(names) <= trained_roles * RETRAIN_FACTOR
+    )
+    if reuse:
+        centroids = np.asarray(previous.centroids, dtype=np.float32)
+    elif names:
+        centroids = train_centroids(role_vectors, n_lists)
+        trained_roles = len(names)
+    else:
+        centroids = np.zeros((1, dim), dtype=np.float32)
+
+    assignment = _assign(role_vectors, centroids)
+    list_roles = np.argsort(assignment, kind="stable").astype(np.int64)
+    list_offsets = np.searchsorted(assignment[list_roles], np.arange(len(centroids) + 1)).astype(np.int64)
+
+    manifest = {
+        "version": INDEX_VERSION,
+        "model": model,
+        "fingerprint": catalog.fingerprint,
+        "roles": names,
+        "skills": skills,
+        "trained_roles": trained_roles,
+        "reused_centroids": bool(reuse),
+        "encoded_skills": len(new_skills),
+    }
+    return RoleIndex(manifest, {
+        "skill_matrix": skill_matrix,
+        "skill_ids": skill_ids,
+        "skill_offsets": skill_offsets,
+        "role_vectors": role_vectors,
+        "centroids": centroids,
+        "list_roles": list_roles,
+        "list_offsets": list_offsets,
+    })
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(rebuild=False):
+    """Process-wide role index; loaded from disk, or (incrementally) rebuilt when the catalog changed."""
+    global _index
+    catalog = get_catalog()
+    with _index_lock:
+        current = _index if _index is not None else load_index()
+        if (rebuild or current is None or current.manifest["fingerprint"] != catalog.fingerprint
+                or current.manifest["model"] != model_id()):
+            current = build_index(catalog, current)
+            if ROLE_INDEX_DIR:
+                os.makedirs(ROLE_INDEX_DIR, exist_ok=True)
+                current.save(ROLE_INDEX_DIR)
+        _index = current
+        return _index
+
+
+def rank_roles(user_skills, role_index):
+    """
+    Scores the candidate against every role of a role_index() with one
+    matrix multiply. Returns one result per role, best match first.
+    """
+    index = role_index
+    if not index["roles"]:
+        return []
+
+    n_skills = len(index["skills"])
+    if user_skills:
+        user_matrix = _normalize_rows(_encode(list(user_skills)))
+        # Best similarity of each role skill against any user skill
+        best = (index["matrix"] @ user_matrix.T).max(axis=1)
+        # Exact/alias hits count even when the embeddings disagree, as in get_match_results
+        user_keys = {canonical_skill(s) for s in user_skills}
+        known = np.array([canonical_skill(s) in user_keys for s in index["skills"]])
+        hits = (best > MATCH_THRESHOLD) | known
+    else:
+        hits = np.zeros(n_skills, dtype=bool)
+
+    # Segmented reduction: matched count and size per role
+    offsets = index["offsets"]
+    matched_counts = np.add.reduceat(hits.astype(np.int64), offsets)
+    sizes = np.diff(np.append(offsets, n_skills))
+    scores = matched_counts / sizes * 100
+
+    results = []
+    for i, role in enumerate(index["roles"]):
+        start, end = offsets[i], offsets[i] + sizes[i]
+        role_skills = index["skills"][start:end]
+        role_hits = hits[start:end]
+        results.append({
+            "role": role,
+            "match_score": float(scores[i]),
+            "matched_skills": [s for s, hit in zip(role_skills, role_hits) if hit],
+            "missing_skills": [s for s, hit in zip(role_skills, role_hits) if not hit],
+        })
+
+    results.sort(key=lambda r: r["match_score"], reverse=True)
+    return results
+
+
+def search_roles(user_skills, k=10, nprobe=ROLE_INDEX_NPROBE, shortlist=ROLE_INDEX_SHORTLIST):
+    """
+    Top-k roles for a candidate in the rank_roles result format. The IVF
+    shortlist is chosen by profile similarity; only it is scored skill by skill.
+    """
+    index = get_search_index()
+    if not index.roles:
+        return []
+    if user_skills:
+        query = _normalize_rows(_normalize_rows(_encode(list(user_skills))).mean(axis=0, keepdims=True))[0]
+        ids = index.shortlist(query.astype(np.float32), max(shortlist, k), nprobe)
+    else:
+        ids = np.arange(min(len(index.roles), max(shortlist, k)))
+    return rank_roles(user_skills, index.role_index(ids))[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Role catalog index maintenance")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if the catalog is unchanged")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = get_search_index(rebuild=args.rebuild)
+    m = index.manifest
+    print(f"Roles:            {len(index.roles)}")
+    print(f"Skills:           {len(index.skills)} ({m['encoded_skills']} newly encoded)")
+    print(f"IVF lists:        {index.nlist} ({'reused' if m['reused_centroids'] else 'trained on'} {m['trained_roles']} roles)")
+    print(f"Time:             {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Semantic skill extraction for GAP_SKILL_EXTRACTION_MODE=semantic.
+
+The exact extractor only sees literal taxonomy names, so "built neural nets
+in Keras" never becomes "Deep Learning". Here the resume is cut into short
+candidate phrases (word n-grams that do not cross punctuation), de-duplicated
+and filtered, capped per document, and encoded in large batches. Each phrase
+is compared against the taxonomy's embedding matrix, and a skill is kept
+when some phrase is close enough to it.
+
+Taxonomy embeddings go through the persistent embedding cache. Phrases are
+fragments of resume text, so they are never written to disk: they are kept
+in a bounded in-memory LRU (phrases that recur across resumes, such as "data
+pipelines" or "rest apis", are still encoded once per process) and misses go
+through the inference micro-batcher shared with every other request. A
+phrase has to be closer to a skill than MATCH_THRESHOLD, as for job skills.
+"""
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from config import (
+    MODEL_NAME,
+    SEMANTIC_EXTRACTION_THRESHOLD,
+    SEMANTIC_EXTRACTION_MAX_PHRASES,
+    SEMANTIC_EXTRACTION_MAX_NGRAM,
+    SEMANTIC_EXTRACTION_BATCH_SIZE,
+    SEMANTIC_EXTRACTION_PHRASE_CACHE,
+)
+
+# Phrases never span these: line breaks, bullets, brackets and sentence punctuation
+# (a "." or "," only when followed by whitespace, so "Node.js" and "1,000" stay whole)
+CLAUSE_BREAK = re.compile(r"[\r\n\t•·▪●|;:!?()\[\]{}\"<>]|[.,](?=\s|$)|\s[-–—]\s")
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./&-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a an and are as at be been by for from has have i in into is it its of on or our over that the their
+this to was were will with within we my me us using used use via per etc also across more than
+""".split())
+
+
+def candidate_phrases(text, max_n=SEMANTIC_EXTRACTION_MAX_NGRAM, max_phrases=SEMANTIC_EXTRACTION_MAX_PHRASES,
+                      exclude=()):
+    """
+    Distinct lowercased word n-grams (1..max_n words) worth embedding.
+    Phrases that start or end with a stopword, are only digits or appear
+    in exclude are dropped. Above max_phrases, the most frequent phrases are
+    kept, with ties going to the earliest.
+    """
+    counts = Counter()
+    for clause in CLAUSE_BREAK.split((text or "").lower()):
+        tokens = TOKEN.findall(clause)
+        for i in range(len(tokens)):
+            for n in range(1, max_n + 1):
+                words = tokens[i:i + n]
+                if len(words) < n:
+                    break
+                if words[0] in STOPWORDS or words[-1] in STOPWORDS:
+                    continue
+                if n == 1 and (len(words[0]) < 2 or words[0].isdigit()):
+                    continue
+                counts[" ".join(words)] += 1
+
+    phrases = [p for p in counts if p not in exclude]
+    if max_phrases and len(phrases) > max_phrases:
+        # Counter keeps insertion order, so a stable sort breaks ties by first appearance
+        phrases = sorted(phrases, key=lambda p: -counts[p])[:max_phrases]
+    return phrases
+
+
+class TaxonomyIndex:
+    """Normalized embedding matrix of a skill taxonomy, one row per skill."""
+
+    def __init__(self, skills, model_name=MODEL_NAME, phrase_cache_size=SEMANTIC_EXTRACTION_PHRASE_CACHE):
+        import embedding_cache
+        from analyzer import _normalize_rows
+
+        self.skills = list(skills)
+        self.model_name = model_name
+        self.matrix = _normalize_rows(embedding_cache.encode(self.skills, model_name=model_name))
+        self._lowered = {s.lower() for s in self.skills}
+        self._phrase_cache = OrderedDict()  # phrase -> normalized vector, memory only
+        self._phrase_cache_size = phrase_cache_size
+        self._phrase_lock = threading.Lock()
+
+    def _encode_phrases(self, phrases):
+        import embedding_cache
+        from analyzer import _normalize_rows
+
+        with self._phrase_lock:
+            found = {p: self._phrase_cache[p] for p in phrases if p in self._phrase_cache}
+            for p in found:
+                self._phrase_cache.move_to_end(p)
+        missing = [p for p in phrases if p not in found]
+
+        step = SEMANTIC_EXTRACTION_BATCH_SIZE
+        for i in range(0, len(missing), step):
+            batch = missing[i:i + step]
+            vectors = _normalize_rows(embedding_cache.encode_uncached(batch, model_name=self.model_name))
+            found.update(zip(batch, vectors))
+            with self._phrase_lock:
+                self._phrase_cache.update(zip(batch, vectors))
+                while len(self._phrase_cache) > self._phrase_cache_size:
+                    self._phrase_cache.popitem(last=False)
+        return np.vstack([found[p] for p in phrases])
+
+    def match(self, text, threshold=SEMANTIC_EXTRACTION_THRESHOLD, max_phrases=SEMANTIC_EXTRACTION_MAX_PHRASES):
+        """Maps each taxonomy skill some phrase of text is close to, to (best phrase, similarity)."""
+        # Literal skill names are the exact extractor's job
+        phrases = candidate_phrases(text, max_phrases=max_phrases, exclude=self._lowered)
+        if not phrases or not self.skills:
+            return {}
+
+        similarity = self._encode_phrases(phrases) @ self.matrix.T
+        best_phrase = similarity.argmax(axis=0)
+        best_score = similarity[best_phrase, np.arange(len(self.skills))]
+
+        hits = {}
+        for j in np.flatnonzero(best_score > threshold):
+            hits[self.skills[j]] = (phrases[best_phrase[j]], float(best_score[j]))
+        return dict(sorted(hits.items(), key=lambda item: -item[1][1]))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_taxonomy_index(skills, model_name=MODEL_NAME):
+    """Shared index per model, rebuilt only when the taxonomy itself changes."""
+    with _indexes_lock:
+        index = _indexes.get(model_name)
+        if index is None or index.skills != list(skills):
+            index = TaxonomyIndex(skills, model_name)
+            _indexes[model_name] = index
+        return index
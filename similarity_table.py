@@ -0,0 +1,200 @@
+"""
+Precomputed cosine similarities between every pair of known skills.
+
+The resume taxonomies and the built-in role skills form a small closed
+vocabulary (model_registry.known_skills), so instead of running the model for
+every request, the full similarity matrix is computed once and stored as a
+versioned artifact:
+
+    <dir>/<model>.<build>.<dtype>   n x n matrix, opened with np.memmap
+    <dir>/<model>.json              version, model id, dtype, data file and the vocabulary order
+
+skill_matcher resolves known-vs-known pairs from the table and only runs
+live inference for pairs involving an out-of-vocabulary skill. A table built
+for another model or format version is ignored until it is rebuilt:
+
+    python similarity_table.py --build
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from config import MODEL_NAME, SIMILARITY_TABLE_DIR, SIMILARITY_TABLE_DTYPE, SIMILARITY_TABLE_RECHECK_SECONDS
+from embedding_cache import normalize_text
+from model_registry import model_id
+
+TABLE_VERSION = 1
+
+
+def _paths(directory, model_name):
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id(model_name))
+    base = os.path.join(directory, slug)
+    return base + ".json", base
+
+
+class SimilarityTable:
+    """Read-only view of a built table; rows and columns follow the vocabulary order."""
+
+    def __init__(self, manifest, matrix):
+        self.manifest = manifest
+        self.skills = manifest["skills"]
+        self.matrix = matrix
+        self._index = {normalize_text(s): i for i, s in enumerate(self.skills)}
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return normalize_text(skill) in self._index
+
+    def index(self, skill):
+        """Row of a skill, or None when it is out of vocabulary."""
+        return self._index.get(normalize_text(skill))
+
+    def block(self, rows, cols):
+        """float32 similarities of skills rows x skills cols; every skill must be in the table."""
+        r = [self._index[normalize_text(s)] for s in rows]
+        c = [self._index[normalize_text(s)] for s in cols]
+        return np.asarray(self.matrix[np.ix_(r, c)], dtype=np.float32)
+
+
+def build_table(skills=None, directory=SIMILARITY_TABLE_DIR, model_name=MODEL_NAME, dtype=SIMILARITY_TABLE_DTYPE):
+    """Encodes the vocabulary, writes the n x n matrix and then its manifest. Returns the loaded table."""
+    import embedding_cache
+    from analyzer import _normalize_rows
+    from model_registry import known_skills
+
+    skills = list(dict.fromkeys(normalize_text(s) for s in (skills if skills is not None else known_skills())))
+    vectors = _normalize_rows(embedding_cache.encode(skills, model_name=model_name))
+    matrix = (vectors @ vectors.T).astype(dtype)
+
+    os.makedirs(directory, exist_ok=True)
+    manifest_path, base = _paths(directory, model_name)
+    # Every build writes its own data file, so the manifest a reader loads
+    # always names the matrix that was built with it
+    data_path = f"{base}.{time.time_ns():x}{os.getpid():x}.{np.dtype(dtype).name}"
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = os.path.join(directory, json.load(f)["data"])
+    except (OSError, ValueError, KeyError):
+        previous = None
+
+    # Data first, manifest last, each replaced atomically: readers never see a half-written table
+    tmp = f"{data_path}.tmp"
+    matrix.tofile(tmp)
+    os.replace(tmp, data_path)
+    manifest = {
+        "version": TABLE_VERSION,
+        "model": model_id(model_name),
+        "dtype": np.dtype(dtype).name,
+        "size": len(skills),
+        "data": os.path.basename(data_path),
+        "built_at": time.time(),
+        "skills": skills,
+    }
+    tmp = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, manifest_path)
+    if previous and previous != data_path:
+        # Processes that still map the old matrix keep it until they reload
+        try:
+            os.remove(previous)
+        except OSError:
+            pass
+    return load_table(directory, model_name)
+
+
+def load_table(directory=SIMILARITY_TABLE_DIR, model_name=MODEL_NAME):
+    """The table for the current model, memory-mapped, or None if missing or built for something else."""
+    if not directory:
+        return None
+    manifest_path, _ = _paths(directory, model_name)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != TABLE_VERSION or manifest.get("model") != model_id(model_name):
+            return None
+        n = manifest["size"]
+        matrix = np.memmap(os.path.join(directory, manifest["data"]), dtype=manifest["dtype"], mode="r", shape=(n, n))
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Ignoring similarity table in {directory}: {e}")
+        return None
+    return SimilarityTable(manifest, matrix)
+
+
+_tables = {}  # model name -> (table or None, manifest stat it was loaded at, when that stat was taken)
+_tables_lock = threading.Lock()
+
+
+def _manifest_stat(model_name):
+    try:
+        stat = os.stat(_paths(SIMILARITY_TABLE_DIR, model_name)[0])
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def get_similarity_table(model_name=MODEL_NAME):
+    """
+    Process-wide table for a model; None means every pair goes to the model.
+    The manifest is re-checked at most every SIMILARITY_TABLE_RECHECK_SECONDS,
+    so a table built or rebuilt later, by this process or
+    `python similarity_table.py --build`, is picked up instead of a missing
+    one being remembered forever.
+    """
+    if not SIMILARITY_TABLE_DIR:
+        return None
+    now = time.monotonic()
+    cached = _tables.get(model_name)
+    if cached is not None and now - cached[2] < SIMILARITY_TABLE_RECHECK_SECONDS:
+        return cached[0]
+    stat = _manifest_stat(model_name)
+    with _tables_lock:
+        cached = _tables.get(model_name)
+        if cached is None or cached[1] != stat:
+            table = load_table(SIMILARITY_TABLE_DIR, model_name) if stat is not None else None
+        else:
+            table = cached[0]
+        _tables[model_name] = (table, stat, now)
+        return table
+
+
+def ensure_table(model_name=MODEL_NAME):
+    """Builds the table if it is missing, stale or lacks part of the current vocabulary."""
+    from model_registry import known_skills
+
+    if not SIMILARITY_TABLE_DIR:
+        return None
+    table = get_similarity_table(model_name)
+    if table is None or any(s not in table for s in known_skills()):
+        table = build_table(directory=SIMILARITY_TABLE_DIR, model_name=model_name)
+        with _tables_lock:
+            _tables[model_name] = (table, _manifest_stat(model_name), time.monotonic())
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill similarity table maintenance")
+    parser.add_argument("--build", action="store_true", help="Rebuild the table even if it is up to date")
+    args = parser.parse_args()
+
+    if not SIMILARITY_TABLE_DIR:
+        print("Similarity table disabled (GAP_SIMILARITY_TABLE_DIR is empty)")
+        return
+    started = time.perf_counter()
+    table = build_table() if args.build else ensure_table()
+    print(f"Skills:           {len(table)}")
+    print(f"Model:            {table.manifest['model']}")
+    print(f"Size:             {table.matrix.nbytes / 1024:.0f} KiB ({table.manifest['dtype']})")
+    print(f"Time:             {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Packed skill sets for exact-match scoring of many candidates against many roles.
+
+Skill names are interned once into a global vocabulary (canonical name ->
+integer ID, so aliases such as "k8s" and "Kubernetes" share an ID). A set of
+skills is then a row of bits in a uint64 matrix, and the exact-tier overlap
+of every candidate with every role is an AND followed by a popcount over
+whole matrices instead of per-pair list scans.
+
+Only the exact and alias tiers are covered; semantic matching still goes
+through skill_matcher / analyzer. Scores follow analyze_skill_gap: the share
+of the role's skill list the candidate has, so a role listing "Kubernetes"
+and "k8s" counts both entries. to_result converts a (candidate, role) pair
+back into the list-based dicts rank_roles returns.
+"""
+import threading
+from collections import Counter
+
+import numpy as np
+
+from skill_matcher import canonical_skill
+
+WORD_BITS = 64
+
+if hasattr(np, "bitwise_count"):
+    def popcount(words):
+        return np.bitwise_count(words)
+else:
+    # NumPy < 2.0: count per byte through a lookup table
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        words = np.ascontiguousarray(words)
+        per_byte = _BYTE_COUNTS[words.view(np.uint8)]
+        return per_byte.reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+class SkillVocabulary:
+    """Interns canonical skill names to dense integer IDs."""
+
+    def __init__(self, skills=()):
+        self._ids = {}
+        self.names = []
+        self._lock = threading.Lock()
+        self.intern_many(skills)
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, skill):
+        key = canonical_skill(skill)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    skill_id = len(self.names)
+                    self.names.append(skill)
+                    self._ids[key] = skill_id
+        return skill_id
+
+    def intern_many(self, skills):
+        return [self.intern(s) for s in skills]
+
+    def lookup(self, skill):
+        """ID of a skill, or None when it was never interned."""
+        return self._ids.get(canonical_skill(skill))
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary():
+    """Process-wide vocabulary, seeded with the resume taxonomy and every job role skill."""
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            from model_registry import known_skills
+            _vocabulary = SkillVocabulary(known_skills())
+        return _vocabulary
+
+
+class SkillSets:
+    """
+    One packed bitset per row (a candidate or a role). skills keeps each
+    row's original list, so results can be reported in the input's order.
+    Rows are packed against the vocabulary size at build time; skills
+    interned later by another matrix simply widen the word count.
+
+    A bit only records that an ID is present, so sizes holds each list's
+    full length and duplicates lists the (row, ID, extra occurrences) of IDs
+    a row names more than once, which overlap_counts adds back.
+    """
+
+    def __init__(self, labels, skill_lists, vocabulary=None):
+        self.vocabulary = vocabulary or get_vocabulary()
+        self.labels = list(labels)
+        self.skills = [list(s) for s in skill_lists]
+
+        ids = [self.vocabulary.intern_many(s) for s in self.skills]
+        self.words = pack(ids, len(self.vocabulary))
+        self.sizes = np.array([len(s) for s in self.skills], dtype=np.int64)
+
+        repeated = [(row, skill_id, n - 1) for row, row_ids in enumerate(ids)
+                    for skill_id, n in Counter(row_ids).items() if n > 1]
+        self.duplicates = tuple(np.array(column, dtype=np.int64) for column in zip(*repeated)) or (
+            np.zeros(0, dtype=np.int64),) * 3
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def pack(id_lists, n_bits):
+    """uint64 matrix with bit i of row r set for every ID i in id_lists[r]."""
+    n_words = max(1, -(-n_bits // WORD_BITS))
+    words = np.zeros((len(id_lists), n_words), dtype=np.uint64)
+    rows = np.repeat(np.arange(len(id_lists)), [len(ids) for ids in id_lists])
+    ids = np.fromiter((i for row in id_lists for i in row), dtype=np.int64, count=len(rows))
+    if len(ids):
+        bits = np.left_shift(np.uint64(1), (ids % WORD_BITS).astype(np.uint64))
+        np.bitwise_or.at(words, (rows, ids // WORD_BITS), bits)
+    return words
+
+
+def _aligned(a, b):
+    """Both word matrices padded to the same width."""
+    width = max(a.shape[1], b.shape[1])
+    if a.shape[1] < width:
+        a = np.pad(a, ((0, 0), (0, width - a.shape[1])))
+    if b.shape[1] < width:
+        b = np.pad(b, ((0, 0), (0, width - b.shape[1])))
+    return a, b
+
+
+# Words in one broadcast AND block (8 bytes each, plus popcount temporaries)
+CHUNK_ELEMENTS = 1 << 22
+
+
+def overlap_counts(candidates, roles, chunk_rows=1024, chunk_elements=CHUNK_ELEMENTS):
+    """
+    (len(candidates), len(roles)) matrix: how many entries of each role's
+    skill list the candidate has. Both axes are chunked so each broadcast
+    AND holds at most chunk_elements words (and at most chunk_rows
+    candidates), whatever the size of the catalog.
+    """
+    cand, role = _aligned(candidates.words, roles.words)
+    dup_rows, dup_ids, dup_extra = roles.duplicates
+    counts = np.zeros((len(cand), len(role)), dtype=np.int32)
+    n_words = max(cand.shape[1], 1)
+    role_step = max(1, min(len(role), chunk_elements // n_words))
+    cand_step = max(1, min(chunk_rows, chunk_elements // (n_words * role_step)))
+    for start in range(0, len(cand), cand_step):
+        chunk = cand[start:start + cand_step]
+        for role_start in range(0, len(role), role_step):
+            roles_block = slice(role_start, role_start + role_step)
+            block = chunk[:, None, :] & role[None, roles_block, :]
+            counts[start:start + cand_step, roles_block] = popcount(block).sum(axis=2, dtype=np.int32)
+        if len(dup_rows):
+            # Repeated entries of a role count again whenever the candidate has that ID
+            has = (chunk[:, dup_ids // WORD_BITS] >> (dup_ids % WORD_BITS).astype(np.uint64)) & np.uint64(1)
+            np.add.at(counts[start:start + cand_step].T, dup_rows, (has.astype(np.int32) * dup_extra).T)
+    return counts
+
+
+def score_matrix(candidates, roles, chunk_rows=1024, chunk_elements=CHUNK_ELEMENTS):
+    """Exact-match percentage of every role's skill list each candidate has, as in analyze_skill_gap."""
+    counts = overlap_counts(candidates, roles, chunk_rows, chunk_elements)
+    return counts / np.maximum(roles.sizes, 1) * 100
+
+
+def top_roles(candidates, roles, k=5, chunk_rows=1024, chunk_elements=CHUNK_ELEMENTS):
+    """
+    (indices, scores): for each candidate the indices of its k best roles,
+    best first, and the full score_matrix they were picked from.
+    """
+    scores = score_matrix(candidates, roles, chunk_rows, chunk_elements)
+    k = min(k, len(roles))
+    if k == 0:
+        return np.zeros((len(candidates), 0), dtype=np.int64), scores
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(-scores, best, axis=1).argsort(axis=1, kind="stable")
+    return np.take_along_axis(best, order, axis=1), scores
+
+
+def role_sets(roles=None, vocabulary=None):
+    """SkillSets for a {role: skills} mapping, by default the full role catalog."""
+    if roles is None:
+        from role_catalog import get_catalog
+        roles = get_catalog().roles
+    return SkillSets(roles.keys(), roles.values(), vocabulary)
+
+
+def to_result(candidates, c, roles, r):
+    """The rank_roles-style dict for candidate row c against role row r."""
+    vocabulary = roles.vocabulary
+    have = {vocabulary.lookup(s) for s in candidates.skills[c]}
+    role_skills = roles.skills[r]
+    hits = [vocabulary.lookup(s) in have for s in role_skills]
+    score = sum(hits) / len(role_skills) * 100 if role_skills else 0
+    return {
+        "role": roles.labels[r],
+        "match_score": float(score),
+        "matched_skills": [s for s, hit in zip(role_skills, hits) if hit],
+        "missing_skills": [s for s, hit in zip(role_skills, hits) if not hit],
+    }
@@ -0,0 +1,135 @@
+import csv
+import hashlib
+import json
+import os
+from collections import deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _lower_with_offsets(text):
+    """
+    Lowercased text, plus the original index of each of its characters when
+    lowercasing changed the length ("İ" lowers to two code points), else None.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered, None
+    origin = []
+    for i, ch in enumerate(text):
+        origin.extend([i] * len(ch.lower()))
+    return lowered, origin
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over a skill taxonomy.
+
+    The whole taxonomy is compiled once; scanning a resume is then a single
+    linear pass over its lowercased text regardless of taxonomy size.
+    A hit only counts when it is not glued to surrounding letters/digits,
+    which keeps "Go" out of "Google" while still matching punctuation-heavy
+    names such as "C++", "Node.js" and "CI/CD".
+    """
+
+    def __init__(self, skills):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self.skills = []
+
+        seen = set()
+        for skill in skills:
+            key = skill.lower().strip()
+            if key and key not in seen:
+                seen.add(key)
+                self._add(key, len(self.skills))
+                self.skills.append(skill)
+        self._build()
+        # Identifies the compiled taxonomy, e.g. in cache keys for extracted skills
+        self.digest = hashlib.sha1("\0".join(self.skills).encode("utf-8")).hexdigest()[:16]
+
+    def _add(self, key, skill_id):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((skill_id, len(key)))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                # Children of the root always fall back to the root
+                self._fail[nxt] = self._goto[fail].get(ch, 0) if state else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text):
+        """Yields (skill, start, end) for every boundary-respecting occurrence, as offsets into text."""
+        folded, origin = _lower_with_offsets(text)
+        text = folded
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for skill_id, length in out[state]:
+                start = i - length + 1
+                end = i + 1
+                skill = self.skills[skill_id]
+                # Only enforce a boundary where the skill itself has a word character
+                if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(text[i]) and end < len(text) and _is_word_char(text[end]):
+                    continue
+                if origin is not None:
+                    start, end = origin[start], origin[end - 1] + 1
+                yield skill, start, end
+
+    def find(self, text):
+        """Maps each found skill to its list of (start, end) positions."""
+        positions = {}
+        for skill, start, end in self.scan(text):
+            positions.setdefault(skill, []).append((start, end))
+        return positions
+
+    def count(self, text):
+        return {skill: len(spans) for skill, spans in self.find(text).items()}
+
+
+def load_taxonomy(path):
+    """
+    Reads a skill taxonomy file: .txt (one skill per line), .json (a list or a
+    {category: [skills]} mapping) or .csv (first column, or a 'skill' column).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8") as f:
+        if ext == ".json":
+            data = json.load(f)
+            if isinstance(data, dict):
+                return [skill for skills in data.values() for skill in skills]
+            return list(data)
+        if ext == ".csv":
+            rows = list(csv.reader(f))
+            if not rows:
+                return []
+            header = [h.strip().lower() for h in rows[0]]
+            if "skill" in header:
+                col = header.index("skill")
+                return [r[col].strip() for r in rows[1:] if len(r) > col and r[col].strip()]
+            return [r[0].strip() for r in rows if r and r[0].strip()]
+        return [line.strip() for line in f if line.strip()]
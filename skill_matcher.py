@@ -0,0 +1,199 @@
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+import embedding_cache
+from similarity_table import get_similarity_table
+
+# Alias/synonym table: normalized alias -> canonical skill name
+SKILL_ALIASES = {
+    "postgres": "PostgreSQL",
+    "psql": "PostgreSQL",
+    "k8s": "Kubernetes",
+    "js": "JavaScript",
+    "ecmascript": "JavaScript",
+    "ts": "TypeScript",
+    "golang": "Go",
+    "sklearn": "Scikit-Learn",
+    "scikit": "Scikit-Learn",
+    "tf": "TensorFlow",
+    "torch": "PyTorch",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "reactjs": "React",
+    "react.js": "React",
+    "vuejs": "Vue",
+    "vue.js": "Vue",
+    "angularjs": "Angular",
+    "expressjs": "Express",
+    "express.js": "Express",
+    "mongo": "MongoDB",
+    "amazon web services": "AWS",
+    "google cloud": "GCP",
+    "google cloud platform": "GCP",
+    "microsoft azure": "Azure",
+    "ml": "Machine Learning",
+    "dl": "Deep Learning",
+    "natural language processing": "NLP",
+    "llm": "LLMs",
+    "large language models": "LLMs",
+    "rest": "REST API",
+    "restful api": "REST API",
+    "rest apis": "REST API",
+    "tailwind": "Tailwind CSS",
+    "tailwindcss": "Tailwind CSS",
+    "power bi": "PowerBI",
+    "ci cd": "CI/CD",
+    "cicd": "CI/CD",
+    "ux/ui": "UI/UX",
+    "data viz": "Data Visualization",
+    "dataviz": "Data Visualization",
+    "aws iam": "IAM",
+    "aws lambda": "Serverless",
+    "cloudformation templates": "CloudFormation",
+}
+
+# Job skills resolved per tier, plus how many reached no tier at all
+MATCH_STATS = Counter()
+_stats_lock = threading.Lock()
+
+
+def normalize_skill(skill):
+    """Case-insensitive key that ignores spacing, hyphens and underscores."""
+    return " ".join(re.sub(r"[-_]+", " ", str(skill).lower()).split())
+
+
+def canonical_skill(skill):
+    """Normalized canonical name after resolving aliases."""
+    key = normalize_skill(skill)
+    return normalize_skill(SKILL_ALIASES.get(key, key))
+
+
+def exact_tier(user_skills, job_skills, threshold):
+    user_keys = {normalize_skill(s) for s in user_skills}
+    return {s for s in job_skills if normalize_skill(s) in user_keys}
+
+
+def alias_tier(user_skills, job_skills, threshold):
+    user_keys = {canonical_skill(s) for s in user_skills}
+    return {s for s in job_skills if canonical_skill(s) in user_keys}
+
+
+def table_tier(user_skills, job_skills, threshold):
+    """Known-vs-known pairs straight from the precomputed similarity table, no model involved."""
+    table = get_similarity_table()
+    if table is None:
+        return set()
+    known_users = [s for s in user_skills if s in table]
+    known_jobs = [s for s in job_skills if s in table]
+    if not known_users or not known_jobs:
+        return set()
+    best = table.block(known_jobs, known_users).max(axis=1)
+    return {s for s, score in zip(known_jobs, best) if score > threshold}
+
+
+def semantic_tier(user_skills, job_skills, threshold):
+    """
+    Batched embedding similarity for whatever the cheaper tiers left over.
+    Known-vs-known pairs are read from the similarity table (normally
+    already settled by table_tier), so only pairs involving an
+    out-of-vocabulary skill are embedded.
+    """
+    if not user_skills or not job_skills:
+        return set()
+
+    table = get_similarity_table()
+    if table is None:
+        return _embedding_matches(user_skills, job_skills, threshold)
+
+    oov_users = [s for s in user_skills if s not in table]
+    known_users = [s for s in user_skills if s in table]
+    oov_jobs = [s for s in job_skills if s not in table]
+    found = table_tier(known_users, job_skills, threshold)
+    if oov_users:
+        # Unknown user skills may match any pending job skill
+        found |= _embedding_matches(oov_users, job_skills, threshold)
+    if oov_jobs and known_users:
+        found |= _embedding_matches(known_users, oov_jobs, threshold)
+    return found
+
+
+def semantic_skills(user_skill_lists, job_skills):
+    """
+    Skills semantic_tier may embed when matching each user list against
+    job_skills: everything without a similarity table, otherwise only the
+    sides of pairs that involve an out-of-vocabulary skill.
+    """
+    user_skills = set().union(*user_skill_lists)
+    table = get_similarity_table()
+    if table is None:
+        return user_skills | set(job_skills)
+
+    oov_users = {s for s in user_skills if s not in table}
+    oov_jobs = {s for s in job_skills if s not in table}
+    needed = oov_users | oov_jobs
+    if oov_users:
+        needed.update(job_skills)
+    if oov_jobs:
+        needed.update(user_skills)
+    return needed
+
+
+def _embedding_matches(user_skills, job_skills, threshold):
+    user_embeddings = embedding_cache.encode(user_skills)
+    job_embeddings = embedding_cache.encode(job_skills)
+    user_embeddings /= np.linalg.norm(user_embeddings, axis=1, keepdims=True)
+    job_embeddings /= np.linalg.norm(job_embeddings, axis=1, keepdims=True)
+
+    best = (job_embeddings @ user_embeddings.T).max(axis=1)
+    return {s for s, score in zip(job_skills, best) if score > threshold}
+
+
+# Tiers run in order; each only sees job skills no earlier tier matched
+DEFAULT_TIERS = [
+    ("exact", exact_tier),
+    ("alias", alias_tier),
+    ("table", table_tier),
+    ("semantic", semantic_tier),
+]
+
+
+def match_skills(user_skills, job_skills, threshold, tiers=None):
+    """
+    Splits job_skills into (matched, missing), preserving their order.
+    Tiers are (name, fn) pairs where fn(user_skills, pending, threshold)
+    returns the subset of pending job skills it matched.
+    """
+    tiers = DEFAULT_TIERS if tiers is None else tiers
+    pending = list(dict.fromkeys(job_skills))
+    hits = Counter()
+    matched_set = set()
+
+    for name, tier in tiers:
+        if not pending or not user_skills:
+            break
+        found = tier(user_skills, pending, threshold)
+        hits[name] += len(found)
+        matched_set |= found
+        pending = [s for s in pending if s not in found]
+
+    hits["unmatched"] += len(pending)
+    with _stats_lock:
+        MATCH_STATS.update(hits)
+
+    matched = [s for s in job_skills if s in matched_set]
+    missing = [s for s in job_skills if s not in matched_set]
+    return matched, missing
+
+
+def get_match_stats():
+    """Snapshot of per-tier hit counters."""
+    with _stats_lock:
+        return dict(MATCH_STATS)
+
+
+def reset_match_stats():
+    with _stats_lock:
+        MATCH_STATS.clear()
@@ -88,11 +88,19 @@ function setupForm() {
         }
 
         try {
-            const res = await axios.post('/analyze', formData);
-            renderResults(res.data);
+            // Sections are rendered as the server finishes each stage, in whatever order that is
+            let shown = false;
+            await streamAnalysis(formData, evt => {
+                if (!shown && evt.event !== 'error') {
+                    shown = true;
+                    showResults();
+                }
+                handleEvent(evt);
+            });
         } catch (err) {
-            alert("Analysis failed: " + (err.response?.data?.detail || "Connection Error"));
+            alert("Analysis failed: " + (err.message || "Connection Error"));
             document.getElementById('loaderView').classList.add('hidden');
+            document.getElementById('resultsView').classList.add('hidden');
             document.getElementById('placeholderView').classList.remove('hidden');
         } finally {
             btn.disabled = false;
@@ -109,22 +117,77 @@ function extractGithubUser(input) {
     return input; // Assume it's already a username
 }
 
-function renderResults(data) {
+async function streamAnalysis(formData, onEvent) {
+    const res = await fetch('/analyze/stream', { method: 'POST', body: formData });
+    if (!res.ok) {
+        const body = await res.json().catch(() => ({}));
+        throw new Error(body.detail || `HTTP ${res.status}`);
+    }
+
+    // NDJSON: one event per line; a line can be split across network chunks
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+    }
+    if (buffer.trim()) onEvent(JSON.parse(buffer));
+}
+
+function handleEvent(evt) {
+    switch (evt.event) {
+        case 'match':
+            renderSkillMatch(evt);
+            break;
+        case 'roadmap':
+            renderRoadmap(evt.roadmap);
+            break;
+        case 'github':
+            renderGithub(evt);
+            break;
+        case 'summary':
+            renderReadiness(evt.readiness_score);
+            renderRecommendations(evt.recommendations);
+            break;
+        case 'timings':
+            console.debug('Stage timings (ms)', evt.timings_ms);
+            break;
+        case 'error':
+            throw new Error(evt.detail);
+    }
+}
+
+function showResults() {
     document.getElementById('loaderView').classList.add('hidden');
     document.getElementById('resultsView').classList.remove('hidden');
 
+    // Placeholders for the sections that arrive last
+    renderReadiness(0);
+    document.getElementById('githubScoreText').innerHTML = `<i class="fa-solid fa-spinner fa-spin"></i>`;
+    document.getElementById('githubBar').style.width = '0%';
+    document.getElementById('ghDataSection').classList.add('hidden');
+    document.getElementById('roadmapContent').innerHTML =
+        `<p style="color: var(--text-secondary);"><i class="fa-solid fa-spinner fa-spin"></i> Preparing recommendations...</p>`;
+}
+
+function renderReadiness(readinessScore) {
     // 1. Progress Orb
-    const score = Math.round(data.readiness_score);
+    const score = Math.round(readinessScore);
     document.getElementById('readinessVal').textContent = score + '%';
     const circle = document.getElementById('progressCircle');
     const offset = 377 - (377 * score / 100);
     circle.style.strokeDashoffset = offset;
+}
 
-    // 2. Bars
+function renderSkillMatch(data) {
+    // 2. Resume bar
     document.getElementById('resumeScoreText').textContent = Math.round(data.resume_score) + '%';
     document.getElementById('resumeBar').style.width = data.resume_score + '%';
-    document.getElementById('githubScoreText').textContent = Math.round(data.github_score) + '%';
-    document.getElementById('githubBar').style.width = data.github_score + '%';
 
     // 3. Tags
     const matchedContainer = document.getElementById('matchedTags');
@@ -144,8 +207,13 @@ function renderResults(data) {
         tag.innerHTML = `<i class="fa-solid fa-triangle-exclamation"></i> ${s}`;
         missingContainer.appendChild(tag);
     });
+}
+
+function renderGithub(data) {
+    // 4. Github bar and stats
+    document.getElementById('githubScoreText').textContent = Math.round(data.github_score) + '%';
+    document.getElementById('githubBar').style.width = data.github_score + '%';
 
-    // 4. Github
     const ghSection = document.getElementById('ghDataSection');
     if (data.github_data) {
         ghSection.classList.remove('hidden');
@@ -158,11 +226,13 @@ function renderResults(data) {
     } else {
         ghSection.classList.add('hidden');
     }
+}
 
+function renderRecommendations(recommendations) {
     // 5. Recommendations
     const road = document.getElementById('roadmapContent');
     road.innerHTML = '';
-    data.recommendations.forEach(r => {
+    recommendations.forEach(r => {
         const div = document.createElement('div');
         div.className = 'rec-card';
         div.innerHTML = `
@@ -171,15 +241,17 @@ function renderResults(data) {
         `;
         road.appendChild(div);
     });
+}
 
+function renderRoadmap(roadmap) {
     // 6. Detailed Roadmap (New)
     const detailedRoadmap = document.getElementById('detailedRoadmapView');
     const roadmapContainer = document.getElementById('detailedRoadmapContent');
     roadmapContainer.innerHTML = '';
 
-    if (data.roadmap && data.roadmap.length > 0) {
+    if (roadmap && roadmap.length > 0) {
         detailedRoadmap.classList.remove('hidden');
-        data.roadmap.forEach((step, index) => {
+        roadmap.forEach((step, index) => {
             const stepDiv = document.createElement('div');
             stepDiv.className = 'roadmap-step';
 
@@ -0,0 +1,69 @@
+"""
+Shared test setup.
+
+Every on-disk artifact (embedding cache, role index, similarity table, GitHub
+cache, candidate store) goes to a throwaway directory, configured through the
+same GAP_* variables a deployment uses, before any project module is
+imported. The sentence-transformer is replaced by a small deterministic
+encoder registered in model_registry, so tests never download a model.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # api.py mounts static/ relative to the working directory
+
+_TMP = tempfile.mkdtemp(prefix="gap-tests-")
+os.environ.update({
+    "GAP_EMBEDDING_CACHE_DIR": os.path.join(_TMP, "embedding_cache"),
+    "GAP_ROLE_INDEX_DIR": os.path.join(_TMP, "role_index"),
+    "GAP_SIMILARITY_TABLE_DIR": os.path.join(_TMP, "similarity_table"),
+    "GAP_GITHUB_CACHE_PATH": os.path.join(_TMP, "github_cache.sqlite"),
+    "GAP_CANDIDATE_STORE_DIR": "",
+    "GAP_RESULT_CACHE_PATH": "",
+    # Nothing listens here: a test that reaches GitHub by accident fails fast
+    "GAP_GITHUB_API_URL": "http://127.0.0.1:9",
+})
+
+import model_registry  # noqa: E402
+from config import MODEL_NAME, EMBEDDING_BACKEND  # noqa: E402
+
+DIM = 64
+
+
+class HashingEncoder:
+    """Bag of character bigrams hashed into DIM buckets: similar spellings get similar vectors."""
+
+    def __init__(self):
+        self.calls = 0
+        self.texts = 0
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.calls += 1
+        self.texts += len(texts)
+        out = np.full((len(texts), DIM), 1e-3, dtype=np.float32)
+        for row, text in enumerate(texts):
+            text = text.lower()
+            for i in range(len(text) - 1):
+                out[row, int(hashlib.md5(text[i:i + 2].encode()).hexdigest(), 16) % DIM] += 1
+        return out[0] if single else out
+
+
+ENCODER = HashingEncoder()
+model_registry._models[(MODEL_NAME, EMBEDDING_BACKEND)] = ENCODER
+
+
+@pytest.fixture
+def encoder():
+    """The fake model, with its call counters reset."""
+    ENCODER.calls = 0
+    ENCODER.texts = 0
+    return ENCODER
@@ -0,0 +1,80 @@
+import io
+import json
+import threading
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from job_roles_data import get_job_roles
+
+ROLE = get_job_roles()[0]
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client():
+    return TestClient(api.app)
+
+
+def test_zip_archive_is_analyzed(client):
+    archive = _zip({"a.txt": "Python SQL Docker", "b.txt": "React TypeScript", "notes.md": "ignored"})
+    r = client.post("/analyze/batch", data={"job_role": ROLE}, files={"archive": ("r.zip", archive)})
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line["filename"] for line in lines] == ["a.txt", "b.txt"]
+    assert "Python" in lines[0]["user_skills_detected"]
+
+
+def test_zip_bomb_is_rejected_before_decompression(client, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_MAX_UNCOMPRESSED_BYTES", 4 * 1024 * 1024)
+    # Three 2 MB members of zeros compress to a few KB each but expand past the total cap
+    archive = _zip({f"{i}.txt": b"\0" * (2 * 1024 * 1024) for i in range(3)})
+    assert len(archive) < 100_000
+
+    read = []
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda self, name, pwd=None: read.append(name))
+    r = client.post("/analyze/batch", data={"job_role": ROLE}, files={"archive": ("bomb.zip", archive)})
+    assert r.status_code == 413
+    assert read == []
+
+
+def test_zip_member_count_is_capped(client, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_MAX_ARCHIVE_MEMBERS", 3)
+    archive = _zip({f"{i}.md": "x" for i in range(5)})
+    r = client.post("/analyze/batch", data={"job_role": ROLE}, files={"archive": ("many.zip", archive)})
+    assert r.status_code == 413
+
+
+def test_zip_members_are_read_on_the_parse_pool(client, monkeypatch):
+    threads = []
+    read = zipfile.ZipFile.read
+
+    def recording_read(self, name, pwd=None):
+        threads.append(threading.current_thread().name)
+        return read(self, name, pwd)
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", recording_read)
+    archive = _zip({"a.txt": "Python SQL Docker", "b.txt": "React TypeScript"})
+    r = client.post("/analyze/batch", data={"job_role": ROLE}, files={"archive": ("r.zip", archive)})
+    assert r.status_code == 200
+    assert len(threads) == 2 and all(name.startswith("parse") for name in threads)
+
+
+def test_corrupt_member_is_reported_per_file(client):
+    archive = bytearray(_zip({"a.txt": "Python SQL Docker " * 50, "b.txt": "React TypeScript"}))
+    # Damage a.txt's compressed data; the central directory stays intact
+    start = archive.index(b"a.txt") + len("a.txt")
+    archive[start + 5:start + 15] = b"\xff" * 10
+    r = client.post("/analyze/batch", data={"job_role": ROLE}, files={"archive": ("r.zip", bytes(archive))})
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert "error" in lines[0] and "React" in lines[1]["user_skills_detected"]
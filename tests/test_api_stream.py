@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from job_roles_data import get_job_roles
+from result_cache import ResultCache
+
+ROLE = get_job_roles()[0]
+RESUME = ("cv.txt", b"Python SQL Docker Kubernetes Git")
+
+
+def _stream(client):
+    r = client.post("/analyze/stream", data={"job_role": ROLE}, files={"resume": RESUME})
+    assert r.status_code == 200
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # A fresh result cache, so every stage runs whatever earlier tests cached
+    monkeypatch.setattr(api, "results", ResultCache(path=""))
+    return TestClient(api.app)
+
+
+def test_stream_ends_with_timings_then_done(client, monkeypatch):
+    monkeypatch.setattr(api, "API_SERVER_TIMING", True)
+    events = _stream(client)
+    names = [e["event"] for e in events]
+
+    assert names[-2:] == ["timings", "done"]
+    assert {"skills", "match", "roadmap", "github", "summary"} <= set(names)
+    timings = events[-2]["timings_ms"]
+    # Spans recorded while the body streamed, not just before the headers went out
+    assert "skill_match" in timings and "roadmap" in timings
+    assert timings["total"] >= timings["skill_match"]
+
+
+def test_timings_follow_the_server_timing_setting(client, monkeypatch):
+    monkeypatch.setattr(api, "API_SERVER_TIMING", False)
+    assert "timings" not in [e["event"] for e in _stream(client)]
@@ -0,0 +1,65 @@
+import importlib
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+# Outside `streamlit run` the script executes in bare mode: widgets return their
+# defaults, so importing it only defines the cached helpers and loads the engine
+import app  # noqa: E402
+
+PROFILE = {"username": "octocat", "public_repos": 8, "total_stars": 3, "top_languages": ["Ruby"]}
+
+
+@pytest.fixture
+def github(monkeypatch):
+    calls = []
+    answers = []
+
+    def analyze_github(username):
+        calls.append(username)
+        return answers.pop(0)
+
+    monkeypatch.setattr(app, "analyze_github", analyze_github)
+    app._cached_github_profile.clear()
+    yield calls, answers
+    app._cached_github_profile.clear()
+
+
+def test_failed_github_lookup_is_not_cached(github):
+    calls, answers = github
+    answers += [None, PROFILE]
+
+    assert app.github_profile("octocat") == (None, 0)
+    data, score = app.github_profile("octocat")
+    assert data == PROFILE and score > 0
+    assert calls == ["octocat", "octocat"]
+
+
+def test_successful_github_lookup_is_cached(github):
+    calls, answers = github
+    answers.append(PROFILE)
+
+    assert app.github_profile("octocat")[0] == PROFILE
+    assert app.github_profile("octocat")[0] == PROFILE
+    assert calls == ["octocat"]
+
+
+def test_dashboard_start_leaves_the_role_index_alone(monkeypatch):
+    import model_registry
+    import role_catalog
+
+    calls = []
+    for name in ("get_search_index", "load_index", "build_index"):
+        monkeypatch.setattr(role_catalog, name, lambda *args, _name=name, **kwargs: calls.append(_name))
+    monkeypatch.setattr(model_registry, "warmup", lambda: calls.append("warmup"))
+    app.load_engine.clear()
+
+    # Re-runs the whole script, as a fresh dashboard session would
+    try:
+        importlib.reload(app)
+        assert calls == ["warmup"]
+    finally:
+        monkeypatch.undo()
+        app.load_engine.clear()
+        importlib.reload(app)
@@ -0,0 +1,47 @@
+import csv
+import json
+
+from batch_runner import completed_files, run_batch
+from benchmarks.corpus import LINES_PER_PAGE, WORDS_PER_LINE, pdf_bytes, resume_text
+from config import PDF_PARALLEL_MIN_PAGES
+
+JOB_SKILLS = ["Python", "SQL", "Docker"]
+
+
+def test_long_pdfs_are_read_inside_pool_workers(tmp_path):
+    # Long enough that extract_pdf_text would split it over page-range processes
+    words = (PDF_PARALLEL_MIN_PAGES + 2) * LINES_PER_PAGE * WORDS_PER_LINE
+    inputs = tmp_path / "resumes"
+    inputs.mkdir()
+    for i in range(2):
+        (inputs / f"long_{i}.pdf").write_bytes(pdf_bytes(resume_text(words=words, skill_density=0.1, seed=i)))
+    output = tmp_path / "results.jsonl"
+
+    written, failed = run_batch([str(inputs)], "Data Scientist", JOB_SKILLS, str(output), workers=2, chunk_size=1)
+
+    assert (written, failed) == (2, 0)
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    for record in records:
+        assert record["error"] is None
+        assert record["user_skills"]
+
+
+def test_csv_resume_drops_a_partial_row(tmp_path):
+    inputs = tmp_path / "resumes"
+    inputs.mkdir()
+    for name in ("a", "b"):
+        (inputs / f"{name}.txt").write_text("Python SQL Docker")
+    output = tmp_path / "results.csv"
+    assert run_batch([str(inputs)], "Data Scientist", JOB_SKILLS, str(output), workers=1) == (2, 0)
+
+    # Simulate a crash halfway through writing b.txt's row
+    lines = output.read_text().splitlines(keepends=True)
+    b_row = next(line for line in lines if "b.txt" in line)
+    output.write_text("".join(line for line in lines if line is not b_row) + b_row[:len(b_row) // 2])
+    assert completed_files(str(output), "csv") == {str(inputs / "a.txt")}
+
+    assert run_batch([str(inputs)], "Data Scientist", JOB_SKILLS, str(output), workers=1) == (1, 0)
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(row["file"] for row in rows) == [str(inputs / "a.txt"), str(inputs / "b.txt")]
+    assert all(row["error"] == "" and row["resume_score"] for row in rows)
@@ -0,0 +1,178 @@
+import importlib
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+import candidate_store
+import config
+from candidate_store import CandidateStore
+from job_roles_data import get_job_roles, get_skills_for_role
+
+ROLE = get_job_roles()[0]
+CANDIDATES = [
+    ("a" * 64, "ada.pdf", get_skills_for_role(ROLE)),
+    ("b" * 64, "bob.pdf", ["Photoshop"]),
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """The process-wide store, pointed at a temporary directory."""
+    monkeypatch.setattr(candidate_store, "CANDIDATE_STORE_DIR", str(tmp_path / "candidates"))
+    monkeypatch.setattr(candidate_store, "_store", None)
+    yield candidate_store.get_candidate_store()
+    candidate_store.shutdown_writer()
+
+
+def test_store_is_opt_in(monkeypatch):
+    monkeypatch.delenv("GAP_CANDIDATE_STORE_DIR", raising=False)
+    monkeypatch.delenv("GAP_CANDIDATE_API_TOKEN", raising=False)
+    try:
+        reloaded = importlib.reload(config)
+        assert reloaded.CANDIDATE_STORE_DIR == ""
+        assert reloaded.CANDIDATE_API_TOKEN == ""
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config)
+
+
+def test_writes_run_on_the_background_writer(store, monkeypatch):
+    threads = []
+    add_many = CandidateStore.add_many
+
+    def recording_add_many(self, candidates):
+        threads.append(threading.current_thread().name)
+        return add_many(self, candidates)
+
+    monkeypatch.setattr(CandidateStore, "add_many", recording_add_many)
+    future = candidate_store.remember_candidates_later(CANDIDATES)
+    assert future.result(timeout=10) == 2
+    assert threads and threads[0].startswith("candidate-store")
+    assert len(store) == 2
+
+
+def test_skill_less_candidate_on_a_fresh_store(store):
+    assert store.add_many([("a" * 64, "blank.pdf", [])]) == 0
+    assert store.manifest["segments"] == []
+
+    assert store.add_many(CANDIDATES) == 2
+    assert store.add_many([("c" * 64, "blank.pdf", [])]) == 1
+    assert "c" * 64 in store
+    assert store.query(get_skills_for_role(ROLE), k=3)[0]["name"] == "ada.pdf"
+
+
+def _blocking(monkeypatch, name):
+    """Replaces a CandidateStore method with one that waits for the returned event first."""
+    entered, release = threading.Event(), threading.Event()
+    original = getattr(CandidateStore, name)
+
+    def blocked(*args):
+        entered.set()
+        release.wait(10)
+        return original(*args)
+
+    monkeypatch.setattr(CandidateStore, name, staticmethod(blocked) if name == "_embed" else blocked)
+    return entered, release
+
+
+def _in_thread(fn, *args):
+    thread = threading.Thread(target=fn, args=args)
+    thread.start()
+    return thread
+
+
+def test_lookups_do_not_wait_for_embedding_or_compaction(store, monkeypatch):
+    store.add_many(CANDIDATES[:1])
+    store.add_many([(CANDIDATES[0][0], "ada-v2.pdf", ["Python"])])
+
+    entered, release = _blocking(monkeypatch, "_embed")
+    writer = _in_thread(store.add_many, CANDIDATES[1:])
+    assert entered.wait(10)
+    assert len(store) == 1 and CANDIDATES[0][0] in store and CANDIDATES[1][0] not in store
+    release.set()
+    writer.join(10)
+    assert CANDIDATES[1][0] in store
+
+    entered, release = _blocking(monkeypatch, "_rewrite")
+    compactor = _in_thread(store.compact)
+    assert entered.wait(10)
+    assert len(store) == 2 and store.get(CANDIDATES[0][0])["name"] == "ada-v2.pdf"
+    release.set()
+    compactor.join(10)
+    assert store.dead_ratio == 0 and len(store) == 2
+
+
+def test_model_change_is_left_to_the_cli(store, encoder):
+    store.add_many(CANDIDATES)
+    store._write_manifest(model="some-older-model")
+    encoder.calls = 0
+
+    # Neither a write nor a query re-encodes the store inline
+    assert store.needs_reencode
+    assert store.add_many([("c" * 64, "cy.pdf", ["Python"])]) == 0
+    assert store.query(get_skills_for_role(ROLE)) == []
+    candidate_store.compact_if_needed(ratio=-1)
+    assert store.needs_reencode
+    assert encoder.calls == 0
+
+    store.compact()
+    assert not store.needs_reencode
+    assert store.query(get_skills_for_role(ROLE), k=1)[0]["name"] == "ada.pdf"
+
+
+@pytest.fixture
+def client():
+    return TestClient(api.app)
+
+
+def test_candidate_search_is_refused_without_a_configured_token(client, store):
+    r = client.get("/candidates", params={"role": ROLE}, headers={"Authorization": "Bearer anything"})
+    assert r.status_code == 403
+
+
+def test_candidate_search_requires_the_token(client, store, monkeypatch):
+    monkeypatch.setattr(api, "CANDIDATE_API_TOKEN", "s3cret")
+    store.add_many(CANDIDATES)
+
+    assert client.get("/candidates", params={"role": ROLE}).status_code == 401
+    wrong = client.get("/candidates", params={"role": ROLE}, headers={"Authorization": "Bearer nope"})
+    assert wrong.status_code == 401
+
+    r = client.get("/candidates", params={"role": ROLE, "top_k": 1}, headers={"Authorization": "Bearer s3cret"})
+    assert r.status_code == 200
+    assert r.json()["results"][0]["name"] == "ada.pdf"
+
+
+def test_analyze_records_the_resume_off_the_request_path(client, store, monkeypatch):
+    release = threading.Event()
+    remember = candidate_store.remember_candidates
+
+    def slow_remember(candidates):
+        release.wait(10)
+        return remember(candidates)
+
+    monkeypatch.setattr(candidate_store, "remember_candidates", slow_remember)
+    r = client.post("/analyze", data={"job_role": ROLE},
+                    files={"resume": ("cv.txt", b"Python SQL Docker Kubernetes")})
+    # The response is back while the write is still blocked
+    assert r.status_code == 200
+    assert len(store) == 0
+
+    release.set()
+    candidate_store.shutdown_writer()
+    assert len(store) == 1
+
+
+def test_analyze_is_served_while_the_writer_is_encoding(client, store, monkeypatch):
+    entered, release = _blocking(monkeypatch, "_embed")
+    candidate_store.remember_candidates_later(CANDIDATES)
+    assert entered.wait(10)
+
+    responses = []
+    request = _in_thread(lambda: responses.append(client.post(
+        "/analyze", data={"job_role": ROLE}, files={"resume": ("cv.txt", b"Python SQL Go")})))
+    request.join(10)
+    release.set()
+    assert responses and responses[0].status_code == 200
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from executors import BoundedPool, PoolSaturated
+
+
+@pytest.fixture
+def pool():
+    pool = BoundedPool("test", workers=2, queue_limit=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_run_many_keeps_order_and_fans_out_only_to_free_slots(pool):
+    peak = 0
+
+    def work(i):
+        nonlocal peak
+        peak = max(peak, pool.in_flight)
+        time.sleep(0.01)
+        return i * i
+
+    results = asyncio.run(pool.run_many(work, [(i,) for i in range(10)]))
+    assert results == [i * i for i in range(10)]
+    assert peak <= pool.capacity
+    assert pool.in_flight == 0
+
+
+def test_run_many_takes_only_the_remaining_slots(pool):
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.in_flight == 1
+        batch = asyncio.ensure_future(pool.run_many(lambda i: release.wait() and i, [(i,) for i in range(5)]))
+        await asyncio.sleep(0.05)
+        # Two of the three slots were free: the batch runs two wide instead of five
+        assert pool.in_flight == pool.capacity == 3
+        release.set()
+        await blocker
+        return await batch
+
+    assert asyncio.run(scenario()) == list(range(5))
+    assert pool.in_flight == 0
+
+
+def test_single_job_gets_in_while_a_batch_runs(pool):
+    release = threading.Event()
+
+    async def scenario():
+        batch = asyncio.ensure_future(pool.run_many(lambda i: release.wait() and i, [(i,) for i in range(10)]))
+        await asyncio.sleep(0.05)
+        # The batch runs as wide as the workers and leaves the queue slot free
+        assert pool.in_flight == pool.workers
+        single = asyncio.ensure_future(pool.run(lambda: "single"))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await single, await batch
+
+    assert asyncio.run(scenario()) == ("single", list(range(10)))
+    assert pool.in_flight == 0
+
+
+def test_saturated_pool_rejects_batches(pool):
+    release = threading.Event()
+
+    async def scenario():
+        blockers = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(pool.capacity)]
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(PoolSaturated):
+                await pool.run_many(lambda: None, [()])
+        finally:
+            release.set()
+            await asyncio.gather(*blockers)
+
+    asyncio.run(scenario())
+    assert pool.in_flight == 0
+
+
+def test_cancelled_job_holds_its_slot_until_the_thread_finishes(pool):
+    release = threading.Event()
+
+    async def scenario():
+        job = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        # The thread is still blocked, so the slot is still taken
+        assert pool.in_flight == 1
+
+    asyncio.run(scenario())
+    release.set()
+    deadline = time.monotonic() + 2
+    while pool.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.in_flight == 0
+
+
+def test_failing_job_stops_the_batch_and_frees_every_slot(pool):
+    def work(i):
+        if i == 3:
+            raise ValueError(i)
+        return i
+
+    with pytest.raises(ValueError):
+        asyncio.run(pool.run_many(work, [(i,) for i in range(20)]))
+    deadline = time.monotonic() + 2
+    while pool.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.in_flight == 0
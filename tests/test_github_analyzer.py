@@ -0,0 +1,75 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+
+import config
+import github_analyzer
+from github_client import GitHubResponse
+
+
+class FakeClient:
+    """Serves a user with `repos` repositories, one page, and records every path asked for."""
+
+    def __init__(self, repos, languages=("Python",)):
+        self.repos = [{"full_name": f"octocat/r{i}", "language": languages[i % len(languages)],
+                       "stargazers_count": 1} for i in range(repos)]
+        self.paths = []
+
+    def get(self, path, params=None):
+        self.paths.append(path)
+        if path == "/users/octocat":
+            body = {"login": "octocat", "public_repos": len(self.repos)}
+        elif path == "/users/octocat/repos":
+            body = self.repos
+        else:
+            repo = next(r for r in self.repos if path == f"/repos/{r['full_name']}/languages")
+            body = {repo["language"]: 100}
+        return GitHubResponse(200, json.dumps(body), {})
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeClient(30)
+    monkeypatch.setattr(github_analyzer, "get_client", lambda: client)
+    return client
+
+
+def test_language_lookups_are_capped(fake_client):
+    data = asyncio.run(github_analyzer.analyze_github_async("octocat", max_language_repos=5))
+    assert data["repos_scanned"] == 30
+    assert sum(path.endswith("/languages") for path in fake_client.paths) == 5
+    assert data["language_bytes"] == {"Python": 500}
+
+
+def test_languages_beyond_the_cap_still_rank(monkeypatch):
+    # Only the first two repos get a byte breakdown; the other languages live further down
+    client = FakeClient(12, languages=("Python", "Python", "Go", "Rust", "Java", "Go"))
+    monkeypatch.setattr(github_analyzer, "get_client", lambda: client)
+    data = asyncio.run(github_analyzer.analyze_github_async("octocat", max_language_repos=2))
+
+    assert data["language_bytes"] == {"Python": 200}
+    assert data["top_languages"] == ["Python", "Go", "Rust", "Java"]
+    assert github_analyzer.calculate_github_score(data) > github_analyzer.calculate_github_score(
+        dict(data, top_languages=["Python"]))
+
+
+@pytest.mark.parametrize("token, expected", [("", 10), ("secret", 100)])
+def test_default_language_cap_depends_on_token(monkeypatch, token, expected):
+    monkeypatch.delenv("GAP_GITHUB_MAX_LANGUAGE_REPOS", raising=False)
+    monkeypatch.setenv("GITHUB_TOKEN", token)
+    try:
+        assert importlib.reload(config).GITHUB_MAX_LANGUAGE_REPOS == expected
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config)
+
+
+def test_blocking_wrapper_refuses_to_run_inside_a_loop(fake_client):
+    async def call():
+        return github_analyzer.analyze_github("octocat")
+
+    with pytest.raises(RuntimeError, match="analyze_github_async"):
+        asyncio.run(call())
+    assert github_analyzer.analyze_github("octocat")["username"] == "octocat"
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from github_client import GitHubClient, ResponseCache
+
+
+class StubGitHub:
+    """Local HTTP server answering like the GitHub API, with ETags and a request log."""
+
+    def __init__(self):
+        self.bodies = {}      # path -> JSON-able body; missing paths are 404s
+        self.requests = []    # (path, If-None-Match)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.path not in stub.bodies:
+                    return self._reply(404, {"message": "Not Found"})
+                body = json.dumps(stub.bodies[self.path])
+                etag = f'"{hash(body) & 0xffffffff:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._reply(304, None, etag)
+                self._reply(200, body, etag)
+
+            def _reply(self, status, body, etag=None):
+                payload = b"" if body is None else (body if isinstance(body, str) else json.dumps(body)).encode()
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("X-RateLimit-Remaining", "59")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    stub = StubGitHub()
+    yield stub
+    stub.close()
+
+
+def _client(stub, **ttls):
+    return GitHubClient(base_url=stub.url, token="", cache=ResponseCache(":memory:"), timeout=5, **ttls)
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_fresh_entries_are_served_without_a_request(stub):
+    stub.bodies["/users/octocat"] = {"login": "octocat"}
+    client = _client(stub, ttl=60)
+    assert client.get("users/octocat").json() == {"login": "octocat"}
+    assert client.get("users/octocat").from_cache
+    assert len(stub.requests) == 1
+
+
+def test_expired_entry_is_revalidated_with_its_etag(stub):
+    stub.bodies["/users/octocat"] = {"login": "octocat"}
+    client = _client(stub, ttl=0, stale_ttl=0)
+    client.get("users/octocat")
+
+    res = client.get("users/octocat")
+    assert res.status_code == 200 and res.from_cache
+    assert res.json() == {"login": "octocat"}
+    assert stub.requests[1][1] is not None  # sent If-None-Match
+    assert client.stats["not_modified"] == 1
+
+    stub.bodies["/users/octocat"] = {"login": "octocat", "public_repos": 8}
+    assert client.get("users/octocat").json()["public_repos"] == 8
+    assert client.stats["fetches"] == 2
+
+
+def test_stale_entry_is_served_while_revalidating(stub):
+    stub.bodies["/users/octocat"] = {"login": "octocat"}
+    client = _client(stub, ttl=0, stale_ttl=60)
+    client.get("users/octocat")
+    stub.bodies["/users/octocat"] = {"login": "octocat", "public_repos": 8}
+
+    # The old copy comes back at once; the new one lands in the cache in the background
+    assert client.get("users/octocat").json() == {"login": "octocat"}
+    assert client.stats["stale_hits"] == 1
+    assert _wait_for(lambda: "public_repos" in client.cache.get(client.url_for("users/octocat"))["body"])
+    assert client.get("users/octocat").json()["public_repos"] == 8
+
+
+def test_404_is_cached_for_the_negative_ttl(stub):
+    client = _client(stub, ttl=60, negative_ttl=60)
+    assert client.get("users/nobody").status_code == 404
+    res = client.get("users/nobody")
+    assert res.status_code == 404 and res.from_cache
+    assert len(stub.requests) == 1
+    assert client.stats["negative_hits"] == 1
+
+
+def test_expired_404_is_fetched_again(stub):
+    client = _client(stub, ttl=60, negative_ttl=0)
+    assert client.get("users/newcomer").status_code == 404
+    stub.bodies["/users/newcomer"] = {"login": "newcomer"}
+    res = client.get("users/newcomer")
+    assert res.status_code == 200 and not res.from_cache
+    assert stub.requests[1] == ("/users/newcomer", None)
+
+
+def test_old_cache_files_gain_a_status_column(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "responses.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE responses (url TEXT PRIMARY KEY, body TEXT, headers TEXT, fetched_at REAL)")
+    conn.execute("INSERT INTO responses VALUES ('u', '{}', '{}', 0)")
+    conn.commit()
+    conn.close()
+
+    assert ResponseCache(path).get("u")["status"] == 200
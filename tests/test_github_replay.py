@@ -0,0 +1,23 @@
+import asyncio
+
+from benchmarks.github_replay import replay_client
+from github_analyzer import analyze_github_async, calculate_github_score
+
+
+def test_recorded_profile_replays_through_the_client():
+    client, adapter = replay_client()
+    data = asyncio.run(analyze_github_async("octocat", max_language_repos=100, client=client))
+
+    assert data["name"] == "The Octocat"
+    assert data["repos_scanned"] == 8
+    assert data["top_languages"][:2] == ["Ruby", "CSS"]
+    assert data["language_bytes"]["HTML"] == 9018 + 1126
+    assert calculate_github_score(data) == 100
+    # Profile, one page of repos and one /languages call per repo, all through the transport
+    assert len(adapter.requests) == 1 + 1 + 8
+    assert client.stats["fetches"] == 10
+
+
+def test_unrecorded_user_is_a_404():
+    client, _ = replay_client()
+    assert asyncio.run(analyze_github_async("nobody", client=client)) is None
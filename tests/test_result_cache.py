@@ -0,0 +1,41 @@
+import result_cache
+import resume_parser
+from result_cache import ResultCache, analysis_version, match_key, skills_key
+
+
+def test_match_key_changes_with_the_roles_skills():
+    before = match_key("abc", "Data Scientist", ["Python", "SQL"])
+    assert match_key("abc", "data scientist", ["Python", "SQL"]) == before
+    assert match_key("abc", "Data Scientist", ["Python", "SQL", "Spark"]) != before
+    assert match_key("abc", "Data Scientist", ["SQL", "Python"]) != before
+
+
+def test_analysis_version_tracks_similarity_table_precision(monkeypatch):
+    float32 = analysis_version()
+    monkeypatch.setattr(result_cache, "SIMILARITY_TABLE_DTYPE", "float16")
+    assert analysis_version() != float32
+    monkeypatch.setattr(result_cache, "SIMILARITY_TABLE_DIR", "")
+    assert "live" in analysis_version()
+
+
+def test_edited_role_misses_the_cache():
+    cache = ResultCache(max_entries=10, path="")
+    cache.set(match_key("abc", "Backend", ["Python"]), {"score": 100.0}, ttl=60)
+    assert cache.get(match_key("abc", "Backend", ["Python"])) == {"score": 100.0}
+    assert cache.get(match_key("abc", "Backend", ["Python", "Go"])) is None
+
+
+def test_edited_taxonomy_misses_the_cache(tmp_path, monkeypatch):
+    taxonomy = tmp_path / "skills.txt"
+    monkeypatch.setattr(resume_parser, "SKILL_TAXONOMY_PATH", str(taxonomy))
+
+    def key_after_restart():
+        monkeypatch.setattr(resume_parser, "_automaton", None)
+        return skills_key("abc")
+
+    taxonomy.write_text("Terraform\n", encoding="utf-8")
+    before = key_after_restart()
+    assert key_after_restart() == before
+    # Same path, new contents
+    taxonomy.write_text("Terraform\nPulumi\n", encoding="utf-8")
+    assert key_after_restart() != before
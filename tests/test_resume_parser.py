@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+import resume_parser
+from benchmarks.corpus import LINES_PER_PAGE, WORDS_PER_LINE, pdf_bytes, resume_text
+from config import PDF_PARALLEL_MIN_PAGES
+
+
+@pytest.fixture(scope="module")
+def long_pdf():
+    pages = PDF_PARALLEL_MIN_PAGES + 4
+    return pdf_bytes(resume_text(words=pages * LINES_PER_PAGE * WORDS_PER_LINE, skill_density=0.1))
+
+
+class _Page:
+    def __init__(self, text, delay=0.0, release=None):
+        self.text = text
+        self.delay = delay
+        self.release = release
+
+    def extract_text(self):
+        if self.release is not None:
+            self.release.wait(self.delay)
+        return self.text
+
+
+def test_parallel_ranges_match_serial_extraction(long_pdf):
+    serial = resume_parser.extract_pdf_text(long_pdf, max_pages=0, max_chars=0, workers=1)
+    parallel = resume_parser.extract_pdf_text(long_pdf, max_pages=0, max_chars=0, workers=2)
+    assert parallel == serial
+    assert "Experience" in serial
+
+
+def test_stuck_pages_do_not_block_later_documents():
+    release = threading.Event()
+    try:
+        # More stuck pages than the old shared pool had threads
+        for _ in range(6):
+            with resume_parser._page_reader(0.05) as read:
+                assert read(_Page("slow", delay=30, release=release)) is None
+
+        started = time.monotonic()
+        with resume_parser._page_reader(1) as read:
+            assert read(_Page("fast")) == "fast"
+        assert time.monotonic() - started < 0.5
+    finally:
+        release.set()
+
+
+def test_stuck_range_pool_is_retired_after_its_last_document():
+    pool, _ = resume_parser._acquire_range_pool(2)
+    same, _ = resume_parser._acquire_range_pool(2)
+    assert same is pool
+
+    resume_parser._release_range_pool(pool, stuck=True)
+    fresh, _ = resume_parser._acquire_range_pool(2)
+    assert fresh is not pool
+    assert pool in resume_parser._range_pool_users  # still used by the other document
+
+    resume_parser._release_range_pool(pool, stuck=False)
+    assert pool not in resume_parser._range_pool_users
+    resume_parser._release_range_pool(fresh, stuck=False)
+    assert fresh in resume_parser._range_pool_users  # the current pool stays up
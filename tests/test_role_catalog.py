@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+
+from fastapi.testclient import TestClient
+
+import api
+import role_catalog
+from job_roles_data import JOB_ROLES
+from role_catalog import RoleCatalog, load_index, rank_roles, search_roles
+
+
+def test_malformed_role_file_is_skipped(tmp_path, capsys):
+    (tmp_path / "a_broken.json").write_text("{not json", encoding="utf-8")
+    (tmp_path / "b_shape.json").write_text(json.dumps(["just", "strings"]), encoding="utf-8")
+    (tmp_path / "c_good.csv").write_text("title,skill\nPlatform Engineer,Go;Kubernetes\n", encoding="utf-8")
+
+    catalog = RoleCatalog(str(tmp_path))
+
+    assert catalog.roles["Platform Engineer"] == ["Go", "Kubernetes"]
+    assert set(JOB_ROLES) <= set(catalog.roles)
+    out = capsys.readouterr().out
+    assert "a_broken.json" in out and "b_shape.json" in out
+
+
+def test_rank_roles_puts_the_full_match_first():
+    index = role_catalog.get_search_index()
+    role = index.roles[0]
+    results = rank_roles(JOB_ROLES[role], index.role_index(range(len(index.roles))))
+
+    scores = [r["match_score"] for r in results]
+    assert scores == sorted(scores, reverse=True) and scores[0] == 100.0
+    own = next(r for r in results if r["role"] == role)
+    assert own["match_score"] == 100.0 and own["missing_skills"] == []
+
+
+def test_search_ranks_a_roles_own_skills_first():
+    role, skills = next(iter(JOB_ROLES.items()))
+    best = search_roles(skills, k=3)[0]
+    assert best["match_score"] == 100.0
+    assert set(best["matched_skills"]) == set(skills)
+
+
+def test_rank_roles_scores_every_role_of_an_index():
+    index = role_catalog.get_search_index()
+    ids = range(len(index.roles))
+    results = rank_roles([], index.role_index(ids))
+    assert len(results) == len(index.roles)
+    assert all(r["match_score"] == 0 and not r["matched_skills"] for r in results)
+
+
+def _current(directory):
+    with open(os.path.join(directory, "current.json"), encoding="utf-8") as f:
+        return json.load(f)["build"]
+
+
+def test_save_keeps_builds_newer_than_the_published_one(tmp_path):
+    directory = str(tmp_path)
+    index = role_catalog.get_search_index()
+    assert index.save(directory)
+    first = _current(directory)
+    # Another worker is still writing a build that started later
+    os.makedirs(os.path.join(directory, "99999999999999-1"))
+
+    assert index.save(directory)
+    assert _current(directory) != first
+    assert not os.path.exists(os.path.join(directory, first))
+    assert os.path.isdir(os.path.join(directory, "99999999999999-1"))
+    assert load_index(directory).roles == index.roles
+
+
+def test_older_build_does_not_replace_a_newer_one(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    index = role_catalog.get_search_index()
+    monkeypatch.setattr(role_catalog.time, "time", lambda: 2_000_000_000.0)
+    assert index.save(directory)
+    newer = _current(directory)
+
+    monkeypatch.setattr(role_catalog.time, "time", lambda: 1_000_000_000.0)
+    assert not index.save(directory)
+    assert _current(directory) == newer
+    assert sorted(e for e in os.listdir(directory) if os.path.isdir(os.path.join(directory, e))) == [newer]
+    assert load_index(directory) is not None
+
+
+def test_role_lookups_run_on_the_io_pool(monkeypatch):
+    threads = []
+    get_catalog = role_catalog.get_catalog
+
+    def recording_get_catalog():
+        threads.append(threading.current_thread().name)
+        return get_catalog()
+
+    monkeypatch.setattr(role_catalog, "get_catalog", recording_get_catalog)
+    role = next(iter(JOB_ROLES))
+    r = TestClient(api.app).post("/analyze", data={"job_role": role},
+                                 files={"resume": ("cv.txt", b"Python SQL Docker")})
+    assert r.status_code == 200
+    assert threads and all(name.startswith(("io", "parse", "inference")) for name in threads)
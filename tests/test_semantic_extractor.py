@@ -0,0 +1,40 @@
+import embedding_cache
+from model_registry import model_id
+from semantic_extractor import TaxonomyIndex, candidate_phrases
+
+SKILLS = ["Machine Learning", "Data Engineering", "Kubernetes"]
+TEXT = "Built machine learning models and data engineering pipelines on kubernetes clusters."
+
+
+def test_phrase_exactly_at_the_threshold_is_dropped():
+    index = TaxonomyIndex(["Kubernetes"])
+    phrase, score = index.match("Operated kubernetes clusters", threshold=-1)["Kubernetes"]
+
+    # Like job skill matching, a skill needs a similarity strictly above the threshold
+    assert index.match("Operated kubernetes clusters", threshold=score) == {}
+    assert index.match("Operated kubernetes clusters", threshold=score - 1e-4)["Kubernetes"][0] == phrase
+
+
+def test_phrases_stay_in_memory_and_off_disk(encoder):
+    index = TaxonomyIndex(SKILLS)
+    store = embedding_cache.get_store(model_id())
+    phrases = candidate_phrases(TEXT, exclude={s.lower() for s in SKILLS})
+    stored = len(store._index)
+
+    encoder.texts = 0
+    first = index.match(TEXT, threshold=0.5)
+    assert encoder.texts == len(phrases)
+    # Resume fragments are never appended to the persistent embedding cache
+    assert len(store._index) == stored
+    assert not any(embedding_cache.cache_key(model_id(), p) in store._index for p in phrases)
+
+    # A second resume with the same phrases costs no model call at all
+    encoder.calls = 0
+    assert index.match(TEXT, threshold=0.5) == first
+    assert encoder.calls == 0
+
+
+def test_phrase_cache_is_bounded(encoder):
+    index = TaxonomyIndex(SKILLS, phrase_cache_size=4)
+    index.match(TEXT, threshold=0.5)
+    assert len(index._phrase_cache) == 4
@@ -0,0 +1,95 @@
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+import analyzer
+import api
+import similarity_table
+from job_roles_data import get_job_roles, get_skills_for_role
+from similarity_table import build_table, get_similarity_table, load_table
+
+ROLE = get_job_roles()[0]
+
+
+@pytest.fixture
+def table_dir(tmp_path, monkeypatch):
+    """An empty table directory, with the process-wide table forgotten."""
+    directory = str(tmp_path / "similarity_table")
+    monkeypatch.setattr(similarity_table, "SIMILARITY_TABLE_DIR", directory)
+    monkeypatch.setattr(similarity_table, "_tables", {})
+    monkeypatch.setattr(similarity_table, "SIMILARITY_TABLE_RECHECK_SECONDS", 0)
+    return directory
+
+
+def test_table_built_later_is_picked_up(table_dir):
+    assert get_similarity_table() is None
+
+    build_table(["Python", "SQL", "Docker"], directory=table_dir)
+    table = get_similarity_table()
+    assert table is not None and "Python" in table
+    # Unchanged manifest: the loaded table is reused
+    assert get_similarity_table() is table
+
+    rebuilt = build_table(["Python", "SQL", "Docker", "Kubernetes"], directory=table_dir)
+    assert "Kubernetes" in get_similarity_table()
+    assert len(get_similarity_table()) == len(rebuilt)
+
+
+def test_manifest_is_checked_at_most_once_per_interval(table_dir, monkeypatch):
+    build_table(["Python", "SQL"], directory=table_dir)
+    monkeypatch.setattr(similarity_table, "SIMILARITY_TABLE_RECHECK_SECONDS", 60)
+    stats = []
+    manifest_stat = similarity_table._manifest_stat
+    monkeypatch.setattr(similarity_table, "_manifest_stat", lambda name: stats.append(name) or manifest_stat(name))
+
+    tables = {id(get_similarity_table()) for _ in range(100)}
+    assert len(tables) == 1 and len(stats) == 1
+
+
+def test_each_build_gets_its_own_data_file(table_dir):
+    first = build_table(["Python", "SQL"], directory=table_dir)
+    old_data = os.path.join(table_dir, first.manifest["data"])
+    second = build_table(["Python", "SQL", "Docker"], directory=table_dir)
+
+    assert second.manifest["data"] != first.manifest["data"]
+    # The old matrix is gone, so a reader holding the old manifest fails to load
+    # instead of pairing it with the new, larger matrix
+    assert not os.path.exists(old_data)
+    assert sorted(f for f in os.listdir(table_dir) if not f.endswith(".json")) == [second.manifest["data"]]
+    table = load_table(table_dir)
+    assert table.matrix.shape == (3, 3)
+    assert table.block(["Docker"], ["Docker"])[0, 0] > 0.99
+
+
+def test_batch_prefetch_skips_skills_the_table_covers(table_dir, encoder, monkeypatch):
+    job_skills = get_skills_for_role(ROLE)
+    build_table(job_skills + ["React", "TypeScript"], directory=table_dir)
+    encoded = []
+    monkeypatch.setattr(analyzer.embedding_cache, "encode", lambda skills: encoded.extend(skills))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("a.txt", " ".join(job_skills[:3]))
+        zf.writestr("b.txt", "React TypeScript")
+    r = TestClient(api.app).post("/analyze/batch", data={"job_role": ROLE},
+                                 files={"archive": ("r.zip", buffer.getvalue())})
+
+    assert r.status_code == 200
+    assert encoded == []
+
+
+def test_prefetch_embeds_both_sides_of_out_of_vocabulary_pairs(table_dir, monkeypatch):
+    build_table(["Python", "SQL", "Docker"], directory=table_dir)
+    encoded = []
+    monkeypatch.setattr(analyzer.embedding_cache, "encode", lambda skills: encoded.extend(skills))
+
+    analyzer.prefetch_embeddings([["Python", "Cobol"], ["SQL"]], ["Docker", "Fortran"])
+    # Cobol is matched against every job skill, Fortran against every known user skill
+    assert sorted(encoded) == ["Cobol", "Docker", "Fortran", "Python", "SQL"]
+
+    encoded.clear()
+    analyzer.prefetch_embeddings([["Python"], ["SQL"]], ["Docker"])
+    assert encoded == []
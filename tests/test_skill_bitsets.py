@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+
+from analyzer import MATCH_THRESHOLD
+from job_roles_data import JOB_ROLES
+from resume_parser import SKILL_DATA
+from skill_bitsets import SkillSets, SkillVocabulary, score_matrix, to_result, top_roles
+from skill_matcher import alias_tier, exact_tier, match_skills
+
+EXACT_TIERS = [("exact", exact_tier), ("alias", alias_tier)]
+
+
+def _score(user_skills, role_skills):
+    """Reference: the exact/alias part of get_match_results / analyze_skill_gap."""
+    matched, _ = match_skills(user_skills, role_skills, MATCH_THRESHOLD, tiers=EXACT_TIERS)
+    return len(matched) / len(role_skills) * 100 if role_skills else 0
+
+
+def test_aliased_duplicates_count_like_analyze_skill_gap():
+    vocabulary = SkillVocabulary()
+    candidates = SkillSets(["c"], [["Python"]], vocabulary)
+    roles = SkillSets(["r"], [["Kubernetes", "k8s", "Python"]], vocabulary)
+
+    expected = _score(["Python"], ["Kubernetes", "k8s", "Python"])
+    assert expected == pytest.approx(100 / 3)
+    assert score_matrix(candidates, roles)[0, 0] == pytest.approx(expected)
+    assert to_result(candidates, 0, roles, 0)["match_score"] == pytest.approx(expected)
+
+    with_k8s = SkillSets(["c"], [["k8s"]], vocabulary)
+    assert score_matrix(with_k8s, roles)[0, 0] == pytest.approx(200 / 3)
+
+
+def test_scores_agree_with_match_skills_on_random_profiles():
+    rng = random.Random(7)
+    pool = [s for group in SKILL_DATA.values() for s in group] + ["k8s", "js", "Postgres", "ml"]
+    role_lists = dict(JOB_ROLES)
+    role_lists["Duplicated"] = ["Kubernetes", "k8s", "Python", "Python", "JavaScript", "Go", "js", "React"]
+    user_lists = [rng.sample(pool, rng.randint(0, 12)) for _ in range(200)]
+
+    vocabulary = SkillVocabulary()
+    candidates = SkillSets(range(len(user_lists)), user_lists, vocabulary)
+    roles = SkillSets(role_lists.keys(), role_lists.values(), vocabulary)
+    scores = score_matrix(candidates, roles, chunk_rows=37)
+
+    expected = np.array([[_score(u, r) for r in role_lists.values()] for u in user_lists])
+    np.testing.assert_allclose(scores, expected)
+    for c in range(0, len(user_lists), 20):
+        for r in range(len(roles)):
+            assert to_result(candidates, c, roles, r)["match_score"] == pytest.approx(expected[c, r])
+
+    best, _ = top_roles(candidates, roles, k=3)
+    assert np.all(np.take_along_axis(scores, best, axis=1)[:, 0] == scores.max(axis=1))
+
+
+def test_blocks_are_bounded_on_both_axes(monkeypatch):
+    import skill_bitsets
+
+    rng = random.Random(3)
+    pool = [s for group in SKILL_DATA.values() for s in group]
+    vocabulary = SkillVocabulary()
+    candidates = SkillSets(range(50), [rng.sample(pool, 8) for _ in range(50)], vocabulary)
+    roles = SkillSets(range(300), [rng.sample(pool, 6) for _ in range(300)], vocabulary)
+    expected = score_matrix(candidates, roles)
+
+    sizes = []
+    popcount = skill_bitsets.popcount
+    monkeypatch.setattr(skill_bitsets, "popcount", lambda block: sizes.append(block.size) or popcount(block))
+    limit = 10 * max(candidates.words.shape[1], roles.words.shape[1])
+    # Ten roles' worth of words per block, even though all 300 roles are scored at once
+    np.testing.assert_allclose(score_matrix(candidates, roles, chunk_elements=limit), expected)
+    assert sizes and max(sizes) <= limit
@@ -0,0 +1,25 @@
+from skill_extractor import SkillAutomaton
+
+
+def _spans(automaton, text):
+    return [(skill, text[start:end]) for skill, start, end in automaton.scan(text)]
+
+
+def test_word_boundaries():
+    automaton = SkillAutomaton(["Go", "C++", "Node.js", "CI/CD"])
+    text = "Google, Go and C++; Node.js with CI/CD"
+    assert _spans(automaton, text) == [("Go", "Go"), ("C++", "C++"), ("Node.js", "Node.js"), ("CI/CD", "CI/CD")]
+
+
+def test_offsets_survive_length_changing_lowercase():
+    # "İ".lower() is two code points, which used to shift every later span
+    automaton = SkillAutomaton(["Python", "SQL"])
+    text = "İİstanbul İzmir: Python, SQL"
+    assert _spans(automaton, text) == [("Python", "Python"), ("SQL", "SQL")]
+    assert automaton.find(text)["SQL"] == [(len(text) - 3, len(text))]
+
+
+def test_skill_containing_expanding_character():
+    automaton = SkillAutomaton(["İzmir"])
+    text = "Based in İzmir."
+    assert _spans(automaton, text) == [("İzmir", "İzmir")]
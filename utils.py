@@ -1,4 +1,4 @@
-from job_roles_data import job_roles
+from job_roles_data import JOB_ROLES as job_roles
 
 def get_skills_for_role(role):
     for job_role in job_roles: